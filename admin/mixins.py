@@ -0,0 +1,24 @@
+from services.cache_service import cache
+
+
+class CacheTagInvalidationMixin:
+    """
+    Bumps the cache tags "<cache_tag>:<id>" and "<cache_tag>:*" after an object is saved or deleted,
+    so every cache entry built from this model is rebuilt on its next read.
+    """
+    cache_tag: str = ""
+
+    async def _bump_cache_tags(self, id) -> None:
+        tags = [f"{self.cache_tag}:*"]
+        if id is not None:
+            tags.append(f"{self.cache_tag}:{id}")
+        await cache.bump_tags(*tags)
+
+    async def save_model(self, id, payload: dict):
+        result = await super().save_model(id, payload)
+        await self._bump_cache_tags(id if id is not None else (result or {}).get("id"))
+        return result
+
+    async def delete_model(self, id) -> None:
+        await super().delete_model(id)
+        await self._bump_cache_tags(id)
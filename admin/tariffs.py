@@ -2,10 +2,12 @@ from fastadmin import TortoiseModelAdmin, register, WidgetType
 from tortoise.exceptions import ValidationError as TortoiseValidationError
 from fastadmin.api.exceptions import AdminApiException
 from models.tariffs import TariffCategory, Tariff, Feature, TariffFeature, Sale
+from .mixins import CacheTagInvalidationMixin
 
 
 @register(TariffCategory)
-class TariffCategoryAdmin(TortoiseModelAdmin):
+class TariffCategoryAdmin(CacheTagInvalidationMixin, TortoiseModelAdmin):
+    cache_tag = "tariff_category"
     list_display = (
         "id", "name", "name_uz", "name_ru", "name_en",
         "sale", "is_active", "created_at",
@@ -36,7 +38,8 @@ class TariffCategoryAdmin(TortoiseModelAdmin):
 
 
 @register(Tariff)
-class TariffAdmin(TortoiseModelAdmin):
+class TariffAdmin(CacheTagInvalidationMixin, TortoiseModelAdmin):
+    cache_tag = "tariff"
     list_display = (
         "id", "category", "name", "name_uz", "name_ru", "name_en",
         "old_price", "price", "price_in_stars", "tokens", "duration",
@@ -87,7 +90,8 @@ class TariffAdmin(TortoiseModelAdmin):
 
 
 @register(Feature)
-class FeatureAdmin(TortoiseModelAdmin):
+class FeatureAdmin(CacheTagInvalidationMixin, TortoiseModelAdmin):
+    cache_tag = "feature"
     list_display = (
         "id", "name", "name_uz", "name_ru", "name_en",
         "description", "description_uz", "description_ru", "description_en",
@@ -120,7 +124,8 @@ class FeatureAdmin(TortoiseModelAdmin):
 
 
 @register(TariffFeature)
-class TariffFeatureAdmin(TortoiseModelAdmin):
+class TariffFeatureAdmin(CacheTagInvalidationMixin, TortoiseModelAdmin):
+    cache_tag = "tariff_feature"
     list_display = (
         "id", "tariff", "feature", "is_included", "created_at",
     )
@@ -161,7 +166,8 @@ class TariffFeatureAdmin(TortoiseModelAdmin):
 
 
 @register(Sale)
-class SaleAdmin(TortoiseModelAdmin):
+class SaleAdmin(CacheTagInvalidationMixin, TortoiseModelAdmin):
+    cache_tag = "sale"
     list_display = (
         "id", "tariff", "percent",
         "start_date", "start_time",
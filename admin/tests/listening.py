@@ -2,6 +2,8 @@ import os
 from fastadmin import TortoiseModelAdmin, register, WidgetType
 from tortoise.exceptions import ValidationError as TortoiseValidationError
 from fastadmin.api.exceptions import AdminApiException
+from services.answer_key_cache import LISTENING
+from .mixins import AnswerKeyInvalidationMixin
 from models import (
     User, Listening, ListeningPart, ListeningSection,
     ListeningQuestion, ListeningSession, ListeningAnswer,
@@ -12,7 +14,9 @@ from aiofiles.os import wrap as aio_wrap
 
 
 @register(Listening)
-class ListeningAdmin(TortoiseModelAdmin):
+class ListeningAdmin(AnswerKeyInvalidationMixin, TortoiseModelAdmin):
+    answer_key_kind = LISTENING
+
     list_display     = ("id", "title", "created_at")
     search_fields    = ("title",)
     list_filter      = ()
@@ -35,7 +39,9 @@ class ListeningAdmin(TortoiseModelAdmin):
             raise AdminApiException(status_code=400, detail=detail)
 
 @register(ListeningPart)
-class ListeningPartAdmin(TortoiseModelAdmin):
+class ListeningPartAdmin(AnswerKeyInvalidationMixin, TortoiseModelAdmin):
+    answer_key_kind = LISTENING
+
     list_display = ("id", "listening", "part_number", "audio_file", "created_at")
     list_filter = ("listening", "part_number")
     list_select_related = ("listening",)
@@ -88,7 +94,9 @@ class ListeningPartAdmin(TortoiseModelAdmin):
             raise AdminApiException(status_code=400, detail=detail)
 
 @register(ListeningSection)
-class ListeningSectionAdmin(TortoiseModelAdmin):
+class ListeningSectionAdmin(AnswerKeyInvalidationMixin, TortoiseModelAdmin):
+    answer_key_kind = LISTENING
+
     list_display     = ("id", "part", "section_number", "question_type", "start_index", "end_index")
     list_filter      = ("part", "question_type")
     list_select_related = ("part",)
@@ -129,7 +137,9 @@ class ListeningSectionAdmin(TortoiseModelAdmin):
             raise AdminApiException(status_code=400, detail=detail)
 
 @register(ListeningQuestion)
-class ListeningQuestionAdmin(TortoiseModelAdmin):
+class ListeningQuestionAdmin(AnswerKeyInvalidationMixin, TortoiseModelAdmin):
+    answer_key_kind = LISTENING
+
     list_display     = ("id", "section", "index", "created_at")
     list_filter      = ("section",)
     list_select_related = ("section",)
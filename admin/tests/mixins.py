@@ -0,0 +1,43 @@
+from services.answer_key_cache import answer_keys
+from services.reading_verdict_service import ReadingVerdictService
+
+
+class AnswerKeyInvalidationMixin:
+    """
+    Bumps the answer-key version of `answer_key_kind` after content is saved or deleted.
+    """
+    answer_key_kind: str = ""
+
+    async def save_model(self, id, payload: dict):
+        result = await super().save_model(id, payload)
+        await answer_keys.invalidate(self.answer_key_kind)
+        return result
+
+    async def delete_model(self, id) -> None:
+        await super().delete_model(id)
+        await answer_keys.invalidate(self.answer_key_kind)
+
+
+class ReadingVerdictInvalidationMixin:
+    """
+    Drops stored free-text verdicts of edited reading content.
+    `verdict_scope` is "question" or "passage", the kind of object this admin edits.
+    """
+    verdict_scope: str = "question"
+
+    async def _forget_verdicts(self, id) -> None:
+        if id is None:
+            return
+        if self.verdict_scope == "passage":
+            await ReadingVerdictService.forget_passage(int(id))
+        else:
+            await ReadingVerdictService.forget_questions([int(id)])
+
+    async def save_model(self, id, payload: dict):
+        result = await super().save_model(id, payload)
+        await self._forget_verdicts(id)
+        return result
+
+    async def delete_model(self, id) -> None:
+        await self._forget_verdicts(id)
+        await super().delete_model(id)
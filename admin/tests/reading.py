@@ -1,11 +1,16 @@
 from fastadmin import TortoiseModelAdmin, register, WidgetType
 from tortoise.exceptions import ValidationError as TortoiseValidationError
 from fastadmin.api.exceptions import AdminApiException
+from services.answer_key_cache import READING
+from .mixins import AnswerKeyInvalidationMixin, ReadingVerdictInvalidationMixin
 from models import User, Reading, ReadingPassage, ReadingQuestion, ReadingVariant, ReadingAnswer
 from models.tests.constants import Constants
 
 @register(ReadingPassage)
-class ReadingPassageAdmin(TortoiseModelAdmin):
+class ReadingPassageAdmin(AnswerKeyInvalidationMixin, ReadingVerdictInvalidationMixin, TortoiseModelAdmin):
+    answer_key_kind = READING
+    verdict_scope = "passage"
+
     list_display    = ("id", "title", "level", "number")
     list_filter     = ("level",)
     search_fields   = ("title",)
@@ -39,7 +44,10 @@ from models import ReadingQuestion, ReadingPassage
 from models.tests.constants import Constants
 
 @register(ReadingQuestion)
-class ReadingQuestionAdmin(TortoiseModelAdmin):
+class ReadingQuestionAdmin(AnswerKeyInvalidationMixin, ReadingVerdictInvalidationMixin, TortoiseModelAdmin):
+    answer_key_kind = READING
+    verdict_scope = "question"
+
     list_display        = ("id", "passage", "text", "type", "score")
     list_filter         = ("passage", "type")
     list_select_related = ("passage",)
@@ -78,7 +86,9 @@ class ReadingQuestionAdmin(TortoiseModelAdmin):
             raise AdminApiException(status_code=400, detail=detail)
 
 @register(ReadingVariant)
-class ReadingVariantAdmin(TortoiseModelAdmin):
+class ReadingVariantAdmin(AnswerKeyInvalidationMixin, TortoiseModelAdmin):
+    answer_key_kind = READING
+
     list_display        = ("id", "question", "text", "is_correct")
     list_filter         = ("question", "is_correct")
     list_select_related = ("question",)
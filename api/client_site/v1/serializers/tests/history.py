@@ -95,6 +95,25 @@ HistoryItem = (
     | SpeakingHistorySerializer
 )
 
+HISTORY_SERIALIZERS = {
+    "Reading": ReadingHistorySerializer,
+    "Listening": ListeningHistorySerializer,
+    "Writing": WritingHistorySerializer,
+    "Speaking": SpeakingHistorySerializer,
+}
+
+def history_item_from_row(row: dict) -> HistoryItem:
+    """Build a history item from a row of the combined history query."""
+    duration = None
+    if row.get("start_time") and row.get("end_time"):
+        duration = int((row["end_time"] - row["start_time"]).total_seconds())
+    score = row.get("score")
+    return HISTORY_SERIALIZERS[row["kind"]](
+        score=float(score) if score is not None else 0,
+        created_at=row["taken_at"],
+        duration=duration,
+    )
+
 class LatestAnalysis(BaseModel):
     """Serializer for the latest analysis of a user."""
     listening: Optional[float]
@@ -64,6 +64,10 @@ class ListeningQuestionSerializer(BaseModel):
 
     @classmethod
     async def from_orm(cls, obj) -> "ListeningQuestionSerializer":
+        return cls.from_instance(obj)
+
+    @classmethod
+    def from_instance(cls, obj) -> "ListeningQuestionSerializer":
         cleaned_options = None
         if obj.options:
             if isinstance(obj.options, list):
@@ -101,7 +105,12 @@ class ListeningSectionSerializer(BaseModel):
     async def from_orm(cls, obj) -> "ListeningSectionSerializer":
         # подтягиваем и сериализуем вопросы
         questions_qs = await obj.questions.order_by("index").all()
-        questions = [await ListeningQuestionSerializer.from_orm(q) for q in questions_qs]
+        return cls.from_instance(obj, questions_qs)
+
+    @classmethod
+    def from_instance(cls, obj, questions_qs) -> "ListeningSectionSerializer":
+        """Build from a section and its already loaded questions (ordered by index)."""
+        questions = [ListeningQuestionSerializer.from_instance(q) for q in questions_qs]
 
         # нормализуем options в простой список строк
         raw_opts = obj.options or []
@@ -142,6 +151,11 @@ class ListeningPartSerializer(BaseModel):
     async def from_orm(cls, obj) -> "ListeningPartSerializer":
         sections_qs = await obj.sections.order_by("section_number").all()
         sections = [await ListeningSectionSerializer.from_orm(s) for s in sections_qs]
+        return cls.from_instance(obj, sections)
+
+    @classmethod
+    def from_instance(cls, obj, sections: List[ListeningSectionSerializer]) -> "ListeningPartSerializer":
+        """Build from a part and its already serialized sections."""
         return cls(
             id=obj.id,
             part_number=obj.part_number,
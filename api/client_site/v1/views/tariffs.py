@@ -3,11 +3,14 @@ from typing import List
 
 from ..serializers.tariffs import PlanInfo, TariffInfo, FeatureItemInfo, FeatureInfo
 from models import TariffCategory
-from services.cache_service import cache
+from services.cache_service import cached
 from utils.i18n import get_translation
 
 router = APIRouter()
 
+# Bumped by the tariff admins on every save or delete (see admin/mixins.py)
+PLAN_TAGS = ("tariff_category:*", "tariff:*", "feature:*", "tariff_feature:*")
+
 
 def _translate(obj, field: str, lang: str) -> str:
     """Get translated field or fallback."""
@@ -26,11 +29,12 @@ async def list_plans(
     if lang not in {"en", "ru", "uz"}:
         raise HTTPException(status_code=400, detail=t.get("invalid_language", "Unsupported language"))
 
-    cache_key = f"plans_{lang}"
-    cached = await cache.get(cache_key)
-    if cached:
-        return cached
+    return await _load_plans(lang)
+
 
+@cached("plans_{lang}", expire=None, tags=PLAN_TAGS)
+async def _load_plans(lang: str) -> List[PlanInfo]:
+    """Build the plans of one language (cached until a tariff, category or feature is edited)."""
     categories = await TariffCategory.filter(is_active=True).prefetch_related(
         "tariffs__tariff_features__feature"
     )
@@ -94,5 +98,4 @@ async def list_plans(
         )
         result.append(plan_info)
 
-    await cache.set(cache_key, result, expire=3600)
     return result
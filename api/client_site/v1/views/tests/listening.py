@@ -1,8 +1,8 @@
-import asyncio
 import os
-from fastapi import APIRouter, Depends, status, Request, HTTPException, UploadFile, File
-from typing import Dict, Any, List
+from fastapi import APIRouter, Depends, status, Request, Response, HTTPException, UploadFile, File
+from typing import Dict, Any, List, Optional
 from aiofiles import open as aio_open
+from pydantic_core import to_json
 
 from models.transactions import TransactionType
 from models.tests.listening import (
@@ -13,12 +13,15 @@ from models.users import User
 from ...serializers.tests import (
     ListeningDataSlimSerializer,
     ListeningPartSerializer,
+    ListeningSectionSerializer,
     ListeningAnswerSerializer,
     ListeningAnalyseResponseSerializer,
     ListeningSessionExamSerializer,
     ListeningTestCreate,
 )
 from services.tests import ListeningService
+from services.tests.snapshot_service import Snapshot, make_etag, snapshots
+from services.answer_key_cache import LISTENING, answer_keys
 from utils.auth import active_user, admin_required
 from utils import get_translation, check_user_tokens
 from utils.arq_pool import get_arq_redis
@@ -26,23 +29,84 @@ from utils.arq_pool import get_arq_redis
 router = APIRouter()
 
 
-async def _serialize_listening_session(data):
-    session_obj = type("SessionObj", (), {
-        "id": data["session_id"],
+async def _serialize_parts(parts) -> List[ListeningPartSerializer]:
+    """
+    Serialize parts with their sections and questions using three queries in total.
+    """
+    part_ids = [p.id for p in parts]
+    sections = await ListeningSection.filter(part_id__in=part_ids).order_by("section_number", "id")
+    questions = await ListeningQuestion.filter(
+        section_id__in=[s.id for s in sections]
+    ).order_by("index", "id")
+
+    questions_by_section: Dict[int, list] = {}
+    for q in questions:
+        questions_by_section.setdefault(q.section_id, []).append(q)
+    sections_by_part: Dict[int, list] = {}
+    for section in sections:
+        sections_by_part.setdefault(section.part_id, []).append(
+            ListeningSectionSerializer.from_instance(section, questions_by_section.get(section.id, []))
+        )
+    return [ListeningPartSerializer.from_instance(p, sections_by_part.get(p.id, [])) for p in parts]
+
+
+async def _exam_snapshot(listening_id: int) -> Optional[Snapshot]:
+    """
+    Pre-serialized `{"exam": ..., "parts": [...]}` body of a listening test.
+    """
+    async def build() -> Optional[bytes]:
+        exam = await Listening.get_or_none(id=listening_id)
+        if not exam:
+            return None
+        parts = await ListeningPart.filter(listening_id=listening_id).order_by("part_number", "id")
+        return to_json({
+            "exam": await ListeningSessionExamSerializer.from_orm(exam),
+            "parts": await _serialize_parts(parts),
+        })
+
+    return await snapshots.get_or_build(LISTENING, f"exam:{listening_id}", build)
+
+
+async def _part_snapshot(part_id: int) -> Optional[Snapshot]:
+    """
+    Pre-serialized body of a listening part with its sections and questions.
+    """
+    async def build() -> Optional[bytes]:
+        part = await ListeningPart.get_or_none(id=part_id)
+        if not part:
+            return None
+        return to_json((await _serialize_parts([part]))[0])
+
+    return await snapshots.get_or_build(LISTENING, f"part:{part_id}", build)
+
+
+def _snapshot_response(request: Request, body: bytes, etag: str, status_code: int = 200) -> Response:
+    """
+    Return raw JSON bytes with an ETag, or 304 when the client already has them.
+    """
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=body, status_code=status_code, media_type="application/json", headers={"ETag": etag})
+
+
+async def _listening_session_response(request: Request, data: dict, t: dict, status_code: int = 200) -> Response:
+    """
+    Splice the session fields into the cached exam snapshot without re-serializing it.
+    """
+    snapshot = await _exam_snapshot(data["exam_id"])
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=t.get("test_not_found", "Listening test not found")
+        )
+    header = to_json({
+        "session_id": data["session_id"],
         "status": data["status"],
         "start_time": data["start_time"],
         "end_time": data["end_time"],
-    })()
-    exam = await ListeningSessionExamSerializer.from_orm(data["exam"])
-    parts = await asyncio.gather(*(ListeningPartSerializer.from_orm(p) for p in data["parts"]))
-    return ListeningDataSlimSerializer(
-        session_id=session_obj.id,
-        status=session_obj.status,
-        start_time=session_obj.start_time,
-        end_time=session_obj.end_time,
-        exam=exam,
-        parts=parts,
-    )
+    })
+    body = header[:-1] + b"," + snapshot.body[1:]
+    return _snapshot_response(request, body, make_etag(header + snapshot.etag.encode()), status_code)
 
 
 @router.post(
@@ -59,7 +123,7 @@ async def start_listening_test(
 ):
     await check_user_tokens(user, TransactionType.TEST_LISTENING, request, t)
     session_data = await ListeningService.start_session(user, t)
-    return await _serialize_listening_session(session_data)
+    return await _listening_session_response(request, session_data, t, status.HTTP_201_CREATED)
 
 
 @router.get(
@@ -70,6 +134,7 @@ async def start_listening_test(
 )
 async def get_listening_session(
     session_id: int,
+    request: Request,
     user=Depends(active_user),
     t: Dict[str, str] = Depends(get_translation),
 ):
@@ -77,7 +142,7 @@ async def get_listening_session(
     Get details of a listening session.
     """
     data = await ListeningService.get_session_data(session_id, user.id, t)
-    return await _serialize_listening_session(data)
+    return await _listening_session_response(request, data, t)
 
 
 @router.get(
@@ -88,14 +153,20 @@ async def get_listening_session(
 )
 async def get_listening_part(
     part_id: int,
+    request: Request,
     user=Depends(active_user),
     t: Dict[str, str] = Depends(get_translation),
 ):
     """
     Get details of a listening part (sections and questions).
     """
-    part = await ListeningService.get_part(part_id, t)
-    return await ListeningPartSerializer.from_orm(part)
+    snapshot = await _part_snapshot(part_id)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=t.get("listening_part_not_found", "Listening part not found")
+        )
+    return _snapshot_response(request, snapshot.body, snapshot.etag)
 
 
 @router.post(
@@ -261,6 +332,7 @@ async def create_listening_test(
                     options=q_options,
                     correct_answer=q_data["correct_answer"]
                 )
+    await answer_keys.invalidate(LISTENING)
     return {"id": listening.id, "message": "Listening test created"}
 
 # --- Read (list all) Listening Tests ---
@@ -364,6 +436,7 @@ async def update_listening_test(
                 part_data["audio_file"] = f"/media/audio/{audio_file}"
 
     await test.save()
+    await answer_keys.invalidate(LISTENING)
     return {"id": test.id, "message": "Listening test updated"}
 
 # --- Delete Listening Test ---
@@ -381,4 +454,5 @@ async def delete_listening_test(
     if not test:
         raise HTTPException(status_code=404, detail=t.get("test_not_found", "Listening test not found"))
     await test.delete()
+    await answer_keys.invalidate(LISTENING)
     return {"message": "Listening test deleted"}
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, status, UploadFile, File, Form, Request
+from fastapi import APIRouter, Depends, status, UploadFile, File, Form, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, Optional
 
 from models.transactions import TransactionType
@@ -12,6 +13,8 @@ from utils.arq_pool import get_arq_redis
 
 router = APIRouter()
 
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 
 @router.post(
     "/start/",
@@ -53,7 +56,7 @@ async def get_speaking_session(
 @router.post(
     "/{session_id}/answers/",
     response_model=Dict[str, Any],
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Submit audio answers for a speaking session"
 )
 async def submit_speaking_answers(
@@ -70,6 +73,7 @@ async def submit_speaking_answers(
 ):
     """
     Submit audio answers for a speaking session.
+    The analysis runs in the background; poll its status or the analysis endpoint.
     """
     audio_files = {
         "part1": part1_audio,
@@ -84,6 +88,7 @@ async def submit_speaking_answers(
         user_id=user.id,
         audio_files=audio_files,
         t=t,
+        redis=redis,
         lang_code=lang_code
     )
     return result
@@ -131,12 +136,57 @@ async def restart_speaking_session(
 )
 async def get_speaking_analysis(
     session_id: int,
+    response: Response,
     user=Depends(active_user),
     t: Dict[str, str] = Depends(get_translation),
+    redis=Depends(get_arq_redis),
     request: Request = None,
 ):
     """
     Get analysis for a completed speaking session.
+    Returns 202 with the job status while the analysis is still running.
     """
-    result = await SpeakingService.get_analysis(session_id, user.id, t, request)
+    lang_code = "en"
+    if request:
+        lang_code = request.headers.get("Accept-Language", "en").split(",")[0].lower()
+    result = await SpeakingService.get_analysis(session_id, user.id, t, redis, lang_code)
+    if "analysis" not in result:
+        response.status_code = status.HTTP_202_ACCEPTED
     return result
+
+
+@router.get(
+    "/{session_id}/analysis/status/",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Get analysis job status for a speaking session"
+)
+async def get_speaking_analysis_status(
+    session_id: int,
+    user=Depends(active_user),
+    t: Dict[str, str] = Depends(get_translation),
+    redis=Depends(get_arq_redis),
+):
+    """
+    Get the analysis job status of a speaking session: queued, running, done or failed.
+    """
+    return await SpeakingService.get_analysis_status(session_id, user.id, t, redis)
+
+
+@router.get(
+    "/{session_id}/analysis/events/",
+    status_code=status.HTTP_200_OK,
+    summary="Stream analysis progress of a speaking session (Server-Sent Events)"
+)
+async def stream_speaking_analysis_events(
+    session_id: int,
+    user=Depends(active_user),
+    t: Dict[str, str] = Depends(get_translation),
+    redis=Depends(get_arq_redis),
+):
+    """
+    Stream analysis progress events (queued, transcribed, scored, saved, failed) of a speaking session.
+    The "saved" event carries the analysis and ends the stream.
+    """
+    events = await SpeakingService.stream_analysis_events(session_id, user.id, t, redis)
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -1,12 +1,10 @@
 from fastapi import APIRouter, Depends, Query, status
 from typing import List, Optional
-from datetime import timedelta, datetime, timezone
-from tortoise.expressions import Q
+from datetime import timedelta, datetime
 import random
 
 from ...serializers.tests.top import TopUserIELTSSerializer
-from models import User, TokenTransaction
-from utils.ielts_score import IELTSScoreCalculator
+from services.leaderboard_service import leaderboard
 
 router = APIRouter()
 
@@ -40,30 +38,12 @@ async def get_top_users_ielts(
 ):
     """
     Get top 100 users by IELTS score for a given period and test type,
+    served from the materialized leaderboard.
     """
-    now = datetime.utcnow()
-    if period == "week":
-        start_date = now - timedelta(days=7)
-    elif period == "month":
-        start_date = now - timedelta(days=30)
-    else:
-        start_date = None
-
-    filters = Q()
-    if start_date:
-        filters &= Q(created_at__gte=start_date)
-    if test_type:
-        filters &= Q(transaction_type=test_type.upper())
-
-    transactions = await TokenTransaction.filter(filters).select_related("user")
-    user_ids = set(t.user_id for t in transactions)
-    users = await User.filter(id__in=user_ids)
-
-    user_scores = {user: await IELTSScoreCalculator.calculate(user) for user in users}
-    sorted_users = sorted(user_scores.items(), key=lambda item: item[1], reverse=True)
+    ranked = await leaderboard.top(period, test_type, limit=100)
 
     top_users = []
-    for user, score in sorted_users[:100]:
+    for user, score in ranked:
         reg_date = None
         if hasattr(user, "created_at") and user.created_at:
             reg_date = user.created_at.strftime("%d.%m.%Y")
@@ -1,16 +1,18 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Request
+from fastapi import APIRouter, Depends, status, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, Optional
 
-from models.transactions import TransactionType
-
 from ...serializers.tests.writing import WritingSerializer, WritingSubmitRequest
 from services.tests import WritingService
 from models.tests import TestTypeEnum
 from utils.auth import active_user
-from utils import get_translation, check_user_tokens
+from utils import get_translation
+from utils.arq_pool import get_arq_redis
 
 router = APIRouter()
 
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 
 @router.post(
     "/start/",
@@ -21,12 +23,10 @@ router = APIRouter()
 async def start_writing_test(
     user=Depends(active_user),
     t: Dict[str, str] = Depends(get_translation),
-    request: Request = None,
 ):
     """
     Start a new writing test session.
     """
-    await check_user_tokens(user, TransactionType.TEST_WRITING, request, t)
     session_data = await WritingService.start_session(user, t)
     return await WritingSerializer.from_orm(session_data)
 
@@ -51,7 +51,7 @@ async def get_writing_session(
 
 @router.post(
     "/session/{session_id}/submit/",
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Submit answers for a writing session"
 )
 async def submit_writing_answers(
@@ -59,8 +59,13 @@ async def submit_writing_answers(
     payload: WritingSubmitRequest,
     user=Depends(active_user),
     t: Dict[str, str] = Depends(get_translation),
+    redis=Depends(get_arq_redis),
     request: Request = None,
 ):
+    """
+    Submit answers for a writing session.
+    The analysis runs in the background; poll its status or the analysis endpoint.
+    """
     lang_code = "en"
     if request:
         lang_code = request.headers.get("accept-language", "en").split(",")[0].lower()
@@ -71,6 +76,7 @@ async def submit_writing_answers(
         part1_answer=payload.part1_answer,
         part2_answer=payload.part2_answer,
         t=t,
+        redis=redis,
         lang_code=lang_code,
     )
     return result
@@ -115,12 +121,57 @@ async def restart_writing_session(
 )
 async def get_writing_analysis(
     session_id: int,
+    response: Response,
     user=Depends(active_user),
     t: Dict[str, str] = Depends(get_translation),
+    redis=Depends(get_arq_redis),
     request: Request = None,
 ):
     """
     Get analysis for a completed writing session.
+    Returns 202 with the job status while the analysis is still running.
+    """
+    lang_code = "en"
+    if request:
+        lang_code = request.headers.get("Accept-Language", "en").split(",")[0].lower()
+    result = await WritingService.get_analysis(session_id, user.id, t, redis, lang_code)
+    if "analysis" not in result:
+        response.status_code = status.HTTP_202_ACCEPTED
+    return result
+
+
+@router.get(
+    "/session/{session_id}/analysis/status/",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Get analysis job status for a writing session"
+)
+async def get_writing_analysis_status(
+    session_id: int,
+    user=Depends(active_user),
+    t: Dict[str, str] = Depends(get_translation),
+    redis=Depends(get_arq_redis),
+):
+    """
+    Get the analysis job status of a writing session: queued, running, done or failed.
+    """
+    return await WritingService.get_analysis_status(session_id, user.id, t, redis)
+
+
+@router.get(
+    "/session/{session_id}/analysis/events/",
+    status_code=status.HTTP_200_OK,
+    summary="Stream analysis progress of a writing session (Server-Sent Events)"
+)
+async def stream_writing_analysis_events(
+    session_id: int,
+    user=Depends(active_user),
+    t: Dict[str, str] = Depends(get_translation),
+    redis=Depends(get_arq_redis),
+):
+    """
+    Stream analysis progress events (queued, transcribed, scored, saved, failed) of a writing session.
+    The "saved" event carries the analysis and ends the stream.
     """
-    result = await WritingService.get_analysis(session_id, user.id, t, request)
-    return result
\ No newline at end of file
+    events = await WritingService.stream_analysis_events(session_id, user.id, t, redis)
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -36,10 +36,10 @@ async def request_password_reset(
     if not user or not user.is_active:
         raise HTTPException(status_code=404, detail=t["user_not_found"])
 
-    # Rate limit check
-    if await forget_password_limiter.is_blocked(normalized_email):
-        raise HTTPException(status_code=429, detail=t["too_many_attempts"])
-    await forget_password_limiter.register_attempt(normalized_email)
+    # Rate limit check and attempt record (one atomic step)
+    attempt = await forget_password_limiter.hit(normalized_email)
+    if not attempt.allowed:
+        raise HTTPException(status_code=429, detail=t["too_many_attempts"], headers=attempt.headers)
 
     # Send OTP code
     try:
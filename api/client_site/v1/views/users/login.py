@@ -51,37 +51,33 @@ async def login(
             detail=t.get("empty_password", "Password must not be empty")
         )
 
-    # Rate limit check
-    if await login_limiter.is_blocked(email):
+    # Rate limit check (every attempt counts until a successful login resets it)
+    attempt = await login_limiter.hit(email)
+    if not attempt.allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=t["too_many_attempts"]
+            detail=t["too_many_attempts"],
+            headers=attempt.headers,
         )
 
-    try:
-        user = await UserService.authenticate(email, data.password, t)
-        await login_limiter.reset(email)
-        await UserService.update_user(user.id, t, last_login=datetime.utcnow())
-
-        # Generate tokens
-        access_token = await create_access_token(subject=str(user.id), email=user.email)
-        refresh_token = await create_refresh_token(subject=str(user.id), email=user.email)
+    user = await UserService.authenticate(email, data.password, t)
+    await login_limiter.reset(email)
+    await UserService.update_user(user.id, t, last_login=datetime.utcnow())
 
-        # Enqueue activity log job
-        await redis.enqueue_job(
-            "log_user_activity", user_id=user.id, action="login"
-        )
+    # Generate tokens
+    access_token = await create_access_token(subject=str(user.id), email=user.email)
+    refresh_token = await create_refresh_token(subject=str(user.id), email=user.email)
 
-        return AuthResponseSerializer(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            auth_type="Bearer"
-        )
+    # Enqueue activity log job
+    await redis.enqueue_job(
+        "log_user_activity", user_id=user.id, action="login"
+    )
 
-    except HTTPException as exc:
-        # Register failed attempt
-        await login_limiter.register_attempt(email)
-        raise
+    return AuthResponseSerializer(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        auth_type="Bearer"
+    )
 
 
 @router.post(
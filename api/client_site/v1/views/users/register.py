@@ -27,20 +27,22 @@ async def register(
     """
     Register a new user:
     - Normalize email input
-    - Enforce registration rate limit
+    - Enforce registration rate limit (recording the attempt)
     - Prevent duplicate verified accounts
     - Create or reuse unverified user
     - Send email verification code
-    - Record attempt and enqueue activity log
+    - Enqueue activity log
     - Return success message
     """
     email = data.email.lower().strip()
 
-    # Check rate limit for registration
-    if await register_limiter.is_blocked(email):
+    # Check rate limit and record the attempt
+    attempt = await register_limiter.hit(email)
+    if not attempt.allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=t["too_many_attempts"]
+            detail=t["too_many_attempts"],
+            headers=attempt.headers,
         )
 
     # Prevent re-registration if already verified
@@ -70,9 +72,6 @@ async def register(
         # Propagate verification errors
         raise
 
-    # Record attempt in limiter
-    await register_limiter.register_attempt(email)
-
     # Enqueue activity logging job
     await redis.enqueue_job(
         "log_user_activity",
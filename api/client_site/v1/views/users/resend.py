@@ -27,17 +27,16 @@ async def resend_otp(
 
     Steps:
     1. Normalize and validate input.
-    2. Check resend rate limit.
-    3. Register resend attempt for limiter.
-    4. Send verification code using VerificationService.
-    5. Return response.
+    2. Check resend rate limit and register the attempt (one atomic step).
+    3. Send verification code using VerificationService.
+    4. Return response.
     """
     email = data.email.lower().strip()
     key = f"{data.verification_type}:{email}"
 
-    if await resend_limiter.is_blocked(key):
-        raise HTTPException(status_code=429, detail=t["too_many_attempts"])
-
+    attempt = await resend_limiter.hit(key)
+    if not attempt.allowed:
+        raise HTTPException(status_code=429, detail=t["too_many_attempts"], headers=attempt.headers)
 
     try:
         await VerificationService.send_verification_code(
@@ -49,5 +48,4 @@ async def resend_otp(
         detail = exc.detail if isinstance(exc.detail, str) else t["otp_resend_failed"]
         raise HTTPException(status_code=exc.status_code, detail=detail)
 
-    await resend_limiter.register_attempt(key)
     return ResendOTPResponseSerializer(message=t["code_resent"])
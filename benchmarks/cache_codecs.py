@@ -0,0 +1,119 @@
+"""
+Benchmark of the cache codecs and compressors on real payloads.
+
+Payloads: the tariffs plan list (built from fixtures/ in an in-memory SQLite,
+as served by GET /api/v1/tariffs/), the reading passages fixture and the
+speaking questions fixture. Every installed codec / compressor pair is timed
+against the former json.dumps(default=str) path; the plan list is also timed
+through its typed (List[PlanInfo]) round trip.
+
+    python -m benchmarks.cache_codecs --repeat 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, List
+
+from tortoise import Tortoise
+
+from config import BASE_DIR, DATABASE_CONFIG
+from models import Feature, Tariff, TariffCategory, TariffFeature
+from services.cache_codecs import CacheSerializer, available_codecs, available_compressors
+from services.cache_service import type_adapter
+from api.client_site.v1.serializers.tariffs import PlanInfo
+from api.client_site.v1.views.tariffs import _load_plans
+
+FIXTURES = BASE_DIR / "fixtures"
+
+
+def read_fixture(name: str) -> list:
+    with open(FIXTURES / f"{name}.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def plan_list(lang: str = "ru") -> List[PlanInfo]:
+    """
+    The plan list of one language, built by the view's loader from the tariff fixtures.
+    """
+    models = [m for m in DATABASE_CONFIG["apps"]["models"]["models"] if m != "aerich.models"]
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": models})
+    await Tortoise.generate_schemas()
+    try:
+        for model, fixture in (
+            (TariffCategory, "tariff_categories"),
+            (Tariff, "tariffs"),
+            (Feature, "features"),
+            (TariffFeature, "tariff_features"),
+        ):
+            for row in read_fixture(fixture):
+                row = {k: v for k, v in row.items() if k not in ("created_at", "updated_at")}
+                await model.create(**row)
+        return await _load_plans.__wrapped__(lang)
+    finally:
+        await Tortoise.close_connections()
+
+
+def per_call(fn: Callable[[], Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1_000_000
+
+
+def report(name: str, size: int, dumps_us: float, loads_us: float) -> None:
+    print(f"  {name:<16} {size:>9} B  dumps={dumps_us:>9.1f}us  loads={loads_us:>9.1f}us")
+
+
+def bench(title: str, value: Any, repeat: int) -> None:
+    print(f"{title}")
+
+    # Former path: json.dumps(default=str) into a text key
+    legacy = json.dumps(value, default=str)
+    report(
+        "legacy json",
+        len(legacy.encode("utf-8")),
+        per_call(lambda: json.dumps(value, default=str), repeat),
+        per_call(lambda: json.loads(legacy), repeat),
+    )
+
+    for codec in available_codecs():
+        for compression in available_compressors():
+            serializer = CacheSerializer(codec=codec, compression=compression, threshold=0)
+            data = serializer.dumps(value)
+            report(
+                f"{codec}+{compression}",
+                len(data),
+                per_call(lambda: serializer.dumps(value), repeat),
+                per_call(lambda: serializer.loads(data), repeat),
+            )
+
+
+def bench_typed(plans: List[PlanInfo], repeat: int) -> None:
+    adapter = type_adapter(List[PlanInfo])
+    serializer = CacheSerializer()
+    data = serializer.dumps(adapter.dump_python(plans, mode="json"))
+    print(f"plan list, typed List[PlanInfo] ({serializer.codec.name}+{serializer.compressor.name})")
+    report(
+        "model_dump",
+        len(data),
+        per_call(lambda: serializer.dumps(adapter.dump_python(plans, mode="json")), repeat),
+        per_call(lambda: adapter.validate_python(serializer.loads(data)), repeat),
+    )
+
+
+def main(repeat: int) -> None:
+    plans = asyncio.run(plan_list())
+    plain_plans = type_adapter(List[PlanInfo]).dump_python(plans, mode="json")
+
+    bench("plan list", plain_plans, repeat)
+    bench_typed(plans, repeat)
+    bench("speaking questions fixture", read_fixture("speaking_questions"), max(1, repeat // 10))
+    bench("reading passages fixture", read_fixture("reading_passages"), max(1, repeat // 50))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000, help="Iterations for the plan list (fewer for larger payloads)")
+    args = parser.parse_args()
+    main(args.repeat)
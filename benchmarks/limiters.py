@@ -0,0 +1,111 @@
+"""
+Microbenchmark of the Redis limiter engines against a local Redis (REDIS_URL).
+
+For each variant, `--ops` attempts are fired with `--concurrency` in flight,
+spread over `--keys` identifiers. The former GET + SETEX / INCR + EXPIRE
+limiter is timed as a baseline. A storm of concurrent attempts on one key
+also checks that no variant lets more than `limit` through.
+
+    python -m benchmarks.limiters --ops 20000 --concurrency 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from redis.asyncio import Redis
+
+from config import REDIS_URL
+from utils.limiters.engine import ENGINES
+
+LIMIT = 5
+PERIOD = timedelta(minutes=15)
+
+
+class LegacyLimiter:
+    """
+    The pre-Lua limiter: is_blocked (GET) followed by register_attempt (GET, then SETEX or INCR + EXPIRE).
+    """
+
+    def __init__(self, redis_client: Redis, limit: int, period: timedelta):
+        self.redis = redis_client
+        self.limit = limit
+        self.period = int(period.total_seconds())
+
+    async def hit(self, key: str) -> bool:
+        curr = await self.redis.get(key)
+        if curr is not None and int(curr) >= self.limit:
+            return False
+        curr = await self.redis.get(key)
+        if curr is None:
+            await self.redis.setex(key, self.period, 1)
+        else:
+            await self.redis.incr(key)
+            await self.redis.expire(key, self.period)
+        return True
+
+
+async def run(hit, ops: int, concurrency: int, keys: list) -> list:
+    """
+    Latency of each of `ops` hits, `concurrency` at a time.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await hit(keys[i % len(keys)])
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i) for i in range(ops)))
+    return latencies
+
+
+async def storm(hit, attempts: int, key: str) -> int:
+    """
+    Number of attempts let through when all hit one key at once.
+    """
+    results = await asyncio.gather(*(hit(key) for _ in range(attempts)))
+    return sum(1 for r in results if (r if isinstance(r, bool) else r.allowed))
+
+
+def report(name: str, latencies: list, elapsed: float, allowed: int) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:<14} {len(latencies) / elapsed:>9.0f} ops/s  "
+        f"p50={statistics.median(latencies) * 1000:.2f}ms p99={p99 * 1000:.2f}ms  "
+        f"storm allowed={allowed}/{LIMIT}"
+    )
+
+
+async def main(ops: int, concurrency: int, key_count: int) -> None:
+    redis_client = Redis.from_url(REDIS_URL, decode_responses=True)
+    namespace = f"bench_limiter:{uuid.uuid4().hex[:8]}"
+    variants = {"legacy": LegacyLimiter(redis_client, LIMIT, PERIOD)}
+    variants.update({name: engine(redis_client, LIMIT, PERIOD) for name, engine in ENGINES.items()})
+
+    try:
+        for name, limiter in variants.items():
+            keys = [f"{namespace}:{name}:{i}" for i in range(key_count)]
+            started = time.perf_counter()
+            latencies = await run(limiter.hit, ops, concurrency, keys)
+            elapsed = time.perf_counter() - started
+            allowed = await storm(limiter.hit, concurrency, f"{namespace}:{name}:storm")
+            report(name, latencies, elapsed, allowed)
+    finally:
+        async for key in redis_client.scan_iter(f"{namespace}:*"):
+            await redis_client.delete(key)
+        await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--keys", type=int, default=1000, help="Distinct identifiers the attempts are spread over")
+    args = parser.parse_args()
+    asyncio.run(main(args.ops, args.concurrency, args.keys))
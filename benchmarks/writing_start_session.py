@@ -0,0 +1,135 @@
+"""
+Benchmark of WritingService.start_session against a fake OpenAI backend.
+
+The shared gateway gets a fake client that answers chat completions after a
+fixed latency, the database is an in-memory SQLite and charts are rendered by
+the real chart pool. Each run times a full session start, the concurrent
+content pipeline on its own and the former sequential one (Task 1, Task 2,
+then the chart) for comparison.
+
+    python -m benchmarks.writing_start_session --runs 10 --latency 1.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+# The fake backend never sends it, but the integrations refuse to start without a key
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from tortoise import Tortoise
+
+from config import BASE_DIR, DATABASE_CONFIG
+from models import User
+from models.tests import TestType, TestTypeEnum, WritingPart1
+from services.chart_service import chart_service
+from services.chatgpt.gateway import gateway
+from services.chatgpt.writing_integration import ChatGPTWritingIntegration
+from services.tests import WritingService
+
+
+class FakeCompletions:
+    """
+    Answers Task 1 prompts with random chart data (so every run renders a new
+    diagram) and Task 2 prompts with a fixed question, after `latency` seconds.
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def create(self, model: str, messages: list, **kwargs):
+        await asyncio.sleep(self.latency)
+        if "chart_type" in messages[0]["content"]:
+            content = {
+                "question": "The chart compares household expenditure in two years.",
+                "chart_type": random.choice(["bar", "line", "pie"]),
+                "categories": ["Food", "Housing", "Transport", "Leisure"],
+                "year1": 2000,
+                "year2": 2020,
+                "data_year1": [random.randint(5, 40) for _ in range(4)],
+                "data_year2": [random.randint(5, 40) for _ in range(4)],
+            }
+        else:
+            content = {"question": "Some people think that cities should ban cars. Discuss both views."}
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(content)))])
+
+
+class FakeOpenAI:
+    def __init__(self, latency: float):
+        self.chat = SimpleNamespace(completions=FakeCompletions(latency))
+
+
+async def sequential_pipeline(user_id: int) -> str:
+    """
+    The pre-concurrency order of steps, for comparison: Task 1, Task 2, then the diagram.
+    """
+    chatgpt = ChatGPTWritingIntegration()
+    part1 = await chatgpt.generate_writing_part1_question(user_id=user_id)
+    await chatgpt.generate_writing_part2_question(user_id=user_id)
+    diagram_data = {key: part1[key] for key in ("categories", "year1", "year2", "data_year1", "data_year2")}
+    return await chart_service.render(part1["chart_type"], diagram_data)
+
+
+async def timed(coro) -> float:
+    started = time.perf_counter()
+    await coro
+    return time.perf_counter() - started
+
+
+def report(name: str, samples: list) -> None:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(
+        f"{name:<12} runs={len(samples)} mean={statistics.mean(samples) * 1000:.0f}ms "
+        f"p50={statistics.median(samples) * 1000:.0f}ms p95={p95 * 1000:.0f}ms"
+    )
+
+
+async def main(runs: int, latency: float) -> None:
+    models = [m for m in DATABASE_CONFIG["apps"]["models"]["models"] if m != "aerich.models"]
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": models})
+    await Tortoise.generate_schemas()
+    gateway._client = FakeOpenAI(latency)
+    t = {}
+
+    try:
+        await TestType.create(type=TestTypeEnum.WRITING_ENG, price=1, trial_price=1)
+        user = await User.create(email="bench@example.com", password="x", tokens=runs)
+        await chart_service.warm()
+
+        start, concurrent, sequential, diagrams = [], [], [], []
+        for _ in range(runs):
+            start.append(await timed(WritingService.start_session(user, t)))
+
+            started = time.perf_counter()
+            content = await WritingService.generate_content(user.id, t)
+            concurrent.append(time.perf_counter() - started)
+            diagrams.append(content["diagram"])
+
+            started = time.perf_counter()
+            diagrams.append(await sequential_pipeline(user.id))
+            sequential.append(time.perf_counter() - started)
+
+        report("start", start)
+        report("concurrent", concurrent)
+        report("sequential", sequential)
+        print(f"tokens left: {user.tokens}")
+        diagrams += await WritingPart1.all().values_list("diagram", flat=True)
+    finally:
+        chart_service.shutdown()
+        await Tortoise.close_connections()
+
+    for diagram in set(diagrams):
+        (BASE_DIR / "media" / diagram).unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake OpenAI latency per call (seconds)")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.latency))
@@ -33,6 +33,7 @@ DATABASE_CONFIG = {
                 "models.tests.speaking",
                 "models.tests.writing",
                 "models.tests.test_type",
+                "models.tests.content_pool",
                 "models.analyses",
                 "models.comments",
                 "models.notifications",
@@ -77,4 +78,26 @@ TELEGRAM_BOT_TOKEN = config("TELEGRAM_BOT_TOKEN", default="")
 # === Admin settings ===
 ADMIN_USER_MODEL = config("ADMIN_USER_MODEL")
 ADMIN_USER_MODEL_USERNAME_FIELD = config("ADMIN_USER_MODEL_USERNAME_FIELD")
-ADMIN_SECRET_KEY = config("ADMIN_SECRET_KEY")
\ No newline at end of file
+ADMIN_SECRET_KEY = config("ADMIN_SECRET_KEY")
+
+# === Audio settings ===
+# Normalize speaking uploads with ffmpeg (mono, 16 kHz, trimmed, Opus) before transcription
+AUDIO_NORMALIZATION = config("AUDIO_NORMALIZATION", cast=bool, default=False)
+AUDIO_NORMALIZATION_WORKERS = config("AUDIO_NORMALIZATION_WORKERS", cast=int, default=2)
+# Share of normalized parts also transcribed from the original to measure transcript drift
+AUDIO_QUALITY_SAMPLE_RATE = config("AUDIO_QUALITY_SAMPLE_RATE", cast=float, default=0.0)
+# Speech-to-text backend: "whisper" (OpenAI) or "stub" (local, for development and tests)
+TRANSCRIPTION_BACKEND = config("TRANSCRIPTION_BACKEND", default="whisper")
+
+# === Rate limiting ===
+# Per-user / per-IP API quotas enforced by utils.limiters.RateLimitMiddleware
+RATE_LIMIT_ENABLED = config("RATE_LIMIT_ENABLED", cast=bool, default=True)
+# Take the client address from X-Forwarded-For (only behind a trusted reverse proxy)
+RATE_LIMIT_TRUST_FORWARDED = config("RATE_LIMIT_TRUST_FORWARDED", cast=bool, default=False)
+
+# === Cache settings ===
+# Serialization of cached values: "orjson", "msgpack" or "json" (falls back to json when not installed)
+CACHE_CODEC = config("CACHE_CODEC", default="orjson")
+# Compression of large values: "zstd", "lz4", "zlib" or "none"
+CACHE_COMPRESSION = config("CACHE_COMPRESSION", default="zstd")
+CACHE_COMPRESSION_THRESHOLD = config("CACHE_COMPRESSION_THRESHOLD", cast=int, default=1024)
@@ -4,9 +4,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from tortoise.contrib.fastapi import register_tortoise
 from config import (
-    DATABASE_CONFIG, ALLOWED_HOSTS, ADMIN_SECRET_KEY
+    DATABASE_CONFIG, ALLOWED_HOSTS, ADMIN_SECRET_KEY, RATE_LIMIT_ENABLED
 )
 from api.client_site.v1 import router as client_site_v1_router
+from services.chart_service import chart_service
+from utils.arq_pool import close_arq_pool, open_arq_pool
+from utils.limiters import RateLimitMiddleware
 
 # === Logging configuration ===
 logging.basicConfig(
@@ -25,6 +28,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# === Rate limiting (added before CORS so 429 responses get CORS headers too) ===
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # === CORS middleware ===
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +46,14 @@ app.add_middleware(
 app.include_router(client_site_v1_router, prefix="/api/v1")
 app.mount("/media", StaticFiles(directory="media"), name="media")
 
+# === Chart rendering pool ===
+app.router.add_event_handler("startup", chart_service.warm)
+app.router.add_event_handler("shutdown", chart_service.shutdown)
+
+# === ARQ connection pool ===
+app.router.add_event_handler("startup", open_arq_pool)
+app.router.add_event_handler("shutdown", close_arq_pool)
+
 # === Database setup ===
 register_tortoise(
     app,
@@ -91,3 +91,30 @@ class ReadingAnalyse(BaseModel):
         passage_title = getattr(self.passage, "title", self.passage_id)
         user_email = getattr(self.user, "email", self.user_id)
         return f"Analysis for {passage_title} by {user_email}"
+
+
+class UserScoreSummary(BaseModel):
+    """Denormalized per-user scores, refreshed whenever a new analysis is written."""
+    user = fields.OneToOneField("models.User", related_name="score_summary", on_delete=fields.CASCADE, description="User")
+    listening_latest = fields.DecimalField(max_digits=3, decimal_places=1, null=True, description="Latest listening score")
+    listening_best = fields.DecimalField(max_digits=3, decimal_places=1, null=True, description="Best listening score")
+    listening_average = fields.DecimalField(max_digits=4, decimal_places=2, null=True, description="Average listening score")
+    reading_latest = fields.DecimalField(max_digits=3, decimal_places=1, null=True, description="Latest reading score")
+    reading_best = fields.DecimalField(max_digits=3, decimal_places=1, null=True, description="Best reading score")
+    reading_average = fields.DecimalField(max_digits=4, decimal_places=2, null=True, description="Average reading score")
+    speaking_latest = fields.DecimalField(max_digits=3, decimal_places=1, null=True, description="Latest speaking score")
+    speaking_best = fields.DecimalField(max_digits=3, decimal_places=1, null=True, description="Best speaking score")
+    speaking_average = fields.DecimalField(max_digits=4, decimal_places=2, null=True, description="Average speaking score")
+    writing_latest = fields.DecimalField(max_digits=3, decimal_places=1, null=True, description="Latest writing score")
+    writing_best = fields.DecimalField(max_digits=3, decimal_places=1, null=True, description="Best writing score")
+    writing_average = fields.DecimalField(max_digits=4, decimal_places=2, null=True, description="Average writing score")
+    overall_score = fields.DecimalField(max_digits=3, decimal_places=1, default=0, description="Overall band from section averages")
+    highest_score = fields.DecimalField(max_digits=3, decimal_places=1, default=0, description="Overall band from section bests")
+
+    class Meta:
+        table = "user_score_summaries"
+        verbose_name = "User Score Summary"
+        verbose_name_plural = "User Score Summaries"
+
+    def __str__(self):
+        return f"Score summary for user {self.user_id} - Overall: {self.overall_score}"
@@ -2,4 +2,5 @@ from .listening import *
 from .reading import *
 from .speaking import *
 from .writing import *
-from .test_type import *
\ No newline at end of file
+from .test_type import *
+from .content_pool import *
\ No newline at end of file
@@ -0,0 +1,19 @@
+from tortoise import fields
+from ..base import BaseModel
+from .test_type import TestTypeEnum
+
+
+class ContentPoolItem(BaseModel):
+    """Pre-generated, validated test content waiting to be handed out to a new session."""
+    test_type = fields.CharEnumField(TestTypeEnum, max_length=20, description="Type of test the content is for")
+    level = fields.CharField(max_length=20, default="default", description="Difficulty level of the content")
+    payload = fields.JSONField(description="Validated content (e.g. speaking questions per part)")
+
+    class Meta:
+        table = "content_pool"
+        verbose_name = "Content Pool Item"
+        verbose_name_plural = "Content Pool Items"
+        indexes = (("test_type", "level"),)
+
+    def __str__(self):
+        return f"{self.test_type} ({self.level}) content {self.id}"
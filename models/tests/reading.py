@@ -93,3 +93,20 @@ class ReadingVariant(BaseModel):
 
     def __str__(self) -> str:
         return f"Variant for {self.question.text}"
+
+class ReadingAnswerVerdict(BaseModel):
+    """Ruling on a free-text answer to a question, reused to grade identical answers without the model."""
+    question = fields.ForeignKeyField('models.ReadingQuestion', related_name='verdicts', on_delete=fields.CASCADE, description="Related question")
+    normalized_answer = fields.CharField(max_length=255, description="Normalized answer text")
+    is_correct = fields.BooleanField(description="Whether the answer is correct")
+    correct_answer = fields.TextField(null=True, description="Correct answer text")
+    explanation = fields.TextField(null=True, description="Explanation for the answer")
+
+    class Meta:
+        table = "reading_answer_verdicts"
+        verbose_name = "Answer Verdict"
+        verbose_name_plural = "Answer Verdicts"
+        unique_together = ("question_id", "normalized_answer")
+
+    def __str__(self) -> str:
+        return f"Verdict for question {self.question_id}: {self.normalized_answer}"
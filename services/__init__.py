@@ -1,2 +1,2 @@
-from .cache_service import CacheService
+from .cache_service import CacheService, cached
 from .user_progress_service import UserProgressService
\ No newline at end of file
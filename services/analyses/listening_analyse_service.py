@@ -1,7 +1,11 @@
 from fastapi import HTTPException, status
+from tortoise.transactions import in_transaction
 from datetime import timedelta
 from models.analyses import ListeningAnalyse
 from models.tests import ListeningSession, ListeningAnswer, ListeningSessionStatus
+from models.transactions import TransactionType
+from services.leaderboard_service import leaderboard
+from services.score_summary_service import ScoreSummaryService
 
 class ListeningAnalyseService:
     @staticmethod
@@ -51,12 +55,17 @@ class ListeningAnalyseService:
         band_score = calculate_score(correct_count)
         duration = (session.end_time - session.start_time) if (session.start_time and session.end_time) else timedelta(0)
 
-        analyse_obj = await ListeningAnalyse.create(
-            session_id=session_id,
-            user_id=session.user_id,
-            correct_answers=correct_count,
-            overall_score=band_score,
-            duration=duration,
+        async with in_transaction():
+            analyse_obj = await ListeningAnalyse.create(
+                session_id=session_id,
+                user_id=session.user_id,
+                correct_answers=correct_count,
+                overall_score=band_score,
+                duration=duration,
+            )
+            summary = await ScoreSummaryService.refresh(session.user_id)
+        await leaderboard.safe_record_activity(
+            session.user_id, TransactionType.TEST_LISTENING.value, float(summary.overall_score)
         )
-        
+
         return analyse_obj
\ No newline at end of file
@@ -1,10 +1,23 @@
 from fastapi import HTTPException, status
 from datetime import timedelta
 import asyncio
+from tortoise.transactions import in_transaction
 from models.tests.constants import Constants
 from services.chatgpt import ChatGPTReadingIntegration
 from models.analyses import ReadingAnalyse
 from models.tests import Reading, ReadingAnswer
+from models.transactions import TransactionType
+from services.leaderboard_service import leaderboard
+from services.answer_key_cache import answer_keys
+from services.score_summary_service import ScoreSummaryService
+from services.reading_verdict_service import ReadingVerdictService, normalize_answer
+
+# Passages of one session analysed at the same time
+MAX_CONCURRENT_PASSAGES = 3
+
+# ReadingAnswer fields written when an answer is graded
+VERDICT_FIELDS = ["is_correct", "correct_answer", "explanation"]
+
 
 class ReadingAnalyseService:
     @staticmethod
@@ -35,39 +48,52 @@ class ReadingAnalyseService:
             return (text or "").strip().lower()
         
         # Get ALL passages from session - not just those with answers
-        passages = await reading.passages.all().prefetch_related("questions")
+        passages = await reading.passages.all()
         text_map = {p.id: p.text for p in passages}
+        answers_by_question = {a.question_id: a for a in all_answers}
+        analysed = set(await ReadingAnalyse.filter(
+            user_id=user_id, passage_id__in=list(text_map)
+        ).values_list("passage_id", flat=True))
         
+        duration = (reading.end_time - reading.start_time) if (reading.start_time and reading.end_time) else timedelta(0)
+
+        # Passages are graded concurrently (ChatGPT calls included); their rows are
+        # written afterwards in one transaction together with the score summary
+        writes = []
+
         async def analyse_passage(passage_id: int, passage_text: str):
             # Check if already analyzed
-            if await ReadingAnalyse.get_or_none(passage_id=passage_id, user_id=user_id):
+            if passage_id in analysed:
                 return None
 
             # Get answers if any
             submitted = answers_by_passage.get(passage_id, [])
+            answer_key = await answer_keys.reading(passage_id)
+
+            # Verdicts are collected on the answer objects and written with one bulk update
+            changed = []
+
+            def rule(ans, is_correct, correct_answer, explanation):
+                ans.is_correct = is_correct
+                ans.correct_answer = correct_answer
+                ans.explanation = explanation
+                changed.append(ans)
             
             # If no submit for this passage, mark all questions as incorrect
             if not submitted:                
                 # Get all questions for this passage
-                passage = next((p for p in passages if p.id == passage_id), None)
-                if not passage:
-                    return None
-                    
-                questions = await passage.questions.all()
+                questions = list(answer_key)
                 
                 # Create/update answers as "not answered and incorrect"
+                missing = []
                 for q in questions:
-                    ans = next((a for a in all_answers if a.question_id == q.id), None)
+                    ans = answers_by_question.get(q.id)
                     if ans:
-                        await ReadingAnswer.filter(id=ans.id).update(
-                            is_correct=False, 
-                            status=ReadingAnswer.NOT_ANSWERED,
-                            correct_answer="", 
-                            explanation="Not answered"
-                        )
+                        ans.status = ReadingAnswer.NOT_ANSWERED
+                        rule(ans, False, "", "Not answered")
                     else:
                         # If no answer record exists - create a new one
-                        await ReadingAnswer.create(
+                        missing.append(ReadingAnswer(
                             reading_id=reading_id,
                             user_id=user_id,
                             question_id=q.id,
@@ -75,27 +101,28 @@ class ReadingAnalyseService:
                             is_correct=False,
                             correct_answer="",
                             explanation="Not answered"
-                        )
-                
-                # Create analysis record with score 0
-                await ReadingAnalyse.create(
-                    passage_id=passage_id,
-                    user_id=user_id,
-                    correct_answers=0,
-                    overall_score=1,  # Minimum IELTS score
-                    duration=(reading.end_time - reading.start_time) if (reading.start_time and reading.end_time) else timedelta(0)
-                )
+                        ))
+                async def save_skipped():
+                    if changed:
+                        await ReadingAnswer.bulk_update(changed, fields=["status", *VERDICT_FIELDS])
+                    if missing:
+                        await ReadingAnswer.bulk_create(missing)
+
+                    # Create analysis record with score 0
+                    await ReadingAnalyse.create(
+                        passage_id=passage_id,
+                        user_id=user_id,
+                        correct_answers=0,
+                        overall_score=1,  # Minimum IELTS score
+                        duration=duration
+                    )
+                writes.append(save_skipped)
                 
                 # Form response structure for skipped passage
                 questions_data = []
                 for q in questions:
-                    # Get options for MULTIPLE_CHOICE
-                    if q.type == "MULTIPLE_CHOICE":
-                        variants = await q.variants.all()
-                        correct_var = next((v for v in variants if v.is_correct), None)
-                        correct_answer = correct_var.text if correct_var else ""
-                    else:
-                        correct_answer = ""
+                    # Correct option for MULTIPLE_CHOICE
+                    correct_answer = q.correct_answer if q.type == "MULTIPLE_CHOICE" else ""
                     
                     questions_data.append({
                         "question_id": q.id,
@@ -125,10 +152,7 @@ class ReadingAnalyseService:
             
             # Mark empty answers as incorrect
             for ans in empty_qs:
-                await ReadingAnswer.filter(
-                    reading_id=reading_id, user_id=user_id,
-                    question_id=ans.question.id
-                ).update(is_correct=False, correct_answer="", explanation="No answer provided.")
+                rule(ans, False, "", "No answer provided.")
             
             # Separate questions by type
             multiple_choice_answers = [a for a in non_empty if a.question.type == "MULTIPLE_CHOICE"]
@@ -138,20 +162,12 @@ class ReadingAnalyseService:
             mc_analysis = []
             correct_mc = 0
             for ans in multiple_choice_answers:
-                variants = await ans.question.variants.all()
-                correct_var = next((v for v in variants if v.is_correct), None)
-                correct_answer = correct_var.text if correct_var else ""
-                is_corr = normalize(ans.text) == normalize(correct_answer)
+                question = answer_key.get(ans.question_id)
+                correct_answer = question.correct_answer if question else ""
+                is_corr = normalize(ans.text) == (question.normalized_answer if question else "")
                 explanation = "" if is_corr else "Incorrect option."
                 
-                await ReadingAnswer.filter(
-                    reading_id=reading_id, user_id=user_id,
-                    question_id=ans.question.id
-                ).update(
-                    is_correct=is_corr,
-                    correct_answer=correct_answer,
-                    explanation=explanation
-                )
+                rule(ans, is_corr, correct_answer, explanation)
                 
                 mc_analysis.append({
                     "question_id": ans.question.id,
@@ -164,11 +180,31 @@ class ReadingAnalyseService:
                 if is_corr:
                     correct_mc += 1
             
-            # 2. Check TEXT questions via ChatGPT
+            # 2. Check TEXT questions: known answers from stored verdicts, unseen ones via ChatGPT
             text_analysis = []
             correct_text = 0
-            
-            if text_answers:
+
+            keys = {a.question_id: (a.question_id, normalize_answer(a.text)) for a in text_answers}
+            verdicts = await ReadingVerdictService.lookup(keys.values())
+            unseen_answers = []
+            for ans in text_answers:
+                verdict = verdicts.get(keys[ans.question_id])
+                if verdict is None:
+                    unseen_answers.append(ans)
+                    continue
+
+                rule(ans, verdict.is_correct, verdict.correct_answer or "", verdict.explanation or "")
+                text_analysis.append({
+                    "question_id": ans.question.id,
+                    "user_answer": ans.text,
+                    "correct_answer": verdict.correct_answer or "",
+                    "explanation": verdict.explanation or "",
+                    "is_correct": verdict.is_correct
+                })
+                if verdict.is_correct:
+                    correct_text += 1
+
+            if unseen_answers:
                 try:
                     # Prepare data for ChatGPT
                     questions_payload = [
@@ -178,48 +214,39 @@ class ReadingAnalyseService:
                             "type": a.question.type,
                             "user_answer": a.text or ""
                         }
-                        for a in text_answers
+                        for a in unseen_answers
                     ]
-                    
+
                     # Call ChatGPT for TEXT questions check
                     result = await chatgpt.check_passage_answers(
                         text=passage_text,
                         questions=questions_payload,
                         passage_id=passage_id
                     )
-                    
-                    # Process results from ChatGPT
-                    text_analysis = result["analysis"]
-                    
-                    # Save scores to database
-                    for item in text_analysis:
-                        qid = item["question_id"]
+
+                    # Save scores and remember the rulings (only for questions that were asked)
+                    unseen_by_question = {a.question_id: a for a in unseen_answers}
+                    checked = [
+                        (unseen_by_question[item["question_id"]], item)
+                        for item in result["analysis"] if item.get("question_id") in unseen_by_question
+                    ]
+                    rulings = {}
+                    for ans, item in checked:
                         is_corr = bool(item.get("is_correct", False))
-                        
-                        await ReadingAnswer.filter(
-                            reading_id=reading_id, user_id=user_id,
-                            question_id=qid
-                        ).update(
-                            is_correct=is_corr,
-                            correct_answer=item.get("correct_answer", ""),
-                            explanation=item.get("explanation", "")
-                        )
-                        
+                        rule(ans, is_corr, item.get("correct_answer", ""), item.get("explanation", ""))
+                        text_analysis.append(item)
+                        if "is_correct" in item:
+                            rulings[keys[ans.question_id]] = item
+
                         if is_corr:
                             correct_text += 1
-                            
+                    await ReadingVerdictService.record(rulings)
+
                 except Exception as e:
-                    # In case of ChatGPT error, mark all TEXT questions as incorrect
-                    for ans in text_answers:
-                        await ReadingAnswer.filter(
-                            reading_id=reading_id, user_id=user_id,
-                            question_id=ans.question.id
-                        ).update(
-                            is_correct=False,
-                            correct_answer="",
-                            explanation=f"Error processing answer: {str(e)}"
-                        )
-                        
+                    # In case of ChatGPT error, mark unseen TEXT questions as incorrect
+                    for ans in unseen_answers:
+                        rule(ans, False, "", f"Error processing answer: {str(e)}")
+
                         text_analysis.append({
                             "question_id": ans.question.id,
                             "user_answer": ans.text,
@@ -227,7 +254,7 @@ class ReadingAnalyseService:
                             "explanation": "Error processing answer",
                             "is_correct": False
                         })
-            
+
             # 3. Combine results
             combined_analysis = mc_analysis + text_analysis
             
@@ -263,14 +290,18 @@ class ReadingAnalyseService:
 
             overall_score = calculate_ielts_band(total_correct)
             
-            # 6. Save analysis result
-            await ReadingAnalyse.create(
-                passage_id=passage_id,
-                user_id=user_id,
-                correct_answers=total_correct,
-                overall_score=overall_score,
-                duration=(reading.end_time - reading.start_time) if (reading.start_time and reading.end_time) else timedelta(0)
-            )
+            # 6. Queue the verdicts and analysis result for the final transaction
+            async def save_analysed():
+                if changed:
+                    await ReadingAnswer.bulk_update(changed, fields=VERDICT_FIELDS)
+                await ReadingAnalyse.create(
+                    passage_id=passage_id,
+                    user_id=user_id,
+                    correct_answers=total_correct,
+                    overall_score=overall_score,
+                    duration=duration
+                )
+            writes.append(save_analysed)
             
             # 7. Return data in the same format
             return [{
@@ -286,10 +317,25 @@ class ReadingAnalyseService:
                 }
             }]
 
-        # Create tasks for all passages (even those without answers)
-        tasks = [analyse_passage(p.id, text_map[p.id]) for p in passages]
+        # Analyse all passages concurrently (even those without answers), a bounded number at a time
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PASSAGES)
+
+        async def bounded(passage_id: int, passage_text: str):
+            async with semaphore:
+                return await analyse_passage(passage_id, passage_text)
+
+        tasks = [bounded(p.id, text_map[p.id]) for p in passages]
         results = await asyncio.gather(*tasks)
-        return [r for r in results if r]
+        results = [r for r in results if r]
+        if results:
+            async with in_transaction():
+                for save in writes:
+                    await save()
+                summary = await ScoreSummaryService.refresh(user_id)
+            await leaderboard.safe_record_activity(
+                user_id, TransactionType.TEST_READING.value, float(summary.overall_score)
+            )
+        return results
 
     @staticmethod
     async def get_passage_analysis(passage_id: int, user_id: int):
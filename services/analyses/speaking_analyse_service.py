@@ -4,6 +4,12 @@ from datetime import timedelta
 from services.chatgpt import ChatGPTSpeakingIntegration
 from models.analyses import SpeakingAnalyse
 from models.tests import Speaking, SpeakingAnswer, SpeakingStatus
+from models.transactions import TransactionType
+from services.leaderboard_service import leaderboard
+from services.score_summary_service import ScoreSummaryService
+from services.analysis_event_service import SAVED, SCORED, TRANSCRIBED, analysis_events
+from services.analysis_job_service import SPEAKING
+from services.audio import TranscriptionIncomplete, transcribe_files
 
 def analyse_to_dict(analyse: SpeakingAnalyse) -> dict:
     return {
@@ -22,7 +28,41 @@ def analyse_to_dict(analyse: SpeakingAnalyse) -> dict:
 
 class SpeakingAnalyseService:
     @staticmethod
-    async def analyse(test_id: int, lang_code: str, t: dict) -> dict:
+    async def transcribe_answers(
+        chatgpt: ChatGPTSpeakingIntegration, answers: list[SpeakingAnswer], allow_partial: bool = False
+    ) -> bool:
+        """
+        Transcribe stored audio of answers that have no text yet, all parts concurrently:
+        1. Feed every pending file to Whisper at once, each part with its own timeout.
+        2. Save the transcripts that succeeded.
+        3. Raise TranscriptionIncomplete for failed parts, unless partial results are
+           allowed, in which case they are saved as empty answers.
+        Returns whether anything was transcribed.
+        """
+        pending = {str(a.id): a for a in answers if a.text_answer is None and a.audio_answer}
+        if not pending:
+            return False
+
+        # 1. Concurrent transcription
+        result = await transcribe_files(chatgpt, {key: a.audio_answer for key, a in pending.items()})
+
+        # 2. Save successes (and failures as empty answers when partial results are accepted)
+        for key, text in result.texts.items():
+            pending[key].text_answer = text
+        if allow_partial:
+            for key in result.failed:
+                pending[key].text_answer = ""
+        done = [a for a in pending.values() if a.text_answer is not None]
+        if done:
+            await SpeakingAnswer.bulk_update(done, fields=["text_answer"])
+
+        # 3. Report failures
+        if result.failed and not allow_partial:
+            raise TranscriptionIncomplete(result.failed)
+        return True
+
+    @staticmethod
+    async def analyse(test_id: int, lang_code: str, t: dict, allow_partial: bool = False) -> dict:
         test = await Speaking.get_or_none(id=test_id)
         if not test:
             raise HTTPException(status.HTTP_404_NOT_FOUND, t.get("speaking_test_not_found", "Speaking test not found"))
@@ -34,13 +74,16 @@ class SpeakingAnalyseService:
             return analyse_to_dict(existing)
 
         answers = await SpeakingAnswer.filter(question__speaking_id=test_id).order_by("question__part").select_related("question")
+        chatgpt = ChatGPTSpeakingIntegration()
+        if await SpeakingAnalyseService.transcribe_answers(chatgpt, answers, allow_partial):
+            await analysis_events.publish(SPEAKING, test.id, TRANSCRIBED, {"parts": len(answers)})
+
         # Always prepare part1, part2, part3 (use fake if missing)
         fake_answer = type("FakeAnswer", (), {"question": type("Q", (), {"title": "", "content": ""})(), "text_answer": ""})
         part1 = answers[0] if len(answers) > 0 else fake_answer
         part2 = answers[1] if len(answers) > 1 else fake_answer
         part3 = answers[2] if len(answers) > 2 else fake_answer
 
-        chatgpt = ChatGPTSpeakingIntegration()
         analysis = await chatgpt.generate_ielts_speaking_analyse(part1, part2, part3, lang_code=lang_code)
 
         # For missing parts, set 0 and feedback
@@ -71,21 +114,29 @@ class SpeakingAnalyseService:
 
         duration = (test.end_time - test.start_time) if (test.start_time and test.end_time) else timedelta(0)
         analysis["timing"] = duration.total_seconds()
+        await analysis_events.publish(SPEAKING, test.id, SCORED, {"overall_band_score": overall})
 
         # Save analysis to DB if not exists
-        speaking_analyse = await SpeakingAnalyse.create(
-            speaking_id=test.id,
-            feedback=analysis.get("feedback"),
-            overall_band_score=analysis.get("overall_band_score"),
-            fluency_and_coherence_score=analysis.get("fluency_and_coherence_score"),
-            fluency_and_coherence_feedback=analysis.get("fluency_and_coherence_feedback"),
-            lexical_resource_score=analysis.get("lexical_resource_score"),
-            lexical_resource_feedback=analysis.get("lexical_resource_feedback"),
-            grammatical_range_and_accuracy_score=analysis.get("grammatical_range_and_accuracy_score"),
-            grammatical_range_and_accuracy_feedback=analysis.get("grammatical_range_and_accuracy_feedback"),
-            pronunciation_score=analysis.get("pronunciation_score"),
-            pronunciation_feedback=analysis.get("pronunciation_feedback"),
-            duration=duration,
+        async with in_transaction():
+            speaking_analyse = await SpeakingAnalyse.create(
+                speaking_id=test.id,
+                feedback=analysis.get("feedback"),
+                overall_band_score=analysis.get("overall_band_score"),
+                fluency_and_coherence_score=analysis.get("fluency_and_coherence_score"),
+                fluency_and_coherence_feedback=analysis.get("fluency_and_coherence_feedback"),
+                lexical_resource_score=analysis.get("lexical_resource_score"),
+                lexical_resource_feedback=analysis.get("lexical_resource_feedback"),
+                grammatical_range_and_accuracy_score=analysis.get("grammatical_range_and_accuracy_score"),
+                grammatical_range_and_accuracy_feedback=analysis.get("grammatical_range_and_accuracy_feedback"),
+                pronunciation_score=analysis.get("pronunciation_score"),
+                pronunciation_feedback=analysis.get("pronunciation_feedback"),
+                duration=duration,
+            )
+            summary = await ScoreSummaryService.refresh(test.user_id)
+        await leaderboard.safe_record_activity(
+            test.user_id, TransactionType.TEST_SPEAKING.value, float(summary.overall_score)
         )
 
-        return analyse_to_dict(speaking_analyse)
\ No newline at end of file
+        result = analyse_to_dict(speaking_analyse)
+        await analysis_events.publish(SPEAKING, test.id, SAVED, result)
+        return result
\ No newline at end of file
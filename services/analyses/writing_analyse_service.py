@@ -1,8 +1,34 @@
 from fastapi import HTTPException, status
+from tortoise.transactions import in_transaction
 from datetime import timedelta
 from services.chatgpt import ChatGPTWritingIntegration
 from models.analyses import WritingAnalyse
 from models.tests import Writing, WritingStatus
+from models.transactions import TransactionType
+from services.leaderboard_service import leaderboard
+from services.score_summary_service import ScoreSummaryService
+from services.analysis_event_service import SAVED, SCORED, analysis_events
+from services.analysis_job_service import WRITING
+
+def analyse_to_dict(analyse: WritingAnalyse) -> dict:
+    def score(value):
+        return float(value) if value is not None else None
+
+    return {
+        "task_achievement_feedback": analyse.task_achievement_feedback,
+        "task_achievement_score": score(analyse.task_achievement_score),
+        "lexical_resource_feedback": analyse.lexical_resource_feedback,
+        "lexical_resource_score": score(analyse.lexical_resource_score),
+        "coherence_and_cohesion_feedback": analyse.coherence_and_cohesion_feedback,
+        "coherence_and_cohesion_score": score(analyse.coherence_and_cohesion_score),
+        "grammatical_range_and_accuracy_feedback": analyse.grammatical_range_and_accuracy_feedback,
+        "grammatical_range_and_accuracy_score": score(analyse.grammatical_range_and_accuracy_score),
+        "word_count_feedback": analyse.word_count_feedback,
+        "word_count_score": score(analyse.word_count_score),
+        "overall_band_score": score(analyse.overall_band_score),
+        "total_feedback": analyse.total_feedback,
+        "timing": analyse.duration.total_seconds() if analyse.duration else None,
+    }
 
 class WritingAnalyseService:
     @staticmethod
@@ -94,6 +120,8 @@ class WritingAnalyseService:
         if not part2_answer or part2_answer.strip().lower() in ["", "string"]:
             overall_band_score = min(overall_band_score, 6.0)
 
+        await analysis_events.publish(WRITING, test.id, SCORED, {"overall_band_score": overall_band_score})
+
         # Collect overall feedback (can be improved based on your prompt)
         total_feedback = ""
         if "overall_feedback" in analysis:
@@ -111,23 +139,29 @@ class WritingAnalyseService:
                 safe_feedback(task_response)
             ).strip()
 
-        writing_analyse = await WritingAnalyse.create(
-            writing=test,
-            # Task 1
-            task_achievement_score=task_achievement.get("Score", 0) or task_achievement.get("score", 0),
-            task_achievement_feedback=task_achievement.get("Feedback", "") or task_achievement.get("feedback", ""),
-            lexical_resource_score=lexical.get("Score", 0) or lexical.get("score", 0),
-            lexical_resource_feedback=lexical.get("Feedback", "") or lexical.get("feedback", ""),
-            coherence_and_cohesion_score=coherence.get("Score", 0) or coherence.get("score", 0),
-            coherence_and_cohesion_feedback=coherence.get("Feedback", "") or coherence.get("feedback", ""),
-            grammatical_range_and_accuracy_score=grammar.get("Score", 0) or grammar.get("score", 0),
-            grammatical_range_and_accuracy_feedback=grammar.get("Feedback", "") or grammar.get("feedback", ""),
-            word_count_score=word_count.get("Score", 0) or word_count.get("score", 0),
-            word_count_feedback=word_count.get("Feedback", "") or word_count.get("feedback", ""),
-            timing_feedback=timing.get("Feedback", "") or timing.get("feedback", ""),
-            # General
-            overall_band_score=overall_band_score,
-            total_feedback=total_feedback,
-            duration=duration,
+        async with in_transaction():
+            writing_analyse = await WritingAnalyse.create(
+                writing=test,
+                # Task 1
+                task_achievement_score=task_achievement.get("Score", 0) or task_achievement.get("score", 0),
+                task_achievement_feedback=task_achievement.get("Feedback", "") or task_achievement.get("feedback", ""),
+                lexical_resource_score=lexical.get("Score", 0) or lexical.get("score", 0),
+                lexical_resource_feedback=lexical.get("Feedback", "") or lexical.get("feedback", ""),
+                coherence_and_cohesion_score=coherence.get("Score", 0) or coherence.get("score", 0),
+                coherence_and_cohesion_feedback=coherence.get("Feedback", "") or coherence.get("feedback", ""),
+                grammatical_range_and_accuracy_score=grammar.get("Score", 0) or grammar.get("score", 0),
+                grammatical_range_and_accuracy_feedback=grammar.get("Feedback", "") or grammar.get("feedback", ""),
+                word_count_score=word_count.get("Score", 0) or word_count.get("score", 0),
+                word_count_feedback=word_count.get("Feedback", "") or word_count.get("feedback", ""),
+                timing_feedback=timing.get("Feedback", "") or timing.get("feedback", ""),
+                # General
+                overall_band_score=overall_band_score,
+                total_feedback=total_feedback,
+                duration=duration,
+            )
+            summary = await ScoreSummaryService.refresh(test.user_id)
+        await leaderboard.safe_record_activity(
+            test.user_id, TransactionType.TEST_WRITING.value, float(summary.overall_score)
         )
+        await analysis_events.publish(WRITING, test.id, SAVED, analyse_to_dict(writing_analyse))
         return writing_analyse
\ No newline at end of file
@@ -0,0 +1,120 @@
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+from redis.asyncio import Redis
+
+from config import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+# Progress events of an analysis, in order; the stream ends after a terminal one
+QUEUED = "queued"
+TRANSCRIBED = "transcribed"
+SCORED = "scored"
+SAVED = "saved"
+FAILED = "failed"
+TERMINAL_EVENTS = (SAVED, FAILED)
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+class AnalysisEventService:
+    """
+    Publishes analysis progress over Redis pub/sub and streams it as Server-Sent Events.
+
+    Every session has its own channel. The last event is also kept for a while,
+    so a client that connects after the analysis finished still gets the result.
+    """
+
+    def __init__(self, redis_url=REDIS_URL, last_event_ttl: int = 3600,
+                 heartbeat: float = 15.0, max_duration: float = 600.0):
+        self.redis = Redis.from_url(redis_url, decode_responses=True)
+        self.last_event_ttl = last_event_ttl
+        self.heartbeat = heartbeat
+        self.max_duration = max_duration
+
+    @staticmethod
+    def channel(kind: str, session_id: int) -> str:
+        return f"analysis_events:{kind}:{session_id}"
+
+    async def publish(self, kind: str, session_id: int, event: str, data: Optional[dict] = None) -> None:
+        """
+        Publish a progress event. Failures are logged and never break the analysis.
+        """
+        channel = self.channel(kind, session_id)
+        message = json.dumps({"event": event, "data": data or {}}, ensure_ascii=False, default=str)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.publish(channel, message)
+            pipe.set(f"{channel}:last", message, ex=self.last_event_ttl)
+            await pipe.execute()
+        except Exception:
+            logger.exception("Failed to publish %s event for %s", event, channel)
+
+    async def reset(self, kind: str, session_id: int) -> None:
+        """
+        Replace the kept last event with a non-terminal "queued" one before a new attempt.
+        """
+        await self.publish(kind, session_id, QUEUED)
+
+    async def stream(
+        self,
+        kind: str,
+        session_id: int,
+        load_result: Callable[[], Awaitable[Optional[dict]]],
+        job_pending: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yield SSE messages for a session until a terminal event:
+        1. Subscribe first, so no event is lost between the checks below and listening.
+        2. Finish at once if the result is already stored or the last event was terminal,
+           unless `job_pending` reports a retry queued or running since then.
+        3. Relay published events, sending heartbeat comments while idle.
+        """
+        channel = self.channel(kind, session_id)
+        pubsub = self.redis.pubsub()
+        try:
+            # 1. Subscribe
+            await pubsub.subscribe(channel)
+
+            # 2. Already finished
+            result = await load_result()
+            if result is not None:
+                yield format_sse(SAVED, result)
+                return
+            last = await self.redis.get(f"{channel}:last")
+            if last:
+                last = json.loads(last)
+                if last["event"] not in TERMINAL_EVENTS:
+                    yield format_sse(last["event"], last["data"])
+                elif job_pending is not None and await job_pending():
+                    # A stale outcome of the previous attempt: follow the retry instead
+                    yield format_sse(QUEUED, {})
+                else:
+                    yield format_sse(last["event"], last["data"])
+                    return
+
+            # 3. Live events
+            expires_at = time.monotonic() + self.max_duration
+            while time.monotonic() < expires_at:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=self.heartbeat)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                payload = json.loads(message["data"])
+                yield format_sse(payload["event"], payload["data"])
+                if payload["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            try:
+                await pubsub.unsubscribe(channel)
+                await pubsub.aclose()
+            except Exception:
+                logger.exception("Failed to close subscription to %s", channel)
+
+
+# Singleton instance for import
+analysis_events = AnalysisEventService()
@@ -0,0 +1,98 @@
+import logging
+from enum import Enum
+from typing import Any, Dict, Optional
+from arq.connections import ArqRedis
+from arq.constants import result_key_prefix
+from arq.jobs import Job, JobStatus
+
+from services.analysis_event_service import analysis_events
+
+logger = logging.getLogger(__name__)
+
+SPEAKING = "speaking"
+WRITING = "writing"
+
+# ARQ task running the analysis of each kind (see tasks_arq.py)
+JOB_FUNCTIONS = {
+    SPEAKING: "analyse_speaking",
+    WRITING: "analyse_writing",
+}
+
+
+class AnalysisJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    NOT_FOUND = "not_found"
+
+
+def analysis_job_id(kind: str, session_id: int) -> str:
+    """
+    Deterministic job id, so a session is never analysed by two jobs at once.
+    """
+    return f"analyse_{kind}:{session_id}"
+
+
+class AnalysisJobService:
+    """
+    Runs speaking and writing analyses as ARQ jobs and reports their progress.
+    """
+
+    @staticmethod
+    async def get_status(redis: ArqRedis, kind: str, session_id: int) -> Dict[str, Any]:
+        """
+        Status of the analysis job of a session:
+        queued/deferred -> queued, in progress -> running,
+        complete -> done or failed (with the error), unknown -> not_found.
+        """
+        job_id = analysis_job_id(kind, session_id)
+        job = Job(job_id, redis)
+        job_status = await job.status()
+
+        if job_status in (JobStatus.queued, JobStatus.deferred):
+            return {"job_id": job_id, "status": AnalysisJobStatus.QUEUED.value}
+        if job_status == JobStatus.in_progress:
+            return {"job_id": job_id, "status": AnalysisJobStatus.RUNNING.value}
+        if job_status == JobStatus.complete:
+            info = await job.result_info()
+            if info is not None and not info.success:
+                return {"job_id": job_id, "status": AnalysisJobStatus.FAILED.value, "error": str(info.result)}
+            return {"job_id": job_id, "status": AnalysisJobStatus.DONE.value}
+        return {"job_id": job_id, "status": AnalysisJobStatus.NOT_FOUND.value}
+
+    @staticmethod
+    async def is_pending(redis: ArqRedis, kind: str, session_id: int) -> bool:
+        """
+        Whether the analysis job of a session is queued or running.
+        """
+        current = await AnalysisJobService.get_status(redis, kind, session_id)
+        return current["status"] in (AnalysisJobStatus.QUEUED.value, AnalysisJobStatus.RUNNING.value)
+
+    @staticmethod
+    async def enqueue(redis: ArqRedis, kind: str, session_id: int, lang_code: str, t: dict) -> Dict[str, Any]:
+        """
+        Enqueue the analysis of a session unless a job for it is already pending:
+        1. Reuse a queued or running job.
+        2. Clear the result and the kept "failed" event of a failed job so it can be retried.
+        3. Enqueue under the deterministic job id.
+        """
+        # 1. Already pending
+        current = await AnalysisJobService.get_status(redis, kind, session_id)
+        if current["status"] in (AnalysisJobStatus.QUEUED.value, AnalysisJobStatus.RUNNING.value):
+            return current
+
+        # 2. Retry after a failure
+        job_id = current["job_id"]
+        if current["status"] == AnalysisJobStatus.FAILED.value:
+            await redis.delete(result_key_prefix + job_id)
+            await analysis_events.reset(kind, session_id)
+
+        # 3. Enqueue
+        job: Optional[Job] = await redis.enqueue_job(
+            JOB_FUNCTIONS[kind], session_id, lang_code, t, _job_id=job_id
+        )
+        if job is None:
+            # Lost a race with another request: report whatever that one enqueued
+            return await AnalysisJobService.get_status(redis, kind, session_id)
+        return {"job_id": job_id, "status": AnalysisJobStatus.QUEUED.value}
@@ -0,0 +1,177 @@
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from redis.asyncio import Redis
+
+from config import REDIS_URL
+from models.tests import ListeningQuestion, ReadingQuestion, ReadingVariant
+
+logger = logging.getLogger(__name__)
+
+LISTENING = "listening"
+READING = "reading"
+
+# Listening question types whose answers are compared as trimmed lowercase text
+TEXT_QUESTION_TYPES = ("cloze_test", "form_completion", "sentence_completion")
+
+
+def normalize_text(value: Any) -> str:
+    return str(value if value is not None else "").strip().lower()
+
+
+class QuestionKey:
+    """
+    Compact answer-key record of one question.
+
+    correct_answer keeps the stored value (shown to users), normalized_answer
+    is the form used for comparisons, options are the question's choices.
+    """
+    __slots__ = ("id", "type", "text", "correct_answer", "normalized_answer", "options")
+
+    def __init__(self, id: int, type: str, text: Optional[str], correct_answer: Any,
+                 normalized_answer: Any, options: Any = None):
+        self.id = id
+        self.type = type
+        self.text = text
+        self.correct_answer = correct_answer
+        self.normalized_answer = normalized_answer
+        self.options = options
+
+
+class AnswerKey:
+    """
+    Answer key of one listening test or reading passage, ordered as authored.
+    """
+    __slots__ = ("version", "questions")
+
+    def __init__(self, version: int, questions: Dict[int, QuestionKey]):
+        self.version = version
+        self.questions = questions
+
+    def __contains__(self, question_id: int) -> bool:
+        return question_id in self.questions
+
+    def __getitem__(self, question_id: int) -> QuestionKey:
+        return self.questions[question_id]
+
+    def get(self, question_id: int) -> Optional[QuestionKey]:
+        return self.questions.get(question_id)
+
+    def __iter__(self):
+        return iter(self.questions.values())
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+
+class AnswerKeyCache:
+    """
+    In-process cache of answer keys for listening tests and reading passages.
+
+    Keys are held per process and validated against a version stamp per
+    content kind stored in Redis. Admin edits bump the stamp, so every
+    process reloads on its next lookup.
+    """
+
+    def __init__(self, redis_url=REDIS_URL, max_entries: int = 512):
+        self.redis = Redis.from_url(redis_url, decode_responses=True)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], AnswerKey]" = OrderedDict()
+
+    @staticmethod
+    def version_key(kind: str) -> str:
+        return f"content:version:{kind}"
+
+    async def version(self, kind: str) -> Optional[int]:
+        """
+        Current content version of a kind (None when Redis is unavailable).
+        """
+        try:
+            return int(await self.redis.get(self.version_key(kind)) or 0)
+        except Exception:
+            logger.exception("Failed to read %s content version", kind)
+            return None
+
+    async def invalidate(self, kind: str) -> None:
+        """
+        Bump the content version of a kind and drop local entries.
+        """
+        for entry in [entry for entry in self._entries if entry[0] == kind]:
+            del self._entries[entry]
+        try:
+            await self.redis.incr(self.version_key(kind))
+        except Exception:
+            logger.exception("Failed to bump %s content version", kind)
+
+    async def _get(self, kind: str, object_id: int, loader) -> AnswerKey:
+        """
+        Return a cached key if its version is current, otherwise load and store it.
+        """
+        version = await self.version(kind)
+        entry = self._entries.get((kind, object_id))
+        if entry is not None and version is not None and entry.version == version:
+            self._entries.move_to_end((kind, object_id))
+            return entry
+
+        answer_key = AnswerKey(version, await loader(object_id))
+        if version is None:
+            return answer_key
+
+        self._entries[(kind, object_id)] = answer_key
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return answer_key
+
+    async def listening(self, listening_id: int) -> AnswerKey:
+        """
+        Answer key of a listening test, keyed by question id.
+        """
+        return await self._get(LISTENING, listening_id, self._load_listening)
+
+    async def reading(self, passage_id: int) -> AnswerKey:
+        """
+        Answer key of a reading passage, keyed by question id.
+        """
+        return await self._get(READING, passage_id, self._load_reading)
+
+    @staticmethod
+    async def _load_listening(listening_id: int) -> Dict[int, QuestionKey]:
+        rows = await ListeningQuestion.filter(section__part__listening_id=listening_id).order_by(
+            "section__part__part_number", "section__section_number", "index"
+        ).values_list("id", "section__question_type", "question_text", "correct_answer", "options")
+
+        questions = {}
+        for question_id, q_type, text, correct_answer, options in rows:
+            q_type = getattr(q_type, "value", q_type)
+            normalized = correct_answer
+            if q_type in TEXT_QUESTION_TYPES:
+                normalized = (
+                    [normalize_text(a) for a in correct_answer]
+                    if isinstance(correct_answer, list) else normalize_text(correct_answer)
+                )
+            questions[question_id] = QuestionKey(question_id, q_type, text, correct_answer, normalized, options)
+        return questions
+
+    @staticmethod
+    async def _load_reading(passage_id: int) -> Dict[int, QuestionKey]:
+        rows = await ReadingQuestion.filter(passage_id=passage_id).order_by("id").values_list("id", "type", "text")
+        variants: Dict[int, list] = {}
+        for question_id, text, is_correct in await ReadingVariant.filter(
+            question__passage_id=passage_id
+        ).order_by("id").values_list("question_id", "text", "is_correct"):
+            variants.setdefault(question_id, []).append((text, is_correct))
+
+        questions = {}
+        for question_id, q_type, text in rows:
+            q_type = getattr(q_type, "value", q_type)
+            options = variants.get(question_id, [])
+            correct_answer = next((v_text for v_text, is_correct in options if is_correct), "")
+            questions[question_id] = QuestionKey(
+                question_id, q_type, text, correct_answer, normalize_text(correct_answer),
+                tuple(v_text for v_text, _ in options),
+            )
+        return questions
+
+
+# Singleton instance for import
+answer_keys = AnswerKeyCache()
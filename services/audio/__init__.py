@@ -0,0 +1,14 @@
+from .backends import StubBackend, TranscriptionBackend, WhisperBackend, get_backend
+from .chunking import ChunkedTranscriber, plan_chunks, stitch
+from .ingestion import (
+    MEDIA_ROOT,
+    StoredAudio,
+    TranscriptionIncomplete,
+    TranscriptionResult,
+    store_upload,
+    store_uploads,
+    transcribe_files,
+    transcribe_part,
+)
+from .metrics import AudioMetrics, audio_metrics, transcript_similarity
+from .normalization import AudioNormalizer, NormalizedAudio, audio_normalizer
@@ -0,0 +1,49 @@
+import os
+from typing import Optional, Protocol
+
+from config import TRANSCRIPTION_BACKEND
+
+
+class TranscriptionBackend(Protocol):
+    async def transcribe(self, path: str, lang: str = "en", deadline: Optional[float] = None) -> str:
+        ...
+
+
+class WhisperBackend:
+    """
+    Transcribes through the speaking integration (whisper-1 via the shared LLM gateway).
+    """
+
+    def __init__(self, chatgpt):
+        self.chatgpt = chatgpt
+
+    async def transcribe(self, path: str, lang: str = "en", deadline: Optional[float] = None) -> str:
+        return await self.chatgpt.transcribe_audio_path_async(path, lang=lang, deadline=deadline)
+
+
+class StubBackend:
+    """
+    Local backend for development and tests: returns the text of a sidecar
+    file (`<audio>.txt`) when present, otherwise a placeholder naming the file.
+    Every call is appended to `calls`.
+    """
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    async def transcribe(self, path: str, lang: str = "en", deadline: Optional[float] = None) -> str:
+        self.calls.append(path)
+        sidecar = f"{path}.txt"
+        if os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as f:
+                return f.read()
+        return f"[{os.path.basename(path)}]"
+
+
+def get_backend(chatgpt) -> TranscriptionBackend:
+    """
+    Backend selected by TRANSCRIPTION_BACKEND ("whisper" or "stub").
+    """
+    if TRANSCRIPTION_BACKEND == "stub":
+        return StubBackend()
+    return WhisperBackend(chatgpt)
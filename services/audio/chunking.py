@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .backends import TranscriptionBackend
+from .normalization import FFMPEG_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+FFMPEG = shutil.which("ffmpeg")
+FFPROBE = shutil.which("ffprobe")
+
+# Clips shorter than this are sent in one call (seconds)
+MIN_CHUNKED_DURATION = 75.0
+# Preferred and maximum chunk length; cuts are made at the silence nearest to the target
+TARGET_CHUNK = 45.0
+MAX_CHUNK = 70.0
+# Audio repeated at the start of each chunk so no word is lost at a cut
+OVERLAP = 1.5
+# Chunks cut at the same time
+CUT_CONCURRENCY = 4
+
+SILENCE_THRESHOLD = "-35dB"
+SILENCE_MIN_DURATION = 0.3
+
+_SILENCE_START = re.compile(r"silence_start: (-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end: (-?[\d.]+)")
+_WORD = re.compile(r"\w+")
+
+Span = Tuple[float, float]
+
+
+class ChunkingError(Exception):
+    """Raised when audio could not be probed or cut; the caller falls back to a single call."""
+
+
+async def _run(*args: str) -> Tuple[bytes, bytes]:
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, stdin=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=FFMPEG_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise ChunkingError(f"{Path(args[0]).name} timed out after {FFMPEG_TIMEOUT}s")
+    finally:
+        # Timed out or cancelled: don't leave the child running
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    if process.returncode != 0:
+        raise ChunkingError(f"{Path(args[0]).name} exited with {process.returncode}: {stderr[-500:]!r}")
+    return stdout, stderr
+
+
+async def probe_duration(path: str) -> float:
+    stdout, _ = await _run(
+        FFPROBE, "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", path
+    )
+    try:
+        return float(stdout.strip())
+    except ValueError:
+        raise ChunkingError(f"Unknown duration of {path}")
+
+
+async def detect_silences(path: str) -> List[Span]:
+    """
+    Silent spans of a file as (start, end) seconds, from ffmpeg's silencedetect filter.
+    """
+    _, stderr = await _run(
+        FFMPEG, "-nostdin", "-hide_banner", "-i", path,
+        "-af", f"silencedetect=noise={SILENCE_THRESHOLD}:d={SILENCE_MIN_DURATION}",
+        "-f", "null", "-",
+    )
+    text = stderr.decode(errors="ignore")
+    starts = [float(m) for m in _SILENCE_START.findall(text)]
+    ends = [float(m) for m in _SILENCE_END.findall(text)]
+    return list(zip(starts, ends))
+
+
+def plan_chunks(
+    duration: float,
+    silences: List[Span],
+    target: float = TARGET_CHUNK,
+    max_chunk: float = MAX_CHUNK,
+    overlap: float = OVERLAP,
+) -> List[Span]:
+    """
+    Split [0, duration] into chunks of about `target` seconds, cutting in the
+    middle of the silence closest to the target (hard cut at `max_chunk` when
+    there is none). Every chunk after the first starts `overlap` seconds early.
+    """
+    cut_points = [(start + end) / 2 for start, end in silences]
+    chunks = []
+    start = 0.0
+    while duration - start > max_chunk:
+        candidates = [c for c in cut_points if start + target / 2 <= c <= start + max_chunk]
+        cut = min(candidates, key=lambda c: abs(c - start - target)) if candidates else start + max_chunk
+        chunks.append((max(0.0, start - overlap) if chunks else start, cut))
+        start = cut
+    chunks.append((max(0.0, start - overlap) if chunks else start, duration))
+    return chunks
+
+
+async def cut_chunk(path: str, span: Span, dst: Path) -> Path:
+    start, end = span
+    await _run(
+        FFMPEG, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+        "-ss", f"{start:.3f}", "-to", f"{end:.3f}", "-i", path,
+        "-vn", "-ac", "1", "-ar", "16000", "-c:a", "libopus", "-b:a", "24k", str(dst),
+    )
+    return dst
+
+
+def stitch(texts: List[str], max_overlap_words: int = 8) -> str:
+    """
+    Join chunk transcripts in order, dropping the words repeated at the start of
+    a chunk because of the audio overlap (compared ignoring case and punctuation).
+    """
+    result: List[str] = []
+    for text in texts:
+        words = text.split()
+        if result and words:
+            tail = [w.lower() for w in _WORD.findall(" ".join(result[-max_overlap_words:]))]
+            for size in range(min(max_overlap_words, len(words)), 0, -1):
+                head = [w.lower() for w in _WORD.findall(" ".join(words[:size]))]
+                if head and tail[-len(head):] == head:
+                    words = words[size:]
+                    break
+        result.extend(words)
+    return " ".join(result)
+
+
+class ChunkedTranscriber:
+    """
+    Transcribes long recordings as overlapping chunks, concurrently.
+
+    Clips shorter than MIN_CHUNKED_DURATION, or any file when ffmpeg is not
+    available or fails to split it, are transcribed in a single call.
+    """
+
+    def __init__(self, backend: TranscriptionBackend, min_duration: float = MIN_CHUNKED_DURATION):
+        self.backend = backend
+        self.min_duration = min_duration
+
+    async def plan(self, path: str) -> Optional[List[Span]]:
+        """
+        Chunk spans of a file, or None when it should go in one call.
+        """
+        if FFMPEG is None or FFPROBE is None:
+            return None
+        try:
+            duration = await probe_duration(path)
+            if duration < self.min_duration:
+                return None
+            chunks = plan_chunks(duration, await detect_silences(path))
+        except ChunkingError:
+            logger.warning("Could not plan chunks of %s, transcribing in one call", path, exc_info=True)
+            return None
+        return chunks if len(chunks) > 1 else None
+
+    async def transcribe(self, path: str, lang: str = "en", deadline: Optional[float] = None) -> str:
+        """
+        1. Plan chunks at silence boundaries (or fall back to one call).
+        2. Cut the chunks into a temporary folder, a few at a time.
+        3. Transcribe all chunks concurrently and stitch the text in order.
+        """
+        # 1. Plan
+        chunks = await self.plan(path)
+        if not chunks:
+            return await self.backend.transcribe(path, lang=lang, deadline=deadline)
+
+        with tempfile.TemporaryDirectory(prefix="chunks_") as folder:
+            # 2. Cut
+            semaphore = asyncio.Semaphore(CUT_CONCURRENCY)
+
+            async def cut(index: int, span: Span) -> Path:
+                async with semaphore:
+                    return await cut_chunk(path, span, Path(folder) / f"{index:03d}.ogg")
+
+            try:
+                files = await asyncio.gather(*(cut(i, span) for i, span in enumerate(chunks)))
+            except ChunkingError:
+                logger.warning("Could not cut %s, transcribing in one call", path, exc_info=True)
+                return await self.backend.transcribe(path, lang=lang, deadline=deadline)
+
+            # 3. Transcribe and stitch
+            texts = await asyncio.gather(
+                *(self.backend.transcribe(str(f), lang=lang, deadline=deadline) for f in files)
+            )
+        logger.info("Transcribed %s in %s chunks", path, len(chunks))
+        return stitch(list(texts))
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+from uuid import uuid4
+
+import aiofiles
+from fastapi import UploadFile
+
+from config import AUDIO_QUALITY_SAMPLE_RATE, BASE_DIR
+from .backends import get_backend
+from .chunking import ChunkedTranscriber
+from .metrics import audio_metrics, transcript_similarity
+from .normalization import NormalizedAudio, audio_normalizer
+
+logger = logging.getLogger(__name__)
+
+MEDIA_ROOT = BASE_DIR / "media" / "user_audios"
+MEDIA_ROOT.mkdir(parents=True, exist_ok=True)
+
+CHUNK_SIZE = 1024 * 1024
+
+# Time budget of one part's transcription, retries included (seconds)
+TRANSCRIPTION_TIMEOUT = 90.0
+
+
+class StoredAudio(NamedTuple):
+    """An upload written to disk: path relative to BASE_DIR and its size in bytes."""
+    path: str
+    size: int
+
+
+class TranscriptionResult(NamedTuple):
+    """Transcripts of the parts that succeeded and the keys of those that failed."""
+    texts: Dict[str, str]
+    failed: Dict[str, str]
+
+
+class TranscriptionIncomplete(Exception):
+    """Raised when some parts could not be transcribed; `failed` maps part keys to errors."""
+
+    def __init__(self, failed: Dict[str, str]):
+        super().__init__(f"Transcription failed for {', '.join(failed)}")
+        self.failed = failed
+
+
+async def store_upload(upload: UploadFile, folder: Path = MEDIA_ROOT) -> StoredAudio:
+    """
+    Stream an upload to disk in chunks under a unique name.
+    """
+    ext = os.path.splitext(upload.filename or "")[1]
+    file_path = folder / f"{uuid4().hex}{ext}"
+    size = 0
+    async with aiofiles.open(file_path, "wb") as out_file:
+        while chunk := await upload.read(CHUNK_SIZE):
+            size += len(chunk)
+            await out_file.write(chunk)
+    return StoredAudio(str(file_path.relative_to(BASE_DIR)), size)
+
+
+async def store_uploads(uploads: Dict[str, UploadFile], folder: Path = MEDIA_ROOT) -> Dict[str, StoredAudio]:
+    """
+    Store several uploads concurrently, keyed like the input.
+    """
+    keys = list(uploads)
+    stored = await asyncio.gather(*(store_upload(uploads[key], folder) for key in keys))
+    return dict(zip(keys, stored))
+
+
+async def transcribe_part(
+    transcriber: ChunkedTranscriber, path: Path, lang: str = "en", timeout: float = TRANSCRIPTION_TIMEOUT
+) -> str:
+    """
+    Transcribe one stored file:
+    1. Within `timeout`, normalize it when enabled and transcribe the copy (else the original).
+    2. For a sample of normalized parts, transcribe the original too and compare,
+       best effort and with its own timeout, so it never costs the part its transcript.
+    3. Record bytes sent, timings and similarity; drop the normalized copy.
+    """
+    normalized: Optional[NormalizedAudio] = None
+
+    async def normalize_and_transcribe() -> Tuple[str, float]:
+        nonlocal normalized
+        # Normalized copy (None when disabled or failed)
+        normalized = await audio_normalizer.normalize(path)
+        started = time.monotonic()
+        text = await transcriber.transcribe(
+            str(normalized.path if normalized else path), lang=lang, deadline=timeout
+        )
+        return text, time.monotonic() - started
+
+    try:
+        # 1. Time-boxed transcript
+        text, transcribe_seconds = await asyncio.wait_for(normalize_and_transcribe(), timeout)
+
+        # 2. Quality sample
+        similarity = original_seconds = None
+        if normalized and random.random() < AUDIO_QUALITY_SAMPLE_RATE:
+            try:
+                started = time.monotonic()
+                original_text = await asyncio.wait_for(
+                    transcriber.transcribe(str(path), lang=lang, deadline=timeout), timeout
+                )
+                original_seconds = time.monotonic() - started
+                similarity = transcript_similarity(text, original_text)
+            except Exception:
+                logger.warning("Quality sample transcription of %s failed", path)
+
+        # 3. Metrics
+        await audio_metrics.record(
+            original_bytes=normalized.original_bytes if normalized else path.stat().st_size,
+            sent_bytes=normalized.bytes if normalized else path.stat().st_size,
+            transcribe_seconds=transcribe_seconds,
+            normalize_seconds=normalized.seconds if normalized else None,
+            similarity=similarity,
+            original_transcribe_seconds=original_seconds,
+        )
+        return text
+    finally:
+        if normalized:
+            audio_normalizer.discard(normalized.path)
+
+
+async def transcribe_files(
+    chatgpt, paths: Dict[str, str], lang: str = "en", timeout: float = TRANSCRIPTION_TIMEOUT
+) -> TranscriptionResult:
+    """
+    Transcribe stored audio files concurrently, each within its own time budget.
+    Long recordings are split into chunks transcribed in parallel.
+    A failing part does not cancel the others; its key and error are reported in `failed`.
+    `paths` are relative to BASE_DIR.
+    """
+    transcriber = ChunkedTranscriber(get_backend(chatgpt))
+    keys = list(paths)
+    results = await asyncio.gather(
+        *(transcribe_part(transcriber, BASE_DIR / paths[key], lang=lang, timeout=timeout) for key in keys),
+        return_exceptions=True,
+    )
+
+    texts, failed = {}, {}
+    for key, result in zip(keys, results):
+        if isinstance(result, BaseException):
+            logger.warning("Transcription of %s failed: %r", paths[key], result)
+            failed[key] = getattr(result, "detail", None) or str(result) or type(result).__name__
+        else:
+            texts[key] = result
+    return TranscriptionResult(texts, failed)
@@ -0,0 +1,101 @@
+import difflib
+import json
+import logging
+import re
+from typing import Optional
+from redis.asyncio import Redis
+
+from config import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+
+def transcript_similarity(a: str, b: str) -> float:
+    """
+    Word-level similarity of two transcripts, ignoring case and punctuation (1.0 means identical).
+    """
+    return difflib.SequenceMatcher(None, _WORD.findall((a or "").lower()), _WORD.findall((b or "").lower())).ratio()
+
+
+class AudioMetrics:
+    """
+    Per-request transcription metrics kept in Redis.
+
+    Totals are counted per mode ("normalized" or "original") so bytes and
+    transcription time of both paths can be compared; the most recent
+    records are kept in a capped list.
+    """
+
+    PREFIX = "audio_metrics"
+
+    def __init__(self, redis_url=REDIS_URL, keep_recent: int = 1000):
+        self.redis = Redis.from_url(redis_url, decode_responses=True)
+        self.keep_recent = keep_recent
+
+    async def record(
+        self,
+        original_bytes: int,
+        sent_bytes: int,
+        transcribe_seconds: float,
+        normalize_seconds: Optional[float] = None,
+        similarity: Optional[float] = None,
+        original_transcribe_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Record one transcribed part. `similarity` and `original_transcribe_seconds`
+        come from quality samples, where the original was transcribed as well.
+        Failures are logged and never break transcription.
+        """
+        mode = "original" if normalize_seconds is None else "normalized"
+        entry = {
+            "mode": mode,
+            "original_bytes": original_bytes,
+            "sent_bytes": sent_bytes,
+            "transcribe_ms": round(transcribe_seconds * 1000),
+            "normalize_ms": round(normalize_seconds * 1000) if normalize_seconds is not None else None,
+            "similarity": round(similarity, 4) if similarity is not None else None,
+            "original_transcribe_ms": (
+                round(original_transcribe_seconds * 1000) if original_transcribe_seconds is not None else None
+            ),
+        }
+        totals = f"{self.PREFIX}:{mode}"
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hincrby(totals, "requests", 1)
+            pipe.hincrby(totals, "original_bytes", original_bytes)
+            pipe.hincrby(totals, "sent_bytes", sent_bytes)
+            pipe.hincrby(totals, "transcribe_ms", entry["transcribe_ms"])
+            if entry["normalize_ms"] is not None:
+                pipe.hincrby(totals, "normalize_ms", entry["normalize_ms"])
+            if similarity is not None:
+                pipe.hincrby(totals, "quality_samples", 1)
+                pipe.hincrbyfloat(totals, "similarity_sum", similarity)
+                pipe.hincrby(totals, "original_transcribe_ms", entry["original_transcribe_ms"] or 0)
+            pipe.lpush(f"{self.PREFIX}:recent", json.dumps(entry))
+            pipe.ltrim(f"{self.PREFIX}:recent", 0, self.keep_recent - 1)
+            await pipe.execute()
+        except Exception:
+            logger.exception("Failed to record audio metrics")
+
+    async def summary(self) -> dict:
+        """
+        Totals per mode with average bytes, transcription time and transcript similarity.
+        """
+        result = {}
+        for mode in ("normalized", "original"):
+            totals = {k: float(v) for k, v in (await self.redis.hgetall(f"{self.PREFIX}:{mode}")).items()}
+            requests = totals.get("requests", 0)
+            samples = totals.get("quality_samples", 0)
+            result[mode] = {
+                **totals,
+                "avg_sent_bytes": totals.get("sent_bytes", 0) / requests if requests else None,
+                "avg_transcribe_ms": totals.get("transcribe_ms", 0) / requests if requests else None,
+                "avg_similarity": totals.get("similarity_sum", 0) / samples if samples else None,
+            }
+        return result
+
+
+# Singleton instance for import
+audio_metrics = AudioMetrics()
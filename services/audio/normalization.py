@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from config import AUDIO_NORMALIZATION, AUDIO_NORMALIZATION_WORKERS
+
+logger = logging.getLogger(__name__)
+
+FFMPEG = shutil.which("ffmpeg")
+
+# Trim leading silence, reverse, trim again (the former tail) and restore the order
+_SILENCE = "silenceremove=start_periods=1:start_silence=0.2:start_threshold=-45dB"
+TRIM_FILTER = f"{_SILENCE},areverse,{_SILENCE},areverse"
+
+SAMPLE_RATE = 16000
+BITRATE = "24k"
+NORMALIZED_SUFFIX = ".norm.ogg"
+FFMPEG_TIMEOUT = 60
+
+
+class NormalizedAudio(NamedTuple):
+    """A transcription-ready copy of an upload; the original file is left untouched."""
+    path: Path
+    original_bytes: int
+    bytes: int
+    seconds: float
+
+
+def normalize_file(src: str, dst: str) -> int:
+    """
+    Downmix to mono, resample to 16 kHz, trim leading and trailing silence and
+    encode as Opus. Runs in a worker process; returns the size of the output.
+    """
+    subprocess.run(
+        [
+            FFMPEG, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+            "-i", src,
+            "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "-af", TRIM_FILTER,
+            "-c:a", "libopus", "-b:a", BITRATE, "-application", "voip",
+            dst,
+        ],
+        check=True,
+        capture_output=True,
+        timeout=FFMPEG_TIMEOUT,
+    )
+    return os.path.getsize(dst)
+
+
+class AudioNormalizer:
+    """
+    Optional preprocessing of speaking audio before it is sent to Whisper.
+
+    Enabled with AUDIO_NORMALIZATION when ffmpeg is installed. Conversions run
+    in a small process pool so they never block the event loop; any failure
+    falls back to the original file.
+    """
+
+    def __init__(self, enabled: bool = AUDIO_NORMALIZATION, workers: int = AUDIO_NORMALIZATION_WORKERS):
+        self.enabled = enabled
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and FFMPEG is not None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def normalize(self, path: Path) -> Optional[NormalizedAudio]:
+        """
+        Write a normalized copy next to `path`. Returns None when disabled or on failure.
+        """
+        if not self.available:
+            return None
+
+        dst = path.with_name(path.stem + NORMALIZED_SUFFIX)
+        started = time.monotonic()
+        conversion = self.executor.submit(normalize_file, str(path), str(dst))
+        try:
+            size = await asyncio.wrap_future(conversion)
+        except asyncio.CancelledError:
+            # The conversion may still be running in the pool: drop its output once it ends
+            conversion.add_done_callback(lambda _: self.discard(dst))
+            raise
+        except Exception:
+            logger.exception("Audio normalization of %s failed, sending the original", path)
+            self.discard(dst)
+            return None
+        return NormalizedAudio(dst, path.stat().st_size, size, time.monotonic() - started)
+
+    @staticmethod
+    def discard(path: Path) -> None:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            logger.warning("Could not remove %s", path)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance for import
+audio_normalizer = AudioNormalizer()
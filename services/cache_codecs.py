@@ -0,0 +1,193 @@
+import json
+import logging
+import zlib
+from typing import Any, Dict, Optional
+
+from config import CACHE_CODEC, CACHE_COMPRESSION, CACHE_COMPRESSION_THRESHOLD
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+
+# === Codecs (plain JSON-compatible data <-> bytes) ===
+
+class Codec:
+    name: str
+    tag: bytes
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    name, tag = "json", b"j"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    name, tag = "orjson", b"o"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    name, tag = "msgpack", b"m"
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+# === Compressors ===
+
+class Compressor:
+    name: str
+    tag: bytes
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class NoCompression(Compressor):
+    name, tag = "none", b"-"
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class ZlibCompressor(Compressor):
+    name, tag = "zlib", b"d"
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, 1)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class ZstdCompressor(Compressor):
+    name, tag = "zstd", b"z"
+
+    def __init__(self, level: int = 3):
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+class Lz4Compressor(Compressor):
+    name, tag = "lz4", b"l"
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+
+def available_codecs() -> Dict[str, Codec]:
+    codecs = [JsonCodec()]
+    if orjson is not None:
+        codecs.append(OrjsonCodec())
+    if msgpack is not None:
+        codecs.append(MsgpackCodec())
+    return {c.name: c for c in codecs}
+
+
+def available_compressors() -> Dict[str, Compressor]:
+    compressors = [NoCompression(), ZlibCompressor()]
+    if zstandard is not None:
+        compressors.append(ZstdCompressor())
+    if lz4_frame is not None:
+        compressors.append(Lz4Compressor())
+    return {c.name: c for c in compressors}
+
+
+# === Serializer ===
+
+class CacheSerializer:
+    """
+    Turns plain data into tagged bytes: a two-byte header (codec, compression)
+    followed by the payload. Payloads of at least `threshold` bytes are
+    compressed. Values written with any installed codec or compressor can be
+    read back, and untagged values (legacy plain JSON) are read as JSON.
+    """
+
+    HEADER_SIZE = 2
+
+    def __init__(
+        self,
+        codec: str = CACHE_CODEC,
+        compression: Optional[str] = CACHE_COMPRESSION,
+        threshold: int = CACHE_COMPRESSION_THRESHOLD,
+    ):
+        self.codecs = available_codecs()
+        self.compressors = available_compressors()
+        if codec not in self.codecs:
+            logger.warning("Cache codec %r is not installed, using json", codec)
+            codec = "json"
+        compression = compression or "none"
+        if compression not in self.compressors:
+            logger.warning("Cache compression %r is not installed, using zlib", compression)
+            compression = "zlib"
+        self.codec = self.codecs[codec]
+        self.compressor = self.compressors[compression]
+        self.threshold = threshold
+        self._codecs_by_tag = {c.tag: c for c in self.codecs.values()}
+        self._compressors_by_tag = {c.tag: c for c in self.compressors.values()}
+
+    def dumps(self, value: Any) -> bytes:
+        payload = self.codec.dumps(value)
+        compressor = self.compressor if len(payload) >= self.threshold else self.compressors["none"]
+        return self.codec.tag + compressor.tag + compressor.compress(payload)
+
+    def loads(self, data: bytes) -> Any:
+        codec = self._codecs_by_tag.get(data[:1])
+        compressor = self._compressors_by_tag.get(data[1:2])
+        if codec is None or compressor is None:
+            # Written before the header existed
+            return json.loads(data)
+        return codec.loads(compressor.decompress(data[self.HEADER_SIZE:]))
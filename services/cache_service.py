@@ -1,51 +1,294 @@
+import asyncio
+import functools
+import inspect
 import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Union, get_type_hints
+from pydantic import TypeAdapter
+from pydantic_core import to_jsonable_python
 from redis.asyncio import Redis
 from config import REDIS_URL
 from datetime import timedelta, datetime, timezone
 
+from .cache_codecs import CacheSerializer
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=256)
+def type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
 class CacheService:
     """
     Provides Redis-based caching for application data with serialization
     and automatic expiration support.
+
+    Reads go through a bounded in-process LRU tier first. Writes and deletes
+    are broadcast over pub/sub so other processes drop their local copies;
+    local entries also expire after `local_ttl` in case a message is missed.
+    `get_or_set` lets a single coroutine per process rebuild a missing key.
+    Values served from the local tier are shared between callers: treat them as read-only.
+
+    Values are stored as tagged bytes (see `cache_codecs`). Passing a `schema`
+    (a pydantic model or any type such as List[PlanInfo]) stores the value
+    through `model_dump` and returns it validated, with its original types.
+
+    Entries can be stored under tags (e.g. "tariff:*"): `bump_tags` moves the
+    tags' versions, and entries built with older versions are ignored from then on.
     """
 
-    def __init__(self, redis_url=REDIS_URL):
+    CHANNEL = "cache:invalidate"
+    TAGS_FIELD = "__tags__"
+
+    def __init__(self, redis_url=REDIS_URL, local_max_items: int = 1024, local_ttl: int = 60):
         """
         Initialize cache service:
-        1. Create Redis client with provided URL.
-        2. Configure client for automatic JSON decoding.
+        1. Create Redis clients with provided URL (text for pub/sub and limits, binary for cached values).
+        2. Configure the serializer.
+        3. Prepare the local tier and the single-flight registry.
         """
         self.redis = Redis.from_url(redis_url, decode_responses=True)
+        self.raw_redis = Redis.from_url(redis_url)
+        self.serializer = CacheSerializer()
+        self.local_max_items = local_max_items
+        self.local_ttl = local_ttl
+        self.instance_id = uuid.uuid4().hex
+        self._local: "OrderedDict[str, Tuple[float, Any, frozenset, Any]]" = OrderedDict()
+        self._seen_versions: Dict[str, int] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    # === Local tier ===
+
+    def _local_get(self, key: str, schema: Any = None) -> Optional[Any]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, entry_schema, _, value = entry
+        if entry_schema != schema:
+            return None
+        if expires_at <= time.monotonic():
+            self._local.pop(key, None)
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _local_set(
+        self, key: str, value: Any, expire: Optional[int], schema: Any = None, versions: Optional[Dict[str, int]] = None
+    ) -> None:
+        versions = versions or {}
+        # A tag bumped while the value was being built: keep it out of the local tier
+        if any(version < self._seen_versions.get(tag, 0) for tag, version in versions.items()):
+            return
+        ttl = self.local_ttl if expire is None else min(expire, self.local_ttl)
+        self._local[key] = (time.monotonic() + ttl, schema, frozenset(versions), value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_max_items:
+            self._local.popitem(last=False)
+
+    def _local_drop(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._local.pop(key, None)
+
+    def _local_drop_tags(self, versions: Dict[str, int]) -> None:
+        for tag, version in versions.items():
+            self._seen_versions[tag] = max(version, self._seen_versions.get(tag, 0))
+        tags = set(versions)
+        self._local_drop([key for key, entry in self._local.items() if entry[2] & tags])
+
+    # === Invalidation broadcast ===
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        """
+        Drop local copies of keys and tags changed by other processes. The local tier is
+        cleared whenever the subscription breaks, since messages may have been missed.
+        """
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    if data.get("origin") != self.instance_id:
+                        self._local_drop(data.get("keys", []))
+                        self._local_drop_tags(data.get("tags", {}))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Cache invalidation channel lost, clearing local tier", exc_info=True)
+                self._local.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def _broadcast(self, keys: Iterable[str] = (), tags: Optional[Dict[str, int]] = None) -> None:
+        message = {"origin": self.instance_id, "keys": list(keys), "tags": tags or {}}
+        try:
+            await self.redis.publish(self.CHANNEL, json.dumps(message))
+        except Exception:
+            logger.warning("Failed to broadcast cache invalidation", exc_info=True)
+
+    # === Tags ===
+
+    @staticmethod
+    def tag_key(tag: str) -> str:
+        return f"cache:tag:{tag}"
+
+    async def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = list(tags)
+        if not tags:
+            return {}
+        values = await self.redis.mget([self.tag_key(tag) for tag in tags])
+        return {tag: int(value or 0) for tag, value in zip(tags, values)}
+
+    async def bump_tags(self, *tags: str) -> None:
+        """
+        Invalidate every entry stored under any of `tags`, in all processes.
+        Entries keep the tag versions they were built with and are ignored once a version moves.
+        """
+        if not tags:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(self.tag_key(tag))
+        versions = dict(zip(tags, await pipe.execute()))
+        self._local_drop_tags(versions)
+        await self._broadcast(tags=versions)
+
+    # === Public API ===
 
-    async def get(self, key: str):
+    async def get(self, key: str, schema: Any = None, tags: Iterable[str] = ()):
         """
         Get object from cache:
-        1. Retrieve data from Redis by key.
-        2. Deserialize from JSON if found.
-        3. Return deserialized object or None.
+        1. Return the local copy if present and fresh.
+        2. Retrieve data from Redis by key, with the current versions of its tags.
+        3. Decode it (validated against `schema` if given), keep it locally and return it.
+        Returns None on a miss, or when a tag was bumped after the entry was stored.
         """
-        # 1-3. Get, deserialize, and return
-        data = await self.redis.get(key)
-        if data:
-            return json.loads(data)
-        return None
+        self._ensure_listener()
+        tags = list(tags)
 
-    async def set(self, key: str, value, expire: int = 3600):
+        # 1. Local tier
+        value = self._local_get(key, schema)
+        if value is not None:
+            return value
+
+        # 2. Redis tier
+        pipe = self.raw_redis.pipeline(transaction=False).get(key).ttl(key)
+        if tags:
+            pipe.mget([self.tag_key(tag) for tag in tags])
+        data, ttl, *tag_values = await pipe.execute()
+        if not data:
+            return None
+
+        # 3. Decode
+        try:
+            value = self.serializer.loads(data)
+            versions = None
+            if tags:
+                versions = {tag: int(v or 0) for tag, v in zip(tags, tag_values[0])}
+                if not isinstance(value, dict) or value.get(self.TAGS_FIELD) != versions:
+                    return None
+                value = value["value"]
+            if schema is not None:
+                value = type_adapter(schema).validate_python(value)
+        except Exception:
+            logger.warning("Unreadable cache entry %s, treating it as a miss", key, exc_info=True)
+            return None
+        self._local_set(key, value, ttl if ttl > 0 else None, schema, versions)
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value,
+        expire: Optional[int] = 3600,
+        schema: Any = None,
+        tags: Iterable[str] = (),
+        versions: Optional[Dict[str, int]] = None,
+    ):
         """
         Save object to cache:
-        1. Handle ORM objects by converting to dict if needed.
-        2. Handle collections by converting items to dict.
-        3. Serialize to JSON with datetime handling.
-        4. Store in Redis with expiration time.
-        """
-        # 1-2. Handle ORM objects and collections
-        if hasattr(value, "__iter__") and not isinstance(value, str):
-            value = [v.dict() if hasattr(v, "dict") else v for v in value]
-        elif hasattr(value, "dict"):
-            value = value.dict()
-            
-        # 3-4. Serialize and store
-        await self.redis.set(key, json.dumps(value, default=str), ex=expire)
+        1. Convert the value to plain data (`model_dump` through `schema` if given,
+           otherwise models, dataclasses and datetimes become JSON-compatible values).
+        2. Record the versions of its tags (`versions` read before the value was built, if given).
+        3. Encode it with the configured codec, compressing large payloads.
+        4. Store in Redis with expiration time (None keeps it until invalidated),
+           keep it locally and notify other processes.
+        Returns the value as later reads will see it.
+        """
+        # 1. Plain data
+        if schema is not None:
+            plain = type_adapter(schema).dump_python(value, mode="json")
+        else:
+            plain = to_jsonable_python(value, fallback=str)
+            value = plain
+
+        # 2. Tags
+        tags = list(tags)
+        if tags:
+            versions = versions if versions is not None else await self.tag_versions(tags)
+            plain = {self.TAGS_FIELD: versions, "value": plain}
+
+        # 3-4. Encode and store
+        await self.raw_redis.set(key, self.serializer.dumps(plain), ex=expire)
+        self._local_set(key, value, expire, schema, versions)
+        await self._broadcast([key])
+        return value
+
+    async def delete(self, *keys: str) -> None:
+        """
+        Remove keys from Redis and from the local tier of every process.
+        """
+        if not keys:
+            return
+        await self.redis.delete(*keys)
+        self._local_drop(keys)
+        await self._broadcast(keys)
+
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        expire: Optional[int] = 3600,
+        schema: Any = None,
+        tags: Iterable[str] = (),
+    ):
+        """
+        Cached value of `key`, computed by `factory` on a miss:
+        1. Return the cached value if present.
+        2. Otherwise join the rebuild already running in this process, or start one.
+           Tag versions are read before the rebuild, so an invalidation during it is not lost.
+        """
+        tags = list(tags)
+
+        # 1. Cached
+        value = await self.get(key, schema, tags)
+        if value is not None:
+            return value
+
+        # 2. Single flight per key
+        future = self._inflight.get(key)
+        if future is None:
+            async def rebuild():
+                versions = await self.tag_versions(tags)
+                return await self.set(key, await factory(), expire=expire, schema=schema, tags=tags, versions=versions)
+
+            future = asyncio.ensure_future(rebuild())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
 
     async def check_email_resend_limit(self, email: str, verification_type: str) -> dict:
         """
@@ -82,4 +325,70 @@ class CacheService:
         return {"blocked": False}
 
 # Singleton instance for import
-cache = CacheService()
\ No newline at end of file
+cache = CacheService()
+
+
+def cached(
+    key: Union[str, Callable[..., str]],
+    expire: Optional[int] = 3600,
+    schema: Any = None,
+    tags: Iterable[str] = (),
+    cache_service: Optional[CacheService] = None,
+):
+    """
+    Cache the result of an async function.
+
+    `key` is a template formatted with the call's arguments (e.g. "plans_{lang}")
+    or a callable receiving the same arguments. Concurrent misses of one key
+    run the function once per process. The wrapped function gets an
+    `invalidate(*args, **kwargs)` coroutine that drops the matching entry.
+    Results round-trip typed through `schema`, which defaults to the function's
+    return annotation when pydantic can validate it. `tags` are templates
+    formatted like `key`; bumping any of them invalidates the entry.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        result_schema = schema
+        if result_schema is None:
+            try:
+                result_schema = get_type_hints(func).get("return")
+                if result_schema is not None:
+                    type_adapter(result_schema)
+            except Exception:
+                result_schema = None
+
+        def arguments(*args, **kwargs) -> dict:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments
+
+        def make_key(*args, **kwargs) -> str:
+            if callable(key):
+                return key(*args, **kwargs)
+            return key.format(**arguments(*args, **kwargs))
+
+        def make_tags(*args, **kwargs) -> list:
+            if not tags:
+                return []
+            values = arguments(*args, **kwargs)
+            return [tag.format(**values) for tag in tags]
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            service = cache_service or cache
+            return await service.get_or_set(
+                make_key(*args, **kwargs),
+                lambda: func(*args, **kwargs),
+                expire=expire,
+                schema=result_schema,
+                tags=make_tags(*args, **kwargs),
+            )
+
+        async def invalidate(*args, **kwargs) -> None:
+            await (cache_service or cache).delete(make_key(*args, **kwargs))
+
+        wrapper.invalidate = invalidate
+        wrapper.make_key = make_key
+        return wrapper
+
+    return decorator
\ No newline at end of file
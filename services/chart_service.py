@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from config import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+CHART_TYPES = ("bar", "line", "pie")
+DIAGRAMS_DIR = BASE_DIR / "media" / "writing" / "diagrams"
+
+
+# === Rendering (runs in the worker processes) ===
+
+def _warm_up() -> None:
+    """
+    Pool initializer: load matplotlib once per worker, so the API process never imports it.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure  # noqa: F401
+
+
+def _bar_chart(fig, categories, year1, year2, data_year1, data_year2) -> None:
+    ax = fig.subplots()
+    bar_width = 0.35
+    x = range(len(categories))
+    ax.bar(x, data_year1, width=bar_width, label=str(year1), alpha=0.7)
+    ax.bar([i + bar_width for i in x], data_year2, width=bar_width, label=str(year2), alpha=0.7)
+    ax.set_xlabel("Categories", fontsize=12)
+    ax.set_ylabel("Percentage of Expenditure", fontsize=12)
+    ax.set_title(f"Comparison of Household Expenditure by Category ({year1} vs {year2})", fontsize=14)
+    ax.set_xticks([i + bar_width / 2 for i in x])
+    ax.set_xticklabels(categories, fontsize=10)
+    ax.legend()
+
+
+def _line_chart(fig, categories, year1, year2, data_year1, data_year2) -> None:
+    ax = fig.subplots()
+    ax.plot(categories, data_year1, marker="o", label=str(year1))
+    ax.plot(categories, data_year2, marker="o", label=str(year2))
+    ax.set_xlabel("Categories")
+    ax.set_ylabel("Percentage of Expenditure")
+    ax.set_title(f"Trend of Household Expenditure ({year1} vs {year2})")
+    ax.legend()
+
+
+def _pie_chart(fig, categories, year1, year2, data_year1, data_year2) -> None:
+    axs = fig.subplots(1, 2)
+    axs[0].pie(data_year1, labels=categories, autopct="%1.1f%%", startangle=140)
+    axs[0].set_title(f"Distribution of Household Expenditure ({year1})")
+    axs[1].pie(data_year2, labels=categories, autopct="%1.1f%%", startangle=140)
+    axs[1].set_title(f"Distribution of Household Expenditure ({year2})")
+
+
+_RENDERERS = {
+    "bar": (_bar_chart, (8, 6)),
+    "line": (_line_chart, (8, 6)),
+    "pie": (_pie_chart, (12, 6)),
+}
+
+
+def render_chart(chart_type: str, diagram_data: dict, path: str) -> str:
+    """
+    Render a chart with the object-oriented Figure API (no pyplot global state)
+    and write it atomically to `path`.
+    """
+    from matplotlib.figure import Figure
+
+    draw, figsize = _RENDERERS[chart_type]
+    fig = Figure(figsize=figsize)
+    draw(
+        fig,
+        diagram_data["categories"],
+        diagram_data["year1"],
+        diagram_data["year2"],
+        diagram_data["data_year1"],
+        diagram_data["data_year2"],
+    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fig.savefig(tmp_path, format="png")
+    os.replace(tmp_path, path)
+    return path
+
+
+# === Service ===
+
+def chart_key(chart_type: str, diagram_data: dict) -> str:
+    """
+    Content hash of a chart: identical data renders to the same file.
+    """
+    payload = json.dumps({"type": chart_type, "data": diagram_data}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class ChartService:
+    """
+    Renders writing Task 1 diagrams off the event loop.
+
+    Charts are drawn in a warm process pool and stored under a hash of their
+    type and data, so identical diagrams are rendered once and shared by all
+    API processes through the media folder.
+    """
+
+    def __init__(self, workers: int = 2, folder=DIAGRAMS_DIR):
+        self.workers = workers
+        self.folder = folder
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up,
+            )
+        return self._executor
+
+    async def warm(self) -> None:
+        """
+        Start the workers and load matplotlib in them ahead of the first request.
+        """
+        self.folder.mkdir(parents=True, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, int) for _ in range(self.workers)))
+
+    async def render(self, chart_type: str, diagram_data: dict) -> str:
+        """
+        Path of the rendered chart relative to the media folder (e.g. "writing/diagrams/<hash>.png"):
+        1. Reuse the file if this chart was rendered before.
+        2. Otherwise render it in the pool, sharing one render between concurrent callers.
+        """
+        if chart_type not in CHART_TYPES:
+            raise ValueError(f"Unknown chart type: {chart_type}")
+
+        key = chart_key(chart_type, diagram_data)
+        path = self.folder / f"{key}.png"
+        relative = str(path.relative_to(BASE_DIR / "media"))
+
+        # 1. Cached
+        if path.exists():
+            return relative
+
+        # 2. Render (single flight per process)
+        future = self._pending.get(key)
+        if future is None:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor, render_chart, chart_type, diagram_data, str(path)
+            )
+            self._pending[key] = future
+            future.add_done_callback(lambda _: self._pending.pop(key, None))
+        await asyncio.shield(future)
+        return relative
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance for import
+chart_service = ChartService()
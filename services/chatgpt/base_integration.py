@@ -1,14 +1,23 @@
 from fastapi import HTTPException
-from typing import Optional
-import openai
+from typing import Dict, Optional
 from config import OPENAI_API_KEY
+from .gateway import LLMGateway, gateway
+
+# One gateway (client pool and limits) per explicitly given API key
+_gateways: Dict[str, LLMGateway] = {}
 
 class BaseChatGPTIntegration:
     """
     Base asynchronous integrator for working with OpenAI ChatGPT.
+    All requests go through the shared LLM gateway (pooled client, limits, retries).
     """
     def __init__(self, api_key: Optional[str] = None):
         key = api_key or OPENAI_API_KEY
         if not key:
             raise HTTPException(status_code=500, detail="OpenAI API key not provided")
-        self.async_client = openai.AsyncOpenAI(api_key=key)
\ No newline at end of file
+        if api_key is None:
+            self.gateway = gateway
+        else:
+            if api_key not in _gateways:
+                _gateways[api_key] = LLMGateway(api_key=api_key)
+            self.gateway = _gateways[api_key]
\ No newline at end of file
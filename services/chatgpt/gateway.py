@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+import openai
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    OpenAIError,
+    RateLimitError,
+)
+
+from config import OPENAI_API_KEY
+
+logger = logging.getLogger(__name__)
+
+# Concurrent in-flight requests allowed per model in this process
+MODEL_CONCURRENCY: Dict[str, int] = {
+    "gpt-4o": 16,
+    "whisper-1": 8,
+}
+# Limit of models not listed above
+DEFAULT_CONCURRENCY = 8
+
+# Total time budget of one logical call, including retries (seconds)
+DEFAULT_DEADLINE = 120.0
+
+# Errors worth retrying: rate limits, dropped connections and 5xx responses
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+class LLMDeadlineExceeded(OpenAIError):
+    """Raised when a call (with all its retries) did not finish before its deadline."""
+
+
+class LLMGateway:
+    """
+    Process-wide entry point for OpenAI calls.
+
+    Owns a single pooled AsyncOpenAI client, limits concurrent requests per
+    model, retries transient failures with full-jitter exponential backoff
+    (honouring Retry-After on 429) and enforces an overall deadline.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_connections: int = 100,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+    ):
+        self.api_key = api_key or OPENAI_API_KEY
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """
+        The shared client, created on first use. Retries are handled here, not by the SDK.
+        """
+        if self._client is None:
+            self._client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                max_retries=0,
+                http_client=openai.DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections // 2,
+                    ),
+                ),
+            )
+        return self._client
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        if model not in self._semaphores:
+            self._semaphores[model] = asyncio.Semaphore(MODEL_CONCURRENCY.get(model, DEFAULT_CONCURRENCY))
+        return self._semaphores[model]
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """
+        Delay before the next attempt: Retry-After if the server sent one, else full jitter.
+        """
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def call(
+        self,
+        model: str,
+        request: Callable[[openai.AsyncOpenAI], Awaitable[Any]],
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """
+        Run `request(client)` for a model:
+        1. Wait for a free slot of the model's semaphore, within the deadline.
+        2. Run the request with the remaining time budget as timeout.
+        3. Retry transient errors with backoff while the deadline allows it.
+        """
+        expires_at = time.monotonic() + (deadline or DEFAULT_DEADLINE)
+        attempt = 0
+        while True:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                raise LLMDeadlineExceeded(f"{model} call exceeded its deadline")
+            semaphore = self._semaphore(model)
+            try:
+                # 1. Free slot, waited for within the budget
+                await asyncio.wait_for(semaphore.acquire(), timeout=remaining)
+                try:
+                    # 2. Time-boxed request
+                    return await asyncio.wait_for(request(self.client), timeout=expires_at - time.monotonic())
+                finally:
+                    semaphore.release()
+            except asyncio.TimeoutError:
+                raise LLMDeadlineExceeded(f"{model} call exceeded its deadline")
+            except RETRYABLE_ERRORS as e:
+                # 3. Backoff and retry
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt, e)
+                if time.monotonic() + delay >= expires_at:
+                    raise
+                logger.warning("%s call failed (%s), retry %s in %.2fs", model, type(e).__name__, attempt + 1, delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def chat(self, model: str, messages: list, deadline: Optional[float] = None, **kwargs):
+        """
+        Chat completion through the gateway.
+        """
+        return await self.call(
+            model,
+            lambda client: client.chat.completions.create(model=model, messages=messages, **kwargs),
+            deadline,
+        )
+
+    async def transcribe(self, file, model: str = "whisper-1", deadline: Optional[float] = None, **kwargs):
+        """
+        Audio transcription through the gateway. The file is rewound before every attempt.
+        """
+        async def request(client):
+            if hasattr(file, "seek"):
+                file.seek(0)
+            return await client.audio.transcriptions.create(file=file, model=model, **kwargs)
+
+        return await self.call(model, request, deadline)
+
+
+# Singleton instance for import
+gateway = LLMGateway()
@@ -5,6 +5,7 @@ import asyncio
 from fastapi import HTTPException, status
 from openai import OpenAIError
 from .base_integration import BaseChatGPTIntegration
+from .response_cache import llm_cache
 
 PROMPTS_PATH = os.path.join(os.path.dirname(__file__), "prompts")
 
@@ -101,49 +102,58 @@ class ChatGPTReadingIntegration(BaseChatGPTIntegration):
 
         kwargs.setdefault("max_tokens", 6000)
         kwargs.setdefault("temperature", 0.0)
-        try:
-            resp = await self.async_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                **kwargs
-            )
-            raw = resp.choices[0].message.content
-        except OpenAIError as e:
-            raise HTTPException(status_code=502, detail=f"OpenAI API error: {e}")
-
-        raw = raw.replace("```json", "").replace("```", "").strip()
 
-        arr_text = extract_json_array(raw)
-
-        try:
-            arr = json.loads(arr_text)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"JSON parse error: {e}")
-
-        target = next((item for item in arr if (
-            isinstance(item, dict)
-            and "passages" in item
-            and item["passages"].get("passage_id") == passage_id
-        )), None)
-
-        if not target:
-            raise HTTPException(status_code=502, detail=f"No analysis found for passage_id {passage_id}")
-
-        passages = target["passages"]
-        stats = target.get("stats", {})
-
-        return {
-            "passage_id": passages.get("passage_id"),
-            "analysis": passages.get("analysis", []),
-            "stats": stats
-        }
+        async def check() -> dict:
+            try:
+                resp = await self.gateway.chat(
+                    model="gpt-4o",
+                    messages=[{"role": "user", "content": prompt}],
+                    **kwargs
+                )
+                raw = resp.choices[0].message.content
+            except OpenAIError as e:
+                raise HTTPException(status_code=502, detail=f"OpenAI API error: {e}")
+
+            raw = raw.replace("```json", "").replace("```", "").strip()
+
+            arr_text = extract_json_array(raw)
+
+            try:
+                arr = json.loads(arr_text)
+            except Exception as e:
+                raise HTTPException(status_code=502, detail=f"JSON parse error: {e}")
+
+            target = next((item for item in arr if (
+                isinstance(item, dict)
+                and "passages" in item
+                and item["passages"].get("passage_id") == passage_id
+            )), None)
+
+            if not target:
+                raise HTTPException(status_code=502, detail=f"No analysis found for passage_id {passage_id}")
+
+            passages = target["passages"]
+            stats = target.get("stats", {})
+
+            return {
+                "passage_id": passages.get("passage_id"),
+                "analysis": passages.get("analysis", []),
+                "stats": stats
+            }
+
+        if kwargs["temperature"] != 0.0:
+            return await check()
+        # Deterministic call: identical passages and answers reuse the stored analysis
+        return await llm_cache.get_or_compute(
+            "gpt-4o", prompt_template, "en", {"data": payload, "options": kwargs}, check
+        )
 
     async def _generate_response(self, prompt: str, **kwargs) -> str:
         """
         Internal helper to call OpenAI's chat completion endpoint.
         """
         try:
-            response = await self.async_client.chat.completions.create(
+            response = await self.gateway.chat(
                 model="gpt-4o",
                 messages=[{"role": "user", "content": prompt}],
                 **kwargs
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Any, Awaitable, Callable, Optional
+from redis.asyncio import Redis
+
+from config import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_payload(value: Any) -> Any:
+    """
+    Normalize a payload so that semantically equal inputs hash the same:
+    strings are trimmed with inner whitespace collapsed, containers are walked.
+    """
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip()
+    if isinstance(value, dict):
+        return {str(k): normalize_payload(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_payload(v) for v in value]
+    return value
+
+
+def template_version(template: str) -> str:
+    """
+    Short content hash of a prompt template; editing the prompt changes every key.
+    """
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+class LLMResponseCache:
+    """
+    Content-addressed Redis cache of parsed LLM responses.
+
+    Keys hash the model, prompt template version, language and normalized
+    payload, so only deterministic (temperature 0) calls should use it.
+    Entries expire `ttl` after their last hit; when the stored bytes exceed `max_bytes`
+    the least recently used entries are evicted. Hits, misses and
+    evictions are counted in a stats hash.
+    """
+
+    PREFIX = "llm_cache"
+
+    def __init__(self, redis_url=REDIS_URL, ttl: int = 30 * 24 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.redis = Redis.from_url(redis_url, decode_responses=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.index_key = f"{self.PREFIX}:index"
+        self.sizes_key = f"{self.PREFIX}:sizes"
+        self.bytes_key = f"{self.PREFIX}:bytes"
+        self.stats_key = f"{self.PREFIX}:stats"
+
+    def make_key(self, model: str, template: str, lang: str, payload: Any) -> str:
+        normalized = json.dumps(
+            normalize_payload(payload), sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+        )
+        digest = hashlib.sha256(
+            "\x00".join((model, template_version(template), lang or "", normalized)).encode("utf-8")
+        ).hexdigest()
+        return f"{self.PREFIX}:{digest}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value and refresh its recency and TTL, counting the hit or miss.
+        """
+        data = await self.redis.get(key)
+        pipe = self.redis.pipeline(transaction=False)
+        if data is None:
+            pipe.hincrby(self.stats_key, "misses", 1)
+        else:
+            pipe.hincrby(self.stats_key, "hits", 1)
+            pipe.zadd(self.index_key, {key: time.time()}, xx=True)
+            pipe.expire(key, self.ttl)
+        await pipe.execute()
+        return json.loads(data) if data is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store a value, account for its size and evict old entries over the byte budget.
+        """
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        previous = await self.redis.hget(self.sizes_key, key)
+
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.set(key, data, ex=self.ttl)
+        pipe.zadd(self.index_key, {key: time.time()})
+        pipe.hset(self.sizes_key, key, size)
+        pipe.incrby(self.bytes_key, size - int(previous or 0))
+        total = (await pipe.execute())[-1]
+
+        if total > self.max_bytes:
+            await self._evict(total)
+
+    async def _evict(self, total: int) -> None:
+        """
+        Bring the stored bytes back under budget, least recently used first:
+        1. Drop the records of entries that already expired (their TTL ran out).
+        2. Delete live entries until the budget is met; the rest go back to the index.
+        """
+        evicted = 0
+        while total > self.max_bytes:
+            oldest = await self.redis.zpopmin(self.index_key, 16)
+            if not oldest:
+                break
+            keys = [key for key, _ in oldest]
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.exists(key)
+            pipe.hmget(self.sizes_key, keys)
+            *exists, sizes = await pipe.execute()
+            sizes = [int(size or 0) for size in sizes]
+
+            # 1. Expired entries
+            dead = [key for key, alive in zip(keys, exists) if not alive]
+            if dead:
+                pipe = self.redis.pipeline(transaction=True)
+                pipe.hdel(self.sizes_key, *dead)
+                pipe.decrby(self.bytes_key, sum(size for key, size, alive in zip(keys, sizes, exists) if not alive))
+                total = (await pipe.execute())[1]
+
+            # 2. Live entries, oldest first
+            victims, kept = [], {}
+            for (key, score), size, alive in zip(oldest, sizes, exists):
+                if not alive:
+                    continue
+                if total > self.max_bytes:
+                    victims.append(key)
+                    total -= size
+                else:
+                    kept[key] = score
+            pipe = self.redis.pipeline(transaction=True)
+            if kept:
+                pipe.zadd(self.index_key, kept)
+            if victims:
+                pipe.delete(*victims)
+                pipe.hdel(self.sizes_key, *victims)
+                pipe.decrby(self.bytes_key, sum(size for key, size in zip(keys, sizes) if key in victims))
+                pipe.hincrby(self.stats_key, "evictions", len(victims))
+            results = await pipe.execute()
+            if victims:
+                total = results[-2]
+            evicted += len(victims)
+        if evicted:
+            logger.info("LLM cache evicted %s entries", evicted)
+
+    async def get_or_compute(
+        self, model: str, template: str, lang: str, payload: Any, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached response for these inputs or compute and store it.
+        Cache failures never break the call; errors from `compute` are not cached.
+        """
+        key = self.make_key(model, template, lang, payload)
+        try:
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+        except Exception:
+            logger.exception("LLM cache read failed")
+
+        value = await compute()
+        try:
+            await self.set(key, value)
+        except Exception:
+            logger.exception("LLM cache write failed")
+        return value
+
+    async def stats(self) -> dict:
+        """
+        Hit/miss/eviction counters, entry count and stored bytes.
+        """
+        stats = await self.redis.hgetall(self.stats_key)
+        return {
+            "hits": int(stats.get("hits", 0)),
+            "misses": int(stats.get("misses", 0)),
+            "evictions": int(stats.get("evictions", 0)),
+            "entries": await self.redis.zcard(self.index_key),
+            "bytes": int(await self.redis.get(self.bytes_key) or 0),
+        }
+
+
+# Singleton instance for import
+llm_cache = LLMResponseCache()
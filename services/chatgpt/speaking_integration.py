@@ -3,6 +3,7 @@ import json
 import re
 from openai import AuthenticationError, BadRequestError, OpenAIError, RateLimitError
 from .base_integration import BaseChatGPTIntegration
+from .response_cache import llm_cache
 from io import BytesIO
 import random
 from datetime import datetime
@@ -103,7 +104,7 @@ class ChatGPTSpeakingIntegration(BaseChatGPTIntegration):
             "user_id": user_id,
             "date": now
         })
-        response = await self.async_client.chat.completions.create(
+        response = await self.gateway.chat(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": prompt},
@@ -141,46 +142,60 @@ class ChatGPTSpeakingIntegration(BaseChatGPTIntegration):
 Only use {language_name} language. Do NOT include English explanations.
 Return ONLY a valid JSON object. Do not include any explanations, markdown, or text outside the JSON. If you understand, reply only with the JSON object.
 """
-        response = await self.async_client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": prompt_with_lang},
-                {"role": "user", "content": json.dumps(data, ensure_ascii=False)},
-            ],
-            temperature=0.0,
-            max_tokens=6000
-        )
-        raw = response.choices[0].message.content
-        if not raw or not raw.strip():
-            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "OpenAI returned an empty response for analysis.")
-
-        match = re.search(r'\{.*\}', raw, re.DOTALL)
-        if not match:
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR,
-                f"OpenAI returned invalid JSON:\n{raw}"
-            )
-        json_str = match.group(0)
-        try:
-            return json.loads(json_str)
-        except Exception as e:
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR,
-                f"Error parsing OpenAI response: {e}\nRAW: {json_str}"
+        async def analyse() -> dict:
+            response = await self.gateway.chat(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": prompt_with_lang},
+                    {"role": "user", "content": json.dumps(data, ensure_ascii=False)},
+                ],
+                temperature=0.0,
+                max_tokens=6000
             )
+            raw = response.choices[0].message.content
+            if not raw or not raw.strip():
+                raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "OpenAI returned an empty response for analysis.")
+
+            match = re.search(r'\{.*\}', raw, re.DOTALL)
+            if not match:
+                raise HTTPException(
+                    status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    f"OpenAI returned invalid JSON:\n{raw}"
+                )
+            json_str = match.group(0)
+            try:
+                return json.loads(json_str)
+            except Exception as e:
+                raise HTTPException(
+                    status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    f"Error parsing OpenAI response: {e}\nRAW: {json_str}"
+                )
+
+        # temperature=0.0, so identical answers reuse the stored analysis
+        return await llm_cache.get_or_compute("gpt-4o", prompt_with_lang, lang_code, data, analyse)
 
     async def transcribe_audio_file_async(self, audio: UploadFile, lang="en") -> str:
         """
         Asynchronously transcribe audio using OpenAI Whisper.
         """
-        try:
-            content = await audio.read()
-            file_like = BytesIO(content)
-            file_like.name = audio.filename
+        content = await audio.read()
+        file_like = BytesIO(content)
+        file_like.name = audio.filename
+        return await self._transcribe(file_like, lang)
 
-            transcript = await self.async_client.audio.transcriptions.create(
-                file=file_like,
+    async def transcribe_audio_path_async(self, path: str, lang="en", deadline: float = None) -> str:
+        """
+        Transcribe an audio file stored on disk. The file is streamed to Whisper, not copied into memory.
+        """
+        with open(path, "rb") as audio_file:
+            return await self._transcribe(audio_file, lang, deadline)
+
+    async def _transcribe(self, file, lang: str, deadline: float = None) -> str:
+        try:
+            transcript = await self.gateway.transcribe(
+                file=file,
                 model="whisper-1",
+                deadline=deadline,
                 response_format="text",
                 language=lang
             )
@@ -192,4 +207,4 @@ Return ONLY a valid JSON object. Do not include any explanations, markdown, or t
         except RateLimitError as e:
             raise HTTPException(status.HTTP_429_TOO_MANY_REQUESTS, f"Rate limit exceeded. {str(e)}")
         except OpenAIError as e:
-            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, f"OpenAI API error: {str(e)}")
\ No newline at end of file
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, f"OpenAI API error: {str(e)}")
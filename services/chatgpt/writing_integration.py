@@ -1,12 +1,11 @@
 from fastapi import HTTPException
 import json
-import os
 from datetime import datetime
-import matplotlib.pyplot as plt
 import re
 import random
 
 from .base_integration import BaseChatGPTIntegration
+from .response_cache import llm_cache
 
 ANALYSE_PROMPT = """
 You are an official IELTS examiner. Your task is to evaluate IELTS Writing Task 1 and Task 2 responses provided by a candidate.
@@ -110,7 +109,7 @@ class ChatGPTWritingIntegration(BaseChatGPTIntegration):
             + "Please use the above seed, user ID, and date to make the chart and question unique."
             + "Please make sure the topic and chart data are different from previous generations, and use the seed, user ID, and date for uniqueness."
         )
-        response = await self.async_client.chat.completions.create(
+        response = await self.gateway.chat(
             model="gpt-4o",
             messages=[{"role": "system", "content": prompt}],
             temperature=0.7,
@@ -141,7 +140,7 @@ class ChatGPTWritingIntegration(BaseChatGPTIntegration):
             + f"# Date: {now}\n"
             + "Please use the above seed, user ID, and date to make the question unique."
         )
-        response = await self.async_client.chat.completions.create(
+        response = await self.gateway.chat(
             model="gpt-4o",
             messages=[{"role": "system", "content": prompt}],
             temperature=0.7,
@@ -159,53 +158,6 @@ class ChatGPTWritingIntegration(BaseChatGPTIntegration):
                 raise HTTPException(status_code=500, detail=f"Failed to parse Task 2 question: {e}\nRAW: {json_str}")
         return {"question": raw.strip()}
 
-    def create_bar_chart(self, categories, year1, year2, data_year1, data_year2) -> str:
-        output_dir = "media/writing/diagrams"
-        os.makedirs(output_dir, exist_ok=True)
-        fig, ax = plt.subplots(figsize=(8, 6))
-        bar_width = 0.35
-        x = range(len(categories))
-        ax.bar(x, data_year1, width=bar_width, label=str(year1), alpha=0.7)
-        ax.bar([i + bar_width for i in x], data_year2, width=bar_width, label=str(year2), alpha=0.7)
-        ax.set_xlabel("Categories", fontsize=12)
-        ax.set_ylabel("Percentage of Expenditure", fontsize=12)
-        ax.set_title(f"Comparison of Household Expenditure by Category ({year1} vs {year2})", fontsize=14)
-        ax.set_xticks([i + bar_width / 2 for i in x])
-        ax.set_xticklabels(categories, fontsize=10)
-        ax.legend()
-        filename = os.path.join(output_dir, f"{datetime.now().isoformat()}.png")
-        plt.savefig(filename)
-        plt.close()
-        return filename
-
-    def create_line_chart(self, categories, year1, year2, data_year1, data_year2) -> str:
-        output_dir = "media/writing/diagrams"
-        os.makedirs(output_dir, exist_ok=True)
-        plt.figure(figsize=(8, 6))
-        plt.plot(categories, data_year1, marker="o", label=str(year1))
-        plt.plot(categories, data_year2, marker="o", label=str(year2))
-        plt.xlabel("Categories")
-        plt.ylabel("Percentage of Expenditure")
-        plt.title(f"Trend of Household Expenditure ({year1} vs {year2})")
-        plt.legend()
-        filename = os.path.join(output_dir, f"{datetime.now().isoformat()}.png")
-        plt.savefig(filename)
-        plt.close()
-        return filename
-
-    def create_pie_chart(self, categories, year1, year2, data_year1, data_year2) -> str:
-        output_dir = "media/writing/diagrams"
-        os.makedirs(output_dir, exist_ok=True)
-        fig, axs = plt.subplots(1, 2, figsize=(12, 6))
-        axs[0].pie(data_year1, labels=categories, autopct="%1.1f%%", startangle=140)
-        axs[0].set_title(f"Distribution of Household Expenditure ({year1})")
-        axs[1].pie(data_year2, labels=categories, autopct="%1.1f%%", startangle=140)
-        axs[1].set_title(f"Distribution of Household Expenditure ({year2})")
-        filename = os.path.join(output_dir, f"{datetime.now().isoformat()}.png")
-        plt.savefig(filename)
-        plt.close()
-        return filename
-
     async def analyse_writing(self, part1, part2, lang_code: str = "en") -> dict:
         lang_map = {
             "uz": "Uzbek",
@@ -233,22 +185,26 @@ class ChatGPTWritingIntegration(BaseChatGPTIntegration):
 Only use {language_name} language. Do NOT include English explanations.
 Return ONLY a valid JSON object. Do not include any explanations, markdown, or text outside the JSON. If you understand, reply only with the JSON object.
 """
-        response = await self._generate_response(
-            prompt=prompt_with_lang,
-            user_content=json.dumps(data, ensure_ascii=False)
-        )
-        match = re.search(r'```(?:json)?\s*([\s\S]+?)\s*```', response)
-        if match:
-            json_str = match.group(1)
-        else:
-            json_str = response
-        try:
-            return json.loads(json_str)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to parse ChatGPT response: {e}\nRAW: {response}")
+        async def analyse() -> dict:
+            response = await self._generate_response(
+                prompt=prompt_with_lang,
+                user_content=json.dumps(data, ensure_ascii=False)
+            )
+            match = re.search(r'```(?:json)?\s*([\s\S]+?)\s*```', response)
+            if match:
+                json_str = match.group(1)
+            else:
+                json_str = response
+            try:
+                return json.loads(json_str)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Failed to parse ChatGPT response: {e}\nRAW: {response}")
+
+        # temperature=0.0, so identical essays reuse the stored analysis
+        return await llm_cache.get_or_compute("gpt-4o", prompt_with_lang, lang_code, data, analyse)
 
     async def _generate_response(self, prompt: str, user_content: str) -> str:
-        response = await self.async_client.chat.completions.create(
+        response = await self.gateway.chat(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": prompt},
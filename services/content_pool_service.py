@@ -0,0 +1,121 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+from tortoise.transactions import in_transaction
+
+from models.tests import ContentPoolItem, TestTypeEnum
+from services.chatgpt.speaking_integration import ChatGPTSpeakingIntegration
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEVEL = "default"
+SPEAKING_PARTS = ("part1", "part2", "part3")
+
+
+class Watermarks(NamedTuple):
+    """Refill starts when the pool drops below `low` and tops it up to `high`."""
+    low: int
+    high: int
+
+
+def validate_speaking_questions(data: Any) -> Dict[str, dict]:
+    """
+    Validate generated speaking questions and normalize every part to
+    {"title": str, "question": list}. Raises ValueError on malformed data.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Speaking questions must be an object")
+
+    parts = {}
+    for part_key in SPEAKING_PARTS:
+        q = data.get(part_key)
+        if not isinstance(q, dict) or not q.get("title") or not q.get("question"):
+            raise ValueError(f"Missing or empty {part_key}")
+        content = q["question"]
+        if isinstance(content, str):
+            try:
+                content = json.loads(content)
+            except Exception:
+                content = [content]
+        parts[part_key] = {"title": q["title"], "question": content}
+    return parts
+
+
+async def generate_speaking_questions() -> Dict[str, dict]:
+    return validate_speaking_questions(
+        await ChatGPTSpeakingIntegration().generate_ielts_speaking_questions()
+    )
+
+
+# Pools kept warm by the refill job: (test type, level) -> watermarks
+POOL_TARGETS: Dict[Tuple[TestTypeEnum, str], Watermarks] = {
+    (TestTypeEnum.SPEAKING_ENG, DEFAULT_LEVEL): Watermarks(low=10, high=30),
+}
+
+# Generator producing one validated payload for a test type
+GENERATORS: Dict[TestTypeEnum, Callable[[], Awaitable[Any]]] = {
+    TestTypeEnum.SPEAKING_ENG: generate_speaking_questions,
+}
+
+
+class ContentPoolService:
+    """
+    Hands out pre-generated test content and keeps the pools topped up.
+    """
+
+    @staticmethod
+    async def pop(test_type: TestTypeEnum, level: str = DEFAULT_LEVEL) -> Optional[Any]:
+        """
+        Atomically take the oldest ready item of a pool.
+        Concurrent callers skip rows locked by each other, so no item is handed out twice.
+        """
+        async with in_transaction():
+            item = await ContentPoolItem.filter(
+                test_type=test_type, level=level
+            ).order_by("id").select_for_update(skip_locked=True).first()
+            if item is None:
+                return None
+            await ContentPoolItem.filter(id=item.id).delete()
+        return item.payload
+
+    @staticmethod
+    async def refill(concurrency: int = 3) -> Dict[str, int]:
+        """
+        Top up every pool that fell below its low watermark:
+        1. Count ready items of each configured pool.
+        2. Generate the missing items up to the high watermark, a few at a time.
+        3. Store only payloads that pass validation.
+        Returns the number of items added per pool.
+        """
+        added = {}
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate_one(generator):
+            async with semaphore:
+                try:
+                    return await generator()
+                except Exception:
+                    logger.exception("Content generation failed")
+                    return None
+
+        for (test_type, level), marks in POOL_TARGETS.items():
+            # 1. Current size
+            ready = await ContentPoolItem.filter(test_type=test_type, level=level).count()
+            if ready >= marks.low:
+                continue
+
+            # 2. Generate missing items
+            payloads = await asyncio.gather(
+                *(generate_one(GENERATORS[test_type]) for _ in range(marks.high - ready))
+            )
+
+            # 3. Store valid payloads
+            items = [
+                ContentPoolItem(test_type=test_type, level=level, payload=payload)
+                for payload in payloads if payload is not None
+            ]
+            if items:
+                await ContentPoolItem.bulk_create(items)
+            added[f"{test_type.value}:{level}"] = len(items)
+        return added
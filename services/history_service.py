@@ -0,0 +1,107 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+from tortoise import connections
+
+# One SELECT per test kind, each joined with its analysis score.
+# Every branch is fully aliased so any subset can be unioned in any order.
+_BRANCHES = {
+    "reading": """
+        SELECT 'Reading' AS kind, t.id AS id, COALESCE(t.start_time, t.created_at) AS taken_at,
+               t.start_time AS start_time, t.end_time AS end_time, t.score AS score
+        FROM readings t
+        WHERE t.user_id = $1
+    """,
+    "listening": """
+        SELECT 'Listening' AS kind, t.id AS id, COALESCE(t.start_time, t.created_at) AS taken_at,
+               t.start_time AS start_time, t.end_time AS end_time, a.overall_score AS score
+        FROM user_listening_sessions t
+        LEFT JOIN listening_analyses a ON a.session_id = t.id
+        WHERE t.user_id = $1
+    """,
+    "speaking": """
+        SELECT 'Speaking' AS kind, t.id AS id, COALESCE(t.start_time, t.created_at) AS taken_at,
+               t.start_time AS start_time, t.end_time AS end_time, a.overall_band_score AS score
+        FROM speaking t
+        LEFT JOIN speaking_analyses a ON a.speaking_id = t.id
+        WHERE t.user_id = $1
+    """,
+    "writing": """
+        SELECT 'Writing' AS kind, t.id AS id, COALESCE(t.start_time, t.created_at) AS taken_at,
+               t.start_time AS start_time, t.end_time AS end_time, a.overall_band_score AS score
+        FROM writings t
+        LEFT JOIN writing_analyses a ON a.writing_id = t.id
+        WHERE t.user_id = $1
+    """,
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a history cursor cannot be decoded."""
+
+
+def encode_cursor(taken_at: datetime, kind: str, item_id: int) -> str:
+    """
+    Encode the sort key of the last returned row as an opaque cursor.
+    """
+    raw = f"{taken_at.isoformat()}|{kind}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        taken_at, kind, item_id = raw.split("|")
+        return datetime.fromisoformat(taken_at), kind, int(item_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+class HistoryService:
+    """
+    Reads a user's combined test history with one keyset-paginated query.
+    """
+
+    @staticmethod
+    async def get_page(
+        user_id: int,
+        test_type: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Get one page of history, newest first:
+        1. Build a UNION ALL over the requested test kinds (all kinds if type is unknown).
+        2. Continue after the cursor position using (taken_at, kind, id) as the sort key.
+        3. Fetch one extra row to know whether a next page exists.
+        Returns the rows and the cursor of the next page (None on the last page).
+        """
+        # 1. Branches for requested kinds
+        kinds = [test_type] if test_type in _BRANCHES else list(_BRANCHES)
+        union = "\nUNION ALL\n".join(_BRANCHES[kind] for kind in kinds)
+
+        # 2. Keyset condition
+        values: list = [user_id]
+        where = ""
+        if cursor:
+            values.extend(decode_cursor(cursor))
+            where = "WHERE (h.taken_at, h.kind, h.id) < ($2, $3, $4)"
+
+        # 3. Page query
+        values.append(limit + 1)
+        sql = (
+            f"SELECT h.* FROM ({union}) h {where} "
+            f"ORDER BY h.taken_at DESC, h.kind DESC, h.id DESC LIMIT ${len(values)}"
+        )
+        rows = await connections.get("default").execute_query_dict(sql, values)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last["taken_at"], last["kind"], last["id"])
+        return rows, next_cursor
@@ -0,0 +1,201 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+from redis.asyncio import Redis
+from tortoise.functions import Max
+
+from config import REDIS_URL
+from models import User
+from models.analyses import ListeningAnalyse, ReadingAnalyse, SpeakingAnalyse, WritingAnalyse
+from models.transactions import TransactionType
+from utils.ielts_score import IELTSScoreCalculator
+
+logger = logging.getLogger(__name__)
+
+# Rolling windows for each leaderboard period (None = all time)
+PERIODS = {
+    "week": timedelta(days=7),
+    "month": timedelta(days=30),
+    "all": None,
+}
+
+# Test types that produce analyses, plus the combined board
+TEST_TYPES = (
+    TransactionType.TEST_READING.value,
+    TransactionType.TEST_LISTENING.value,
+    TransactionType.TEST_SPEAKING.value,
+    TransactionType.TEST_WRITING.value,
+)
+ALL_TYPES = "ALL"
+
+
+class LeaderboardService:
+    """
+    Maintains IELTS leaderboards as Redis sorted sets.
+
+    One board exists per period (week/month/all) and test type (or ALL).
+    Members are user ids scored by their overall IELTS band. Windowed boards
+    keep a companion "seen" set with the last activity timestamp so users
+    who have not taken a test inside the window are pruned.
+    """
+
+    def __init__(self, redis_url=REDIS_URL):
+        self.redis = Redis.from_url(redis_url, decode_responses=True)
+
+    @staticmethod
+    def board_key(period: str, test_type: str) -> str:
+        return f"leaderboard:{period}:{test_type}"
+
+    @staticmethod
+    def seen_key(period: str, test_type: str) -> str:
+        return f"leaderboard:{period}:{test_type}:seen"
+
+    @staticmethod
+    def normalize(period: Optional[str], test_type: Optional[str]) -> Tuple[str, str]:
+        """
+        Map query parameters to a (period, test_type) board identifier.
+        """
+        period = period if period in PERIODS else "all"
+        test_type = test_type.upper() if test_type else ALL_TYPES
+        return period, test_type
+
+    def _all_boards(self) -> Iterable[Tuple[str, str]]:
+        for period in PERIODS:
+            for test_type in (*TEST_TYPES, ALL_TYPES):
+                yield period, test_type
+
+    async def record_activity(
+        self,
+        user_id: int,
+        test_type: str,
+        score: Optional[float] = None,
+        occurred_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Update boards after a new analysis row was written:
+        1. Use the given overall IELTS score or recalculate it.
+        2. Add the user to every period board of this test type and of ALL.
+        3. Refresh the score on other boards the user already belongs to.
+        4. Drop members that fell out of the windowed periods.
+        """
+        # 1. Overall score
+        if score is None:
+            score = await IELTSScoreCalculator.calculate_by_user_id(user_id)
+        ts = (occurred_at or datetime.now(timezone.utc)).timestamp()
+        active = {(period, tt) for period in PERIODS for tt in (test_type, ALL_TYPES)}
+
+        # 2-3. Add or refresh membership in a single round trip
+        pipe = self.redis.pipeline(transaction=False)
+        for period, tt in self._all_boards():
+            if (period, tt) in active:
+                pipe.zadd(self.board_key(period, tt), {user_id: score})
+                if PERIODS[period] is not None:
+                    pipe.zadd(self.seen_key(period, tt), {user_id: ts})
+            else:
+                pipe.zadd(self.board_key(period, tt), {user_id: score}, xx=True)
+        await pipe.execute()
+
+        # 4. Prune expired members
+        for period, tt in active:
+            await self._prune(period, tt)
+
+    async def safe_record_activity(
+        self, user_id: int, test_type: str, score: Optional[float] = None
+    ) -> None:
+        """
+        Same as record_activity, but never breaks the analysis flow.
+        """
+        try:
+            await self.record_activity(user_id, test_type, score)
+        except Exception:
+            logger.exception("Failed to update leaderboard for user %s", user_id)
+
+    async def _prune(self, period: str, test_type: str) -> None:
+        window = PERIODS[period]
+        if window is None:
+            return
+        cutoff = (datetime.now(timezone.utc) - window).timestamp()
+        seen = self.seen_key(period, test_type)
+        stale = await self.redis.zrangebyscore(seen, "-inf", cutoff)
+        if stale:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zrem(self.board_key(period, test_type), *stale)
+            pipe.zrem(seen, *stale)
+            await pipe.execute()
+
+    async def top(
+        self, period: Optional[str], test_type: Optional[str], limit: int = 100
+    ) -> List[Tuple[User, float]]:
+        """
+        Return up to `limit` (user, score) pairs ordered by score descending.
+        """
+        period, test_type = self.normalize(period, test_type)
+        await self._prune(period, test_type)
+
+        rows = await self.redis.zrevrange(self.board_key(period, test_type), 0, limit - 1, withscores=True)
+        if not rows:
+            return []
+
+        user_ids = [int(member) for member, _ in rows]
+        users = {u.id: u for u in await User.filter(id__in=user_ids)}
+        return [(users[int(member)], score) for member, score in rows if int(member) in users]
+
+    async def rebuild(self) -> int:
+        """
+        Rebuild every board from the analysis tables (for backfills):
+        1. Collect last activity per user and test type.
+        2. Recalculate overall scores for the affected users.
+        3. Write boards into temporary keys and swap them in.
+        Returns the number of ranked users.
+        """
+        # 1. Last activity per (user, test type)
+        sources = {
+            TransactionType.TEST_LISTENING.value: ListeningAnalyse.annotate(last=Max("created_at"))
+                .group_by("user_id").values_list("user_id", "last"),
+            TransactionType.TEST_READING.value: ReadingAnalyse.annotate(last=Max("created_at"))
+                .group_by("user_id").values_list("user_id", "last"),
+            TransactionType.TEST_SPEAKING.value: SpeakingAnalyse.annotate(last=Max("created_at"))
+                .group_by("speaking__user_id").values_list("speaking__user_id", "last"),
+            TransactionType.TEST_WRITING.value: WritingAnalyse.annotate(last=Max("created_at"))
+                .group_by("writing__user_id").values_list("writing__user_id", "last"),
+        }
+        activity: dict[str, dict[int, float]] = {tt: {} for tt in (*TEST_TYPES, ALL_TYPES)}
+        for test_type, query in sources.items():
+            for user_id, last in await query:
+                if user_id is None or last is None:
+                    continue
+                ts = last.timestamp()
+                activity[test_type][user_id] = ts
+                activity[ALL_TYPES][user_id] = max(ts, activity[ALL_TYPES].get(user_id, 0))
+
+        # 2. Scores (one aggregation query for all users)
+        scores = await IELTSScoreCalculator.calculate_many(activity[ALL_TYPES])
+
+        # 3. Swap in fresh boards
+        now = datetime.now(timezone.utc)
+        pipe = self.redis.pipeline(transaction=True)
+        for period, test_type in self._all_boards():
+            window = PERIODS[period]
+            cutoff = (now - window).timestamp() if window else None
+            members = {
+                user_id: ts for user_id, ts in activity[test_type].items()
+                if cutoff is None or ts >= cutoff
+            }
+            board, seen = self.board_key(period, test_type), self.seen_key(period, test_type)
+            if not members:
+                pipe.delete(board, seen)
+                continue
+            pipe.delete(f"{board}:rebuild")
+            pipe.zadd(f"{board}:rebuild", {user_id: scores[user_id] for user_id in members})
+            pipe.rename(f"{board}:rebuild", board)
+            if window is not None:
+                pipe.delete(f"{seen}:rebuild")
+                pipe.zadd(f"{seen}:rebuild", members)
+                pipe.rename(f"{seen}:rebuild", seen)
+        await pipe.execute()
+
+        return len(scores)
+
+
+# Singleton instance for import
+leaderboard = LeaderboardService()
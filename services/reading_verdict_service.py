@@ -0,0 +1,87 @@
+import logging
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+from models.tests import ReadingAnswerVerdict, ReadingQuestion
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " .,;:!?\"'"
+MAX_ANSWER_LENGTH = 255
+
+VerdictKey = Tuple[int, str]
+
+
+def normalize_answer(text: Optional[str]) -> str:
+    """
+    Normalized form of a free-text answer: lowercase, inner whitespace
+    collapsed, surrounding punctuation and quotes removed.
+    """
+    return _WHITESPACE.sub(" ", (text or "").lower()).strip(_EDGE_PUNCTUATION)
+
+
+class ReadingVerdictService:
+    """
+    Remembers how the model ruled on free-text reading answers.
+
+    Verdicts are keyed by (question_id, normalized answer); a later
+    submission of the same answer is graded from the stored verdict and
+    only unseen answers are sent to the model.
+    """
+
+    @staticmethod
+    async def lookup(keys: Iterable[VerdictKey]) -> Dict[VerdictKey, ReadingAnswerVerdict]:
+        """
+        Stored verdicts for the given (question_id, normalized answer) pairs, in one query.
+        """
+        keys = {key for key in keys if key[1] and len(key[1]) <= MAX_ANSWER_LENGTH}
+        if not keys:
+            return {}
+        verdicts = await ReadingAnswerVerdict.filter(
+            question_id__in={question_id for question_id, _ in keys},
+            normalized_answer__in={answer for _, answer in keys},
+        )
+        return {
+            (v.question_id, v.normalized_answer): v
+            for v in verdicts if (v.question_id, v.normalized_answer) in keys
+        }
+
+    @staticmethod
+    async def record(rulings: Dict[VerdictKey, dict]) -> None:
+        """
+        Store new verdicts from model rulings ({"is_correct", "correct_answer", "explanation"}).
+        Pairs already stored by a concurrent submission are left untouched.
+        """
+        verdicts = [
+            ReadingAnswerVerdict(
+                question_id=question_id,
+                normalized_answer=answer,
+                is_correct=bool(ruling.get("is_correct", False)),
+                correct_answer=ruling.get("correct_answer", ""),
+                explanation=ruling.get("explanation", ""),
+            )
+            for (question_id, answer), ruling in rulings.items()
+            if answer and len(answer) <= MAX_ANSWER_LENGTH
+        ]
+        if not verdicts:
+            return
+        try:
+            await ReadingAnswerVerdict.bulk_create(verdicts, ignore_conflicts=True)
+        except Exception:
+            logger.exception("Failed to store reading answer verdicts")
+
+    @staticmethod
+    async def forget_questions(question_ids: Iterable[int]) -> None:
+        """
+        Drop verdicts of edited questions so their answers are ruled on again.
+        """
+        question_ids = list(question_ids)
+        if question_ids:
+            await ReadingAnswerVerdict.filter(question_id__in=question_ids).delete()
+
+    @staticmethod
+    async def forget_passage(passage_id: int) -> None:
+        await ReadingVerdictService.forget_questions(
+            await ReadingQuestion.filter(passage_id=passage_id).values_list("id", flat=True)
+        )
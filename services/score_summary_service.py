@@ -0,0 +1,106 @@
+from typing import Optional
+from tortoise.transactions import in_transaction
+
+from models.analyses import UserScoreSummary
+from utils.score_aggregation import SECTIONS, ScoreAggregator, SectionScore, UserScores
+
+
+class ScoreSummaryService:
+    """
+    Maintains the denormalized per-user score summary.
+
+    The summary is refreshed in the same transaction that writes a new
+    analysis, so progress, stats and leaderboard reads become a single
+    lookup by user id instead of an aggregation over every analysis table.
+    """
+
+    @staticmethod
+    def to_fields(scores: UserScores) -> dict:
+        """
+        Flatten aggregated section scores into summary model fields.
+        """
+        data = {}
+        for section in SECTIONS:
+            score: SectionScore = getattr(scores, section)
+            data[f"{section}_latest"] = score.latest
+            data[f"{section}_best"] = score.best
+            data[f"{section}_average"] = score.average
+        data["overall_score"] = scores.overall_average()
+        data["highest_score"] = scores.overall_best()
+        return data
+
+    @staticmethod
+    def to_scores(summary: Optional[UserScoreSummary]) -> UserScores:
+        """
+        Convert a stored summary back into section scores.
+        """
+        if summary is None:
+            return UserScores()
+
+        def _float(value):
+            return float(value) if value is not None else None
+
+        return UserScores(**{
+            section: SectionScore(
+                latest=_float(getattr(summary, f"{section}_latest")),
+                average=_float(getattr(summary, f"{section}_average")),
+                best=_float(getattr(summary, f"{section}_best")),
+            )
+            for section in SECTIONS
+        })
+
+    @staticmethod
+    async def refresh(user_id: int) -> UserScoreSummary:
+        """
+        Recalculate and store the summary of one user:
+        1. Aggregate the user's section scores (sees uncommitted rows of the current transaction).
+        2. Update or create the summary row.
+        """
+        # 1. Aggregate
+        scores = await ScoreAggregator.for_user(user_id)
+
+        # 2. Upsert
+        summary, _ = await UserScoreSummary.update_or_create(
+            defaults=ScoreSummaryService.to_fields(scores), user_id=user_id
+        )
+        return summary
+
+    @staticmethod
+    async def get(user_id: int) -> UserScoreSummary:
+        """
+        Get the summary of a user, building it on first access.
+        """
+        summary = await UserScoreSummary.get_or_none(user_id=user_id)
+        if summary is None:
+            summary = await ScoreSummaryService.refresh(user_id)
+        return summary
+
+    @staticmethod
+    async def get_scores(user_id: int) -> UserScores:
+        """
+        Get section scores of a user from the summary table.
+        """
+        return ScoreSummaryService.to_scores(await ScoreSummaryService.get(user_id))
+
+    @staticmethod
+    async def rebuild_all() -> int:
+        """
+        Rebuild every summary from the analysis tables (repair job):
+        1. Aggregate all users in one query.
+        2. Replace the summary table contents in a single transaction.
+        Returns the number of summaries written.
+        """
+        # 1. Aggregate
+        scores = await ScoreAggregator.for_users()
+
+        # 2. Replace
+        async with in_transaction():
+            await UserScoreSummary.all().delete()
+            await UserScoreSummary.bulk_create(
+                [
+                    UserScoreSummary(user_id=user_id, **ScoreSummaryService.to_fields(user_scores))
+                    for user_id, user_scores in scores.items()
+                ],
+                batch_size=500,
+            )
+        return len(scores)
@@ -2,19 +2,50 @@ from fastapi import HTTPException, status, Request
 from typing import List, Dict, Any
 from tortoise.transactions import in_transaction
 from datetime import datetime, timezone
-import random
-from tortoise.exceptions import FieldError
 
 from models.tests import (
     Listening,
     ListeningPart,
-    ListeningSection,
-    ListeningQuestion,
     ListeningSessionStatus,
     ListeningSession,
     ListeningAnswer,
 )
 from services.analyses import ListeningAnalyseService
+from .selection_service import test_selection
+from services.answer_key_cache import TEXT_QUESTION_TYPES, QuestionKey, answer_keys, normalize_text
+
+def grade_answer(question: QuestionKey, user_answer: Any) -> bool:
+    """
+    Check a user's answer against the answer key using the rules of its question type.
+    """
+    correct_answer = question.correct_answer
+    if question.type in TEXT_QUESTION_TYPES:
+        if isinstance(question.normalized_answer, list) and isinstance(user_answer, list):
+            return all(
+                normalize_text(a) == b
+                for a, b in zip(user_answer, question.normalized_answer)
+            )
+        return normalize_text(user_answer) == normalize_text(correct_answer)
+    if question.type == "choice":
+        return str(user_answer) == str(correct_answer[0])
+    if question.type == "multiple_answers":
+        return set(map(str, correct_answer)) == set(map(str, user_answer))
+    if question.type == "matching":
+        return user_answer == correct_answer
+    return str(user_answer) == str(correct_answer)
+
+
+def normalize_user_answer(user_answer: Any) -> Any:
+    """
+    Normalize a user's answer into a JSON value for storage.
+    """
+    if isinstance(user_answer, bool):
+        return None
+    if isinstance(user_answer, (int, float, list, dict)):
+        return user_answer
+    if isinstance(user_answer, str):
+        return [user_answer]
+    return None
 
 class ListeningService:
     """
@@ -26,39 +57,37 @@ class ListeningService:
         """
         Start a new listening session for a user by selecting a random test.
         """
-        # Get available tests
-        tests = await Listening.all().prefetch_related("parts__sections__questions")
-        if not tests:
+        # Pick a test (prefers tests the user has not taken)
+        test_id = await test_selection.pick_listening(user.id)
+        selected_test = await Listening.get_or_none(id=test_id) if test_id else None
+        if not selected_test:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=t.get("no_listening_tests", "No listening tests available")
             )
 
-        # Select random test and create session
-        selected_test = random.choice(tests)
+        # Create session
         session = await ListeningSession.create(
             user_id=user.id,
             exam_id=selected_test.id,
             start_time=datetime.now(timezone.utc),
             status=ListeningSessionStatus.STARTED.value,
         )
-
-        # Get test parts
-        parts = await ListeningPart.filter(listening_id=selected_test.id)
+        await test_selection.mark_listening_taken(user.id, selected_test.id)
 
         return {
             "session_id": session.id,
             "status": session.status,
             "start_time": session.start_time,
             "end_time": session.end_time,
-            "exam": selected_test,
-            "parts": parts,
+            "exam_id": selected_test.id,
         }
 
     @staticmethod
     async def get_session_data(session_id: int, user_id: int, t: dict) -> Dict[str, Any]:
         """
         Get detail of a listening session.
+        Test content is served from snapshots, so only the session row is read.
         """
         # Find session
         session = await ListeningSession.get_or_none(id=session_id, user_id=user_id)
@@ -67,34 +96,15 @@ class ListeningService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=t.get("session_not_found", "Session not found")
             )
-            
-        # Get test details
-        exam = await Listening.get(id=session.exam_id)
-        parts = await ListeningPart.filter(listening_id=exam.id)
-        
+
         return {
             "session_id": session.id,
             "status": session.status,
             "start_time": session.start_time,
             "end_time": session.end_time,
-            "exam": exam,
-            "parts": parts,
+            "exam_id": session.exam_id,
         }
 
-    @staticmethod
-    async def get_part(part_id: int, t: dict):
-        """
-        Get detail of a listening part.
-        """
-        # Find part
-        part = await ListeningPart.get_or_none(id=part_id)
-        if not part:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=t.get("listening_part_not_found", "Listening part not found")
-            )
-        return part
-
     @staticmethod
     async def submit_answers(
         session_id: int, user_id: int, answers: List[Any], t: dict
@@ -117,103 +127,37 @@ class ListeningService:
                 detail=t.get("session_already_completed_or_cancelled", "Session already completed or cancelled")
             )
 
-        total_score = 0
-        answered_question_ids = [answer.question_id for answer in answers]
-
-        # Process answers in a transaction
-        async with in_transaction():
-            # Process submitted answers
-            for answer in answers:
-                question = await ListeningQuestion.get_or_none(id=answer.question_id)
-                if not question:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=t.get("question_not_found", "Question {question_id} not found").format(question_id=answer.question_id)
-                    )
+        # Load answer key of the test (cached in-process)
+        answer_key = await answer_keys.listening(session.exam_id)
 
-                user_answer = answer.user_answer
+        # Grade submitted answers in memory
+        graded = {}
+        for answer in answers:
+            if answer.question_id not in answer_key:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=t.get("question_not_found", "Question {question_id} not found").format(question_id=answer.question_id)
+                )
+            is_correct = grade_answer(answer_key[answer.question_id], answer.user_answer)
+            graded[answer.question_id] = (normalize_user_answer(answer.user_answer), is_correct)
 
-                # Determine question type for checking answer
-                section = await ListeningSection.get(id=question.section_id)
-                q_type = section.question_type
+        # Build one record per question; unanswered ones are stored as wrong empty answers
+        records = []
+        for question in answer_key:
+            user_answer, is_correct = graded.get(question.id, ([], False))
+            records.append(ListeningAnswer(
+                session_id=session_id,
+                user_id=user_id,
+                question_id=question.id,
+                user_answer=user_answer,
+                is_correct=is_correct,
+                score=int(is_correct),
+            ))
+        total_score = sum(int(is_correct) for _, is_correct in graded.values())
 
-                # Check if answer is correct based on question type
-                if q_type in ["cloze_test", "form_completion", "sentence_completion"]:
-                    if isinstance(question.correct_answer, list) and isinstance(user_answer, list):
-                        is_correct = all(
-                            str(a).strip().lower() == str(b).strip().lower()
-                            for a, b in zip(user_answer, question.correct_answer)
-                        )
-                    else:
-                        is_correct = str(user_answer).strip().lower() == str(question.correct_answer).strip().lower()
-                elif q_type == "choice":
-                    is_correct = str(user_answer) == str(question.correct_answer[0])
-                elif q_type == "multiple_answers":
-                    is_correct = set(map(str, question.correct_answer)) == set(map(str, user_answer))
-                elif q_type == "matching":
-                    is_correct = user_answer == question.correct_answer
-                else:
-                    is_correct = str(user_answer) == str(question.correct_answer)
-
-                # Update total score
-                total_score += int(is_correct)
-
-                # Normalize user answer
-                ua = user_answer
-                if isinstance(ua, bool):
-                    norm_answer = None
-                elif isinstance(ua, (int, float)):
-                    norm_answer = ua
-                elif isinstance(ua, str):
-                    norm_answer = [ua]
-                elif isinstance(ua, (list, dict)):
-                    norm_answer = ua
-                else:
-                    norm_answer = None
-
-                # Create answer record
-                try:
-                    await ListeningAnswer.create(
-                        session_id=session_id,
-                        user_id=user_id,
-                        question_id=question.id,
-                        user_answer=norm_answer,
-                        is_correct=is_correct,
-                        score=int(is_correct),
-                    )
-                except FieldError:
-                    await ListeningAnswer.create(
-                        session_id=session_id,
-                        user_id=user_id,
-                        question_id=question.id,
-                        user_answer=None,
-                        is_correct=is_correct,
-                        score=int(is_correct),
-                    )
-
-            # Handle unanswered questions
-            all_questions = await ListeningQuestion.filter(section__part__listening_id=session.exam_id)
-            unanswered_questions = [q for q in all_questions if q.id not in answered_question_ids]
-
-            for question in unanswered_questions:
-                try:
-                    await ListeningAnswer.create(
-                        session_id=session_id,
-                        user_id=user_id,
-                        question_id=question.id,
-                        user_answer=[],
-                        is_correct=False,
-                        score=0,
-                    )
-                except FieldError:
-                    await ListeningAnswer.create(
-                        session_id=session_id,
-                        user_id=user_id,
-                        question_id=question.id,
-                        user_answer=None,
-                        is_correct=False,
-                        score=0,
-                    )
+        # Persist answers in a short transaction
+        async with in_transaction():
+            await ListeningAnswer.bulk_create(records)
 
             # Mark session as completed
             session.status = ListeningSessionStatus.COMPLETED.value
@@ -0,0 +1,130 @@
+import logging
+import random
+from typing import Optional
+from redis.asyncio import Redis
+
+from config import REDIS_URL
+from models.tests import Listening, ListeningSession
+from services.answer_key_cache import LISTENING, answer_keys
+
+logger = logging.getLogger(__name__)
+
+# Marks a "taken" set as loaded even when the user has no sessions yet
+_TAKEN_SENTINEL = "0"
+_POOL_TTL = 24 * 3600
+_TAKEN_TTL = 30 * 24 * 3600
+# Pool ids sampled per pick when looking for an unseen test
+_UNSEEN_SAMPLE = 16
+
+# KEYS[1] = pool, KEYS[2] = taken, ARGV[1] = sample size.
+# Returns a random pool id not in taken, or false when the sample had none.
+PICK_UNSEEN_SCRIPT = """
+local sample = redis.call('SRANDMEMBER', KEYS[1], tonumber(ARGV[1]))
+for _, id in ipairs(sample) do
+    if redis.call('SISMEMBER', KEYS[2], id) == 0 then
+        return id
+    end
+end
+return false
+"""
+
+
+class TestSelectionService:
+    """
+    Picks a random test id from a cached Redis set.
+
+    The pool key embeds the content version bumped by the admin, so edits
+    make every process rebuild the pool on the next pick. A per-user set of
+    taken test ids lets selection prefer tests the user has not seen.
+    """
+
+    def __init__(self, redis_url=REDIS_URL):
+        self.redis = Redis.from_url(redis_url, decode_responses=True)
+        self._pick_unseen = self.redis.register_script(PICK_UNSEEN_SCRIPT)
+
+    @staticmethod
+    def pool_key(kind: str, version: int) -> str:
+        return f"test_selection:{kind}:pool:{version}"
+
+    @staticmethod
+    def taken_key(kind: str, user_id: int) -> str:
+        return f"test_selection:{kind}:taken:{user_id}"
+
+    async def _listening_pool(self) -> Optional[str]:
+        """
+        Return the pool key of listening tests, rebuilding it if missing.
+        None means there are no tests.
+        """
+        version = await answer_keys.version(LISTENING)
+        key = self.pool_key(LISTENING, version or 0)
+        if await self.redis.exists(key):
+            return key
+
+        ids = await Listening.all().values_list("id", flat=True)
+        if not ids:
+            return None
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.sadd(key, *ids)
+        pipe.expire(key, _POOL_TTL)
+        await pipe.execute()
+        return key
+
+    async def _listening_taken(self, user_id: int) -> str:
+        """
+        Return the taken-tests key of a user, seeding it from sessions once.
+        """
+        key = self.taken_key(LISTENING, user_id)
+        if not await self.redis.exists(key):
+            exam_ids = await ListeningSession.filter(user_id=user_id).distinct().values_list("exam_id", flat=True)
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.sadd(key, _TAKEN_SENTINEL, *exam_ids)
+            pipe.expire(key, _TAKEN_TTL)
+            await pipe.execute()
+        return key
+
+    async def pick_listening(self, user_id: int, prefer_unseen: bool = True) -> Optional[int]:
+        """
+        Pick a listening test id:
+        1. Load (or rebuild) the cached id pool.
+        2. Prefer ids the user has not taken yet, sampled on the Redis server.
+        3. Fall back to any id from the pool.
+        Falls back to the database when Redis is unavailable.
+        """
+        try:
+            # 1. Pool
+            pool = await self._listening_pool()
+            if pool is None:
+                return None
+
+            # 2. Unseen tests first
+            if prefer_unseen:
+                taken = await self._listening_taken(user_id)
+                test_id = await self._pick_unseen(keys=[pool, taken], args=[_UNSEEN_SAMPLE])
+                if test_id is not None:
+                    return int(test_id)
+                # The sample was all taken: only then compute the full difference
+                unseen = await self.redis.sdiff(pool, taken)
+                if unseen:
+                    return int(random.choice(list(unseen)))
+
+            # 3. Any test
+            test_id = await self.redis.srandmember(pool)
+            return int(test_id) if test_id is not None else None
+        except Exception:
+            logger.exception("Test selection via Redis failed, using database")
+            ids = await Listening.all().values_list("id", flat=True)
+            return random.choice(ids) if ids else None
+
+    async def mark_listening_taken(self, user_id: int, test_id: int) -> None:
+        """
+        Remember that the user has taken a listening test.
+        """
+        try:
+            key = await self._listening_taken(user_id)
+            await self.redis.sadd(key, test_id)
+        except Exception:
+            logger.exception("Failed to mark listening test %s as taken", test_id)
+
+
+# Singleton instance for import
+test_selection = TestSelectionService()
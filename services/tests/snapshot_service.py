@@ -0,0 +1,75 @@
+import hashlib
+import logging
+from typing import Awaitable, Callable, NamedTuple, Optional
+from redis.asyncio import Redis
+
+from config import REDIS_URL
+from services.answer_key_cache import answer_keys
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_TTL = 7 * 24 * 3600
+
+
+class Snapshot(NamedTuple):
+    """Pre-serialized JSON body and its entity tag."""
+    body: bytes
+    etag: str
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+class SnapshotService:
+    """
+    Stores immutable, pre-serialized JSON snapshots of test content in Redis.
+
+    Snapshot keys embed the content version of their kind, so an admin edit
+    makes the next request build a fresh snapshot while old ones expire.
+    """
+
+    def __init__(self, redis_url=REDIS_URL):
+        self.redis = Redis.from_url(redis_url)
+
+    @staticmethod
+    def key(kind: str, version: int, name: str) -> str:
+        return f"snapshot:{kind}:{version}:{name}"
+
+    async def get_or_build(
+        self, kind: str, name: str, builder: Callable[[], Awaitable[Optional[bytes]]]
+    ) -> Optional[Snapshot]:
+        """
+        Return the snapshot `name` of a content kind:
+        1. Read it from Redis under the current content version.
+        2. On a miss, build it and store it (None from the builder means not found).
+        """
+        # 1. Cached snapshot
+        version = await answer_keys.version(kind)
+        key = self.key(kind, version or 0, name)
+        if version is not None:
+            try:
+                cached = await self.redis.hgetall(key)
+                if cached:
+                    return Snapshot(cached[b"body"], cached[b"etag"].decode())
+            except Exception:
+                logger.exception("Failed to read snapshot %s", key)
+
+        # 2. Build and store
+        body = await builder()
+        if body is None:
+            return None
+        snapshot = Snapshot(body, make_etag(body))
+        if version is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=True)
+                pipe.hset(key, mapping={"body": snapshot.body, "etag": snapshot.etag})
+                pipe.expire(key, _SNAPSHOT_TTL)
+                await pipe.execute()
+            except Exception:
+                logger.exception("Failed to store snapshot %s", key)
+        return snapshot
+
+
+# Singleton instance for import
+snapshots = SnapshotService()
@@ -1,12 +1,7 @@
 from fastapi import HTTPException, status, UploadFile
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 from tortoise.transactions import in_transaction
 from datetime import datetime, timezone
-import json
-import os
-from uuid import uuid4
-from pathlib import Path
-import aiofiles
 
 from models.tests import (
     Speaking,
@@ -16,14 +11,20 @@ from models.tests import (
     TestTypeEnum,
     SpeakingPart,
 )
-from services.analyses import SpeakingAnalyseService
-from services.chatgpt.speaking_integration import ChatGPTSpeakingIntegration
+from arq.connections import ArqRedis
+from models.analyses import SpeakingAnalyse
+from services.analyses.speaking_analyse_service import analyse_to_dict
+from services.analysis_event_service import analysis_events
+from services.analysis_job_service import (
+    SPEAKING,
+    AnalysisJobService,
+    AnalysisJobStatus,
+    analysis_job_id,
+)
+from services.audio import store_uploads
+from services.content_pool_service import ContentPoolService, generate_speaking_questions
 from utils.get_actual_price import get_user_actual_test_price
 from models import TokenTransaction, TransactionType, User
-from config import BASE_DIR
-
-MEDIA_ROOT = BASE_DIR / "media" / "user_audios"
-MEDIA_ROOT.mkdir(parents=True, exist_ok=True)
 
 PART_MAP = {
     "part1": SpeakingPart.PART_1.value,
@@ -31,22 +32,6 @@ PART_MAP = {
     "part3": SpeakingPart.PART_3.value,
 }
 
-async def save_upload_file_async(upload_file: UploadFile, folder: Path = MEDIA_ROOT) -> str:
-    """
-    Save uploaded audio file with unique name.
-    """
-    ext = os.path.splitext(upload_file.filename)[1]
-    filename = f"{uuid4().hex}{ext}"
-    file_path = folder / filename
-    async with aiofiles.open(file_path, "wb") as out_file:
-        while True:
-            chunk = await upload_file.read(1024 * 1024)
-            if not chunk:
-                break
-            await out_file.write(chunk)
-    await upload_file.seek(0)
-    return str(file_path.relative_to(BASE_DIR))
-
 class SpeakingService:
     """
     Service for managing speaking tests and sessions.
@@ -55,7 +40,8 @@ class SpeakingService:
     @staticmethod
     async def start_session(user, t: dict) -> Dict[str, Any]:
         """
-        Start a new speaking session with AI-generated questions.
+        Start a new speaking session with AI-generated questions
+        taken from the pre-generated content pool.
         """
         # Check if user has enough tokens
         price = await get_user_actual_test_price(user, TestTypeEnum.SPEAKING_ENG)
@@ -65,15 +51,21 @@ class SpeakingService:
                 detail=t.get("insufficient_tokens", "Insufficient tokens")
             )
 
-        # Generate questions using ChatGPT
-        chatgpt = ChatGPTSpeakingIntegration()
-        try:
-            questions_data = await chatgpt.generate_ielts_speaking_questions(user_id=user.id)
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=t.get("question_generation_failed", "Failed to generate questions")
-            )
+        # Take pre-generated questions from the pool (generate inline if it ran dry)
+        questions_data = await ContentPoolService.pop(TestTypeEnum.SPEAKING_ENG)
+        if questions_data is None:
+            try:
+                questions_data = await generate_speaking_questions()
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=t.get("question_parsing_failed", "Failed parsing questions")
+                )
+            except Exception:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=t.get("question_generation_failed", "Failed to generate questions")
+                )
 
         # Create session transaction
         async with in_transaction():
@@ -96,25 +88,15 @@ class SpeakingService:
             )
 
             # Create questions for each part
-            for part_key in ["part1", "part2", "part3"]:
-                q = questions_data.get(part_key)
-                if not q:
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=t.get("question_parsing_failed", "Failed parsing questions")
-                    )
-                content = q["question"]
-                if isinstance(content, str):
-                    try:
-                        content = json.loads(content)
-                    except Exception:
-                        content = [content]
-                await SpeakingQuestion.create(
-                    speaking=session,
+            await SpeakingQuestion.bulk_create([
+                SpeakingQuestion(
+                    speaking_id=session.id,
                     part=PART_MAP[part_key],
                     title=q["title"],
-                    content=content,
+                    content=q["question"],
                 )
+                for part_key, q in questions_data.items()
+            ])
 
         return await SpeakingService.get_session(session.id, user.id, t)
 
@@ -160,10 +142,12 @@ class SpeakingService:
 
     @staticmethod
     async def submit_answers(
-        session_id: int, user_id: int, audio_files: Dict[str, Optional[UploadFile]], t: dict, lang_code: str = "en"
+        session_id: int, user_id: int, audio_files: Dict[str, Optional[UploadFile]], t: dict,
+        redis: ArqRedis, lang_code: str = "en"
     ) -> Dict[str, Any]:
         """
-        Submit audio answers and perform analysis.
+        Store audio answers, complete the session and enqueue its analysis.
+        Transcription and scoring run in the `analyse_speaking` job.
         """
         # Validate session exists
         session = await Speaking.get_or_none(id=session_id, user_id=user_id)
@@ -189,58 +173,45 @@ class SpeakingService:
             )
 
         part_map = {q.part: q for q in questions}
-        chatgpt = ChatGPTSpeakingIntegration()
 
-        # Process audio files and save answers
-        async with in_transaction():
-            # Part 1 is required
-            if not audio_files.get("part1"):
+        # Part 1 is required
+        if not audio_files.get("part1"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=t.get("part1_audio_required", "Part 1 audio is required")
+            )
+
+        uploads = {}
+        for part_key in ["part1", "part2", "part3"]:
+            audio = audio_files.get(part_key)
+            if not audio:
+                continue
+            if not part_map.get(PART_MAP[part_key]):
                 raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=t.get("part1_audio_required", "Part 1 audio is required")
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=t.get("question_not_found", f"Question for {part_key} not found")
                 )
-                
-            answers = {}
-            for part_key in ["part1", "part2", "part3"]:
-                audio = audio_files.get(part_key)
-                if not audio:
-                    continue
-                    
-                question = part_map.get(PART_MAP[part_key])
-                if not question:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=t.get("question_not_found", f"Question for {part_key} not found")
-                    )
-                    
-                # Save audio and transcribe
-                audio_path = await save_upload_file_async(audio)
-                text = await chatgpt.transcribe_audio_file_async(audio)
-                
-                # Save answer
-                answer = await SpeakingAnswer.create(
-                    question=question,
-                    audio_answer=audio_path,
-                    text_answer=text,
-                )
-                answers[part_key] = answer
+            uploads[part_key] = audio
+
+        # Stream all uploads to disk at once
+        stored = await store_uploads(uploads)
+        answers = [
+            SpeakingAnswer(question=part_map[PART_MAP[part_key]], audio_answer=audio.path)
+            for part_key, audio in stored.items()
+        ]
 
-            # Mark session as completed
+        # Save answers and mark session as completed
+        async with in_transaction():
+            await SpeakingAnswer.bulk_create(answers)
             session.status = SpeakingStatus.COMPLETED.value
             session.end_time = datetime.now(timezone.utc)
             await session.save(update_fields=["status", "end_time"])
 
-            # Get analysis
-            analyse = await SpeakingAnalyseService.analyse(session.id, lang_code=lang_code, t=t)
-            if not analyse:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=t.get("analysis_not_found", "Failed to generate analysis")
-                )
-
+        # Analyse in the background
+        job = await AnalysisJobService.enqueue(redis, SPEAKING, session.id, lang_code, t)
         return {
             "message": t.get("answers_submitted", "Answers submitted successfully"),
-            "analysis": analyse,
+            **job,
         }
 
     @staticmethod
@@ -294,9 +265,13 @@ class SpeakingService:
         return {"message": t.get("session_restarted", "Session restarted")}
     
     @staticmethod
-    async def get_analysis(session_id: int, user_id: int, t: dict, request=None) -> Dict[str, Any]:
+    async def get_analysis(
+        session_id: int, user_id: int, t: dict, redis: ArqRedis, lang_code: str = "en"
+    ) -> Dict[str, Any]:
         """
-        Get analysis for a completed session.
+        Get the stored analysis of a completed session.
+        If it is not ready yet, make sure the analysis job is enqueued and report its status
+        (the response has no "analysis" key in that case).
         """
         session = await Speaking.get_or_none(id=session_id, user_id=user_id)
         if not session:
@@ -309,29 +284,51 @@ class SpeakingService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=t.get("session_not_completed", "Session not completed")
             )
-        lang_code = "en"
-        if request:
-            lang_code = request.headers.get("Accept-Language", "en").split(",")[0].lower()
-        analyse = await SpeakingAnalyseService.analyse(session.id, lang_code=lang_code, t=t)
-        
-        return {
-            "analysis": {
-                "feedback": analyse["feedback"],
-                "overall_band_score": analyse["overall_band_score"],
-                
-                "fluency_and_coherence_score": analyse["fluency_and_coherence_score"],
-                "fluency_and_coherence_feedback": analyse["fluency_and_coherence_feedback"],
-                
-                "lexical_resource_score": analyse["lexical_resource_score"],
-                "lexical_resource_feedback": analyse["lexical_resource_feedback"],
-                
-                "grammatical_range_and_accuracy_score": analyse["grammatical_range_and_accuracy_score"],
-                "grammatical_range_and_accuracy_feedback": analyse["grammatical_range_and_accuracy_feedback"],
-                
-                "pronunciation_score": analyse["pronunciation_score"],
-                "pronunciation_feedback": analyse["pronunciation_feedback"],
-                
-                "timing": analyse["timing"],
+
+        analyse = await SpeakingAnalyse.get_or_none(speaking_id=session.id)
+        if analyse is None:
+            job = await AnalysisJobService.enqueue(redis, SPEAKING, session.id, lang_code, t)
+            return {
+                "message": t.get("analysis_started", "Analysis started"),
+                **job,
             }
-        }
 
+        return {"analysis": analyse_to_dict(analyse)}
+
+    @staticmethod
+    async def get_analysis_status(session_id: int, user_id: int, t: dict, redis: ArqRedis) -> Dict[str, Any]:
+        """
+        Report the progress of a session's analysis job: queued/running/done/failed.
+        """
+        session = await Speaking.get_or_none(id=session_id, user_id=user_id)
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=t.get("session_not_found", "Session not found")
+            )
+        if await SpeakingAnalyse.exists(speaking_id=session.id):
+            return {"job_id": analysis_job_id(SPEAKING, session.id), "status": AnalysisJobStatus.DONE.value}
+        return await AnalysisJobService.get_status(redis, SPEAKING, session.id)
+
+    @staticmethod
+    async def stream_analysis_events(
+        session_id: int, user_id: int, t: dict, redis: ArqRedis
+    ) -> AsyncIterator[str]:
+        """
+        Server-Sent Events of a session's analysis progress, ending once the result is saved.
+        """
+        session = await Speaking.get_or_none(id=session_id, user_id=user_id)
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=t.get("session_not_found", "Session not found")
+            )
+
+        async def load_result():
+            analyse = await SpeakingAnalyse.get_or_none(speaking_id=session.id)
+            return analyse_to_dict(analyse) if analyse else None
+
+        async def job_pending():
+            return await AnalysisJobService.is_pending(redis, SPEAKING, session.id)
+
+        return analysis_events.stream(SPEAKING, session.id, load_result, job_pending)
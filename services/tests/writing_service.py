@@ -1,5 +1,6 @@
+import asyncio
 from fastapi import HTTPException, status
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 from tortoise.transactions import in_transaction
 from datetime import datetime, timezone
 
@@ -10,8 +11,18 @@ from models.tests import (
     WritingStatus,
     TestTypeEnum,
 )
-from services.analyses.writing_analyse_service import WritingAnalyseService
+from arq.connections import ArqRedis
+from models.analyses import WritingAnalyse
+from services.analyses.writing_analyse_service import analyse_to_dict
+from services.analysis_event_service import analysis_events
+from services.analysis_job_service import (
+    WRITING,
+    AnalysisJobService,
+    AnalysisJobStatus,
+    analysis_job_id,
+)
 from services.chatgpt.writing_integration import ChatGPTWritingIntegration
+from services.chart_service import CHART_TYPES, chart_service
 from utils.get_actual_price import get_user_actual_test_price
 from models import TokenTransaction, TransactionType, User
 
@@ -23,53 +34,39 @@ class WritingService:
     @staticmethod
     async def start_session(user, t: dict) -> Dict[str, Any]:
         """
-        Start a new writing session for a user with questions and diagrams.
+        Start a new writing session for a user with questions and diagrams:
+        1. Check the price against the user's balance (nothing is deducted yet).
+        2. Generate both questions and render the Task 1 diagram concurrently.
+        3. Deduct tokens and create the session in one transaction, once everything is ready.
         """
-        # Check if user has enough tokens
+        # 1. Check if user has enough tokens
         price = await get_user_actual_test_price(user, TestTypeEnum.WRITING_ENG)
+        if price is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=t.get("test_type_not_found", "Test type not found")
+            )
         if user.tokens < price:
             raise HTTPException(
                 status_code=status.HTTP_402_PAYMENT_REQUIRED,
                 detail=t.get("insufficient_tokens", "Insufficient tokens")
             )
 
-        # Generate questions using ChatGPT
-        chatgpt = ChatGPTWritingIntegration()
-        part1_data = await chatgpt.generate_writing_part1_question(user_id=user.id)
-        part2_data = await chatgpt.generate_writing_part2_question(user_id=user.id)
-
-        # Extract part 1 data
-        part1_question = part1_data["question"]
-        chart_type = part1_data["chart_type"]
-        categories = part1_data["categories"]
-        year1 = part1_data["year1"]
-        year2 = part1_data["year2"]
-        data_year1 = part1_data["data_year1"]
-        data_year2 = part1_data["data_year2"]
-
-        # Validate chart type
-        if chart_type not in ["bar", "line", "pie"]:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=t.get("unknown_chart_type", "Unknown chart type")
-            )
+        # 2. Generate content (a failure cancels the other steps)
+        content = await WritingService.generate_content(user.id, t)
 
-        # Generate diagram
-        if chart_type == "bar":
-            diagram_path = chatgpt.create_bar_chart(categories, year1, year2, data_year1, data_year2)
-        elif chart_type == "line":
-            diagram_path = chatgpt.create_line_chart(categories, year1, year2, data_year1, data_year2)
-        elif chart_type == "pie":
-            diagram_path = chatgpt.create_pie_chart(categories, year1, year2, data_year1, data_year2)
-        diagram_path = diagram_path.replace("media/", "")
-
-        part2_question = part2_data["question"]
-
-        # Create test session transaction
+        # 3. Create test session transaction
         async with in_transaction():
-            # Deduct tokens
-            user.tokens -= price
-            await user.save()
+            # Deduct tokens (re-read under lock: the balance may have changed during generation)
+            locked = await User.select_for_update().get(id=user.id)
+            if locked.tokens < price:
+                raise HTTPException(
+                    status_code=status.HTTP_402_PAYMENT_REQUIRED,
+                    detail=t.get("insufficient_tokens", "Insufficient tokens")
+                )
+            locked.tokens -= price
+            await locked.save(update_fields=["tokens"])
+            user.tokens = locked.tokens
             await TokenTransaction.create(
                 user_id=user.id,
                 transaction_type=TransactionType.TEST_WRITING,
@@ -86,28 +83,62 @@ class WritingService:
             )
 
             # Create writing parts
-            diagram_data = {
-                "categories": categories,
-                "year1": year1,
-                "year2": year2,
-                "data_year1": data_year1,
-                "data_year2": data_year2,
-            }
             await WritingPart1.create(
                 writing=writing,
-                content=part1_question,
-                diagram=diagram_path,
-                diagram_data=diagram_data,
+                content=content["part1_question"],
+                diagram=content["diagram"],
+                diagram_data=content["diagram_data"],
                 answer="",
             )
             await WritingPart2.create(
                 writing=writing,
-                content=part2_question,
+                content=content["part2_question"],
                 answer="",
             )
 
         return await WritingService.get_session(writing.id, user.id, t)
 
+    @staticmethod
+    async def generate_content(user_id: int, t: dict) -> Dict[str, Any]:
+        """
+        Questions and diagram of a new session, produced as two concurrent branches:
+        - Task 1: generate the question and chart data, then render the diagram;
+        - Task 2: generate the question.
+        If either branch fails the other is cancelled and the first error is raised.
+        """
+        chatgpt = ChatGPTWritingIntegration()
+
+        async def part1() -> Dict[str, Any]:
+            data = await chatgpt.generate_writing_part1_question(user_id=user_id)
+
+            # Validate chart type
+            chart_type = data["chart_type"]
+            if chart_type not in CHART_TYPES:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=t.get("unknown_chart_type", "Unknown chart type")
+                )
+
+            # Render diagram off the event loop (reused when the same data was rendered before)
+            diagram_data = {
+                "categories": data["categories"],
+                "year1": data["year1"],
+                "year2": data["year2"],
+                "data_year1": data["data_year1"],
+                "data_year2": data["data_year2"],
+            }
+            diagram = await chart_service.render(chart_type, diagram_data)
+            return {"part1_question": data["question"], "diagram": diagram, "diagram_data": diagram_data}
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                part1_task = group.create_task(part1())
+                part2_task = group.create_task(chatgpt.generate_writing_part2_question(user_id=user_id))
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+
+        return {**part1_task.result(), "part2_question": part2_task.result()["question"]}
+
     @staticmethod
     async def get_session(session_id: int, user_id: int, t: dict) -> "Writing":
         """
@@ -123,10 +154,11 @@ class WritingService:
 
     @staticmethod
     async def submit_answers(
-        session_id: int, user_id: int, part1_answer: str, part2_answer: str, t: dict, lang_code: str = "en"
+        session_id: int, user_id: int, part1_answer: str, part2_answer: str, t: dict,
+        redis: ArqRedis, lang_code: str = "en"
     ) -> Dict[str, Any]:
         """
-        Submit answers and perform analysis.
+        Save answers, complete the session and enqueue its analysis (the `analyse_writing` job).
         """
         # Validate session exists
         writing = await Writing.get_or_none(id=session_id, user_id=user_id).prefetch_related("part1", "part2")
@@ -156,39 +188,11 @@ class WritingService:
             writing.end_time = datetime.now(timezone.utc)
             await writing.save(update_fields=["status", "end_time"])
 
-        # Get analysis
-        writing_analyse = await WritingAnalyseService.analyse(writing.id, lang_code=lang_code, t=t)
-
-        # Return results
+        # Analyse in the background
+        job = await AnalysisJobService.enqueue(redis, WRITING, writing.id, lang_code, t)
         return {
             "message": t.get("answers_submitted", "Answers submitted successfully"),
-            "analysis": {
-                "task_achievement_feedback": writing_analyse.task_achievement_feedback,
-                "task_achievement_score": float(writing_analyse.task_achievement_score) 
-                    if writing_analyse.task_achievement_score is not None else None,
-                
-                "lexical_resource_feedback": writing_analyse.lexical_resource_feedback,
-                "lexical_resource_score": float(writing_analyse.lexical_resource_score) 
-                    if writing_analyse.lexical_resource_score is not None else None,
-                
-                "coherence_and_cohesion_feedback": writing_analyse.coherence_and_cohesion_feedback,
-                "coherence_and_cohesion_score": float(writing_analyse.coherence_and_cohesion_score) 
-                    if writing_analyse.coherence_and_cohesion_score is not None else None,
-                
-                "grammatical_range_and_accuracy_feedback": writing_analyse.grammatical_range_and_accuracy_feedback,
-                "grammatical_range_and_accuracy_score": float(writing_analyse.grammatical_range_and_accuracy_score) 
-                    if writing_analyse.grammatical_range_and_accuracy_score is not None else None,
-                
-                "word_count_feedback": writing_analyse.word_count_feedback,
-                "word_count_score": float(writing_analyse.word_count_score) 
-                    if writing_analyse.word_count_score is not None else None,
-                
-                "overall_band_score": float(writing_analyse.overall_band_score) 
-                    if writing_analyse.overall_band_score is not None else None,
-                
-                "total_feedback": writing_analyse.total_feedback,
-                "timing": writing_analyse.duration.total_seconds() if writing_analyse.duration else None,
-            },
+            **job,
         }
 
     @staticmethod
@@ -249,9 +253,13 @@ class WritingService:
         return {"message": t.get("session_restarted", "Session restarted")}
 
     @staticmethod
-    async def get_analysis(session_id: int, user_id: int, t: dict, request=None) -> Dict[str, Any]:
+    async def get_analysis(
+        session_id: int, user_id: int, t: dict, redis: ArqRedis, lang_code: str = "en"
+    ) -> Dict[str, Any]:
         """
-        Get analysis for a completed session.
+        Get the stored analysis of a completed session.
+        If it is not ready yet, make sure the analysis job is enqueued and report its status
+        (the response has no "analysis" key in that case).
         """
         writing = await Writing.get_or_none(id=session_id, user_id=user_id)
         if not writing:
@@ -264,38 +272,51 @@ class WritingService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=t.get("session_not_completed", "Session not completed")
             )
-        
-        lang_code = "en"
-        if request:
-            lang_code = request.headers.get("Accept-Language", "en").split(",")[0].lower()
-        analyse = await WritingAnalyseService.analyse(writing.id, lang_code=lang_code, t=t)
-        
-        return {
-            "analysis": {
-                "task_achievement_feedback": analyse.task_achievement_feedback,
-                "task_achievement_score": float(analyse.task_achievement_score) 
-                    if analyse.task_achievement_score is not None else None,
-                
-                "lexical_resource_feedback": analyse.lexical_resource_feedback,
-                "lexical_resource_score": float(analyse.lexical_resource_score) 
-                    if analyse.lexical_resource_score is not None else None,
-                
-                "coherence_and_cohesion_feedback": analyse.coherence_and_cohesion_feedback,
-                "coherence_and_cohesion_score": float(analyse.coherence_and_cohesion_score) 
-                    if analyse.coherence_and_cohesion_score is not None else None,
-                
-                "grammatical_range_and_accuracy_feedback": analyse.grammatical_range_and_accuracy_feedback,
-                "grammatical_range_and_accuracy_score": float(analyse.grammatical_range_and_accuracy_score) 
-                    if analyse.grammatical_range_and_accuracy_score is not None else None,
-                
-                "word_count_feedback": analyse.word_count_feedback,
-                "word_count_score": float(analyse.word_count_score) 
-                    if analyse.word_count_score is not None else None,
-                
-                "overall_band_score": float(analyse.overall_band_score) 
-                    if analyse.overall_band_score is not None else None,
-                
-                "total_feedback": analyse.total_feedback,
-                "timing": analyse.duration.total_seconds() if analyse.duration else None,
+
+        analyse = await WritingAnalyse.get_or_none(writing_id=writing.id)
+        if analyse is None:
+            job = await AnalysisJobService.enqueue(redis, WRITING, writing.id, lang_code, t)
+            return {
+                "message": t.get("analysis_started", "Analysis started"),
+                **job,
             }
-        }
+
+        return {"analysis": analyse_to_dict(analyse)}
+
+    @staticmethod
+    async def get_analysis_status(session_id: int, user_id: int, t: dict, redis: ArqRedis) -> Dict[str, Any]:
+        """
+        Report the progress of a session's analysis job: queued/running/done/failed.
+        """
+        writing = await Writing.get_or_none(id=session_id, user_id=user_id)
+        if not writing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=t.get("session_not_found", "Session not found")
+            )
+        if await WritingAnalyse.exists(writing_id=writing.id):
+            return {"job_id": analysis_job_id(WRITING, writing.id), "status": AnalysisJobStatus.DONE.value}
+        return await AnalysisJobService.get_status(redis, WRITING, writing.id)
+
+    @staticmethod
+    async def stream_analysis_events(
+        session_id: int, user_id: int, t: dict, redis: ArqRedis
+    ) -> AsyncIterator[str]:
+        """
+        Server-Sent Events of a session's analysis progress, ending once the result is saved.
+        """
+        writing = await Writing.get_or_none(id=session_id, user_id=user_id)
+        if not writing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=t.get("session_not_found", "Session not found")
+            )
+
+        async def load_result():
+            analyse = await WritingAnalyse.get_or_none(writing_id=writing.id)
+            return analyse_to_dict(analyse) if analyse else None
+
+        async def job_pending():
+            return await AnalysisJobService.is_pending(redis, WRITING, writing.id)
+
+        return analysis_events.stream(WRITING, writing.id, load_result, job_pending)
@@ -2,12 +2,11 @@ import asyncio
 from fastapi import HTTPException
 from random import randint
 from datetime import datetime, timezone, timedelta
-from arq import create_pool
 from arq.connections import RedisSettings
 
 from services.users import UserService
 from models.users import VerificationCode, VerificationType, User
-from utils.arq_pool import get_redis_settings
+from utils.arq_pool import get_arq_redis
 
 CODE_TTL = timedelta(minutes=10)
 
@@ -156,8 +155,7 @@ class VerificationService:
 """
 
         # 7. Enqueue email
-        redis_settings = get_redis_settings()
-        redis = await create_pool(redis_settings)
+        redis = await get_arq_redis()
         await redis.enqueue_job(
             "send_email",
             subject=subject,
@@ -165,7 +163,6 @@ class VerificationService:
             body=body,
             html_body=html_body
         )
-        await redis.close()
 
         # 8. Persist code record
         now = datetime.now(timezone.utc)
@@ -1,5 +1,6 @@
 import asyncio
 from datetime import datetime, timezone
+from arq import Retry, cron
 from arq.connections import RedisSettings
 
 from services.analyses import (
@@ -9,6 +10,12 @@ from services.analyses import (
     WritingAnalyseService,
 )
 from services.users.email_service import EmailService
+from services.leaderboard_service import leaderboard
+from services.score_summary_service import ScoreSummaryService
+from services.content_pool_service import ContentPoolService
+from services.analysis_event_service import FAILED, analysis_events
+from services.analysis_job_service import SPEAKING, WRITING
+from services.audio import TranscriptionIncomplete, audio_normalizer
 from models import User, UserActivityLog, Payment, Tariff, TokenTransaction, Message
 
 from tortoise import Tortoise
@@ -40,6 +47,10 @@ async def ensure_tortoise():
 
 # === Analysis Tasks ===
 
+# Tries of a speaking analysis before missing transcripts are accepted as empty answers
+MAX_TRANSCRIPTION_TRIES = 3
+
+
 async def analyse_listening(ctx, session_id: int):
     await ensure_tortoise()
     await ListeningAnalyseService.analyse(session_id)
@@ -52,12 +63,48 @@ async def analyse_reading(ctx, reading_id: int, user_id: int):
 
 async def analyse_speaking(ctx, test_id: int, lang_code: str, t: dict):
     await ensure_tortoise()
-    await SpeakingAnalyseService.analyse(test_id, lang_code=lang_code, t=t)
+    job_try = ctx.get("job_try", 1)
+    try:
+        # On the last try, analyse whatever parts could be transcribed
+        await SpeakingAnalyseService.analyse(
+            test_id, lang_code=lang_code, t=t, allow_partial=job_try >= MAX_TRANSCRIPTION_TRIES
+        )
+    except TranscriptionIncomplete:
+        # Transcripts that succeeded are saved; only the failed parts are retried
+        raise Retry(defer=job_try * 10)
+    except Exception as e:
+        await analysis_events.publish(SPEAKING, test_id, FAILED, {"detail": getattr(e, "detail", str(e))})
+        raise
 
 
 async def analyse_writing(ctx, test_id: int, lang_code: str, t: dict):
     await ensure_tortoise()
-    await WritingAnalyseService.analyse(test_id, lang_code=lang_code, t=t)
+    try:
+        await WritingAnalyseService.analyse(test_id, lang_code=lang_code, t=t)
+    except Exception as e:
+        await analysis_events.publish(WRITING, test_id, FAILED, {"detail": getattr(e, "detail", str(e))})
+        raise
+
+
+# === Leaderboard Tasks ===
+
+async def rebuild_leaderboard(ctx):
+    await ensure_tortoise()
+    await leaderboard.rebuild()
+
+
+# === Score Summary Tasks ===
+
+async def rebuild_score_summaries(ctx):
+    await ensure_tortoise()
+    await ScoreSummaryService.rebuild_all()
+
+
+# === Content Pool Tasks ===
+
+async def refill_content_pool(ctx):
+    await ensure_tortoise()
+    await ContentPoolService.refill()
 
 
 # === Email Tasks ===
@@ -146,6 +193,55 @@ async def give_daily_tariff_bonus(ctx):
         )
 
 
+# === Worker lifecycle (ARQ on_startup / on_shutdown hooks) ===
+
+async def startup(ctx):
+    from config import DATABASE_URL
+
+    try:
+        # === Redis check (ctx["redis"] is the worker's own ARQ pool) ===
+        await ctx["redis"].ping()
+        print("✅ Redis connected")
+
+        # === Tortoise initialization ===
+        await Tortoise.init(
+            db_url=DATABASE_URL,
+            modules={
+                "models": [
+                    "models.users.users",
+                    "models.users.verification_codes",
+                    "models.tests.listening",
+                    "models.tests.reading",
+                    "models.tests.speaking",
+                    "models.tests.writing",
+                    "models.tests.test_type",
+                    "models.tests.content_pool",
+                    "models.analyses",
+                    "models.payments",
+                    "models.tariffs",
+                    "models.transactions",
+                    "models.notifications",
+                    "models.comments",
+                    "aerich.models"
+                ]
+            }
+        )
+        print("✅ Tortoise ORM initialized")
+
+    except Exception as e:
+        print(f"❌ Startup error: {e}")
+        raise
+
+async def shutdown(ctx):
+    # The ARQ pool in ctx["redis"] is closed by the worker itself
+    try:
+        await Tortoise.close_connections()
+        audio_normalizer.shutdown()
+        print("🛑 Connections closed")
+    except Exception as e:
+        print(f"❌ Shutdown error: {e}")
+
+
 # === ARQ Worker Configuration ===
 
 class WorkerSettings:
@@ -155,54 +251,16 @@ class WorkerSettings:
         analyse_reading,
         analyse_speaking,
         analyse_writing,
+        rebuild_leaderboard,
+        rebuild_score_summaries,
+        refill_content_pool,
         send_email,
         log_user_activity,
         check_expired_tariffs,
         give_daily_tariff_bonus,
     ]
-
-    async def startup(self, ctx):
-        from redis.asyncio import Redis
-        from config import DATABASE_URL, REDIS_URL
-
-        try:
-            # === Redis initialization ===
-            ctx["redis"] = Redis.from_url(REDIS_URL, decode_responses=True)
-            await ctx["redis"].ping()
-            print("✅ Redis connected")
-
-            # === Tortoise initialization ===
-            await Tortoise.init(
-                db_url=DATABASE_URL,
-                modules={
-                    "models": [
-                        "models.users.users",
-                        "models.users.verification_codes",
-                        "models.tests.listening",
-                        "models.tests.reading",
-                        "models.tests.speaking",
-                        "models.tests.writing",
-                        "models.tests.test_type",
-                        "models.analyses",
-                        "models.payments",
-                        "models.tariffs",
-                        "models.transactions",
-                        "models.notifications",
-                        "models.comments",
-                        "aerich.models"
-                    ]
-                }
-            )
-            print("✅ Tortoise ORM initialized")
-
-        except Exception as e:
-            print(f"❌ Startup error: {e}")
-            raise
-
-    async def shutdown(self, ctx):
-        try:
-            await ctx["redis"].close()
-            await Tortoise.close_connections()
-            print("🛑 Connections closed")
-        except Exception as e:
-            print(f"❌ Shutdown error: {e}")
+    cron_jobs = [
+        cron(refill_content_pool, second=0, unique=True),
+    ]
+    on_startup = startup
+    on_shutdown = shutdown
@@ -1,6 +1,12 @@
+import asyncio
 from functools import lru_cache
+from typing import Optional
 from arq import create_pool
-from arq.connections import RedisSettings
+from arq.connections import ArqRedis, RedisSettings
+
+# Process-wide ARQ pool, opened at startup and closed at shutdown
+_pool: Optional[ArqRedis] = None
+_pool_lock = asyncio.Lock()
 
 @lru_cache()
 def get_redis_settings() -> RedisSettings:
@@ -9,9 +15,30 @@ def get_redis_settings() -> RedisSettings:
     """
     return RedisSettings(host="localhost", port=6379)
 
-async def get_arq_redis():
+async def open_arq_pool() -> ArqRedis:
+    """
+    Creates the shared ARQ connection pool (once).
+    """
+    global _pool
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await create_pool(get_redis_settings())
+    return _pool
+
+async def close_arq_pool() -> None:
+    """
+    Closes the shared ARQ connection pool.
+    """
+    global _pool
+    async with _pool_lock:
+        if _pool is not None:
+            await _pool.aclose()
+            _pool = None
+
+async def get_arq_redis() -> ArqRedis:
     """
-    Creates Redis connection pool for ARQ.
+    Returns the shared ARQ connection pool, created on first use outside the app lifecycle.
     """
-    settings = get_redis_settings()
-    return await create_pool(settings)
+    if _pool is not None:
+        return _pool
+    return await open_arq_pool()
@@ -1,5 +1,5 @@
-from models.analyses import ListeningAnalyse, SpeakingAnalyse, WritingAnalyse
-from models.tests import Reading
+from typing import Dict, Iterable
+from utils.score_aggregation import ScoreAggregator
 
 class IELTSScoreCalculator:
     """
@@ -19,17 +19,25 @@ class IELTSScoreCalculator:
         """
         Calculates overall IELTS score from all test components.
         """
-        listening = await ListeningAnalyse.filter(user_id=user.id).all()
-        listening_avg = await cls.get_average_score(listening, "overall_score")
+        return await cls.calculate_by_user_id(user.id)
 
-        speaking = await SpeakingAnalyse.filter(speaking__user_id=user.id).all()
-        speaking_avg = await cls.get_average_score(speaking, "overall_band_score")
-
-        writing = await WritingAnalyse.filter(writing__user_id=user.id).all()
-        writing_avg = await cls.get_average_score(writing, "overall_band_score")
-
-        reading = await Reading.filter(user_id=user.id).all()
-        reading_avg = await cls.get_average_score(reading, "score")
+    @classmethod
+    async def calculate_by_user_id(cls, user_id: int) -> float:
+        """
+        Calculates overall IELTS score for a user id without loading the user.
+        """
+        scores = await ScoreAggregator.for_user(user_id)
+        return scores.overall_average()
 
-        total_score = (listening_avg + speaking_avg + writing_avg + reading_avg) / 4
-        return round(total_score * 2) / 2
\ No newline at end of file
+    @classmethod
+    async def calculate_many(cls, user_ids: Iterable[int]) -> Dict[int, float]:
+        """
+        Calculates overall IELTS scores for a batch of users in one query.
+        Users without any test get 0.
+        """
+        user_ids = list(user_ids)
+        scores = await ScoreAggregator.for_users(user_ids)
+        return {
+            user_id: scores[user_id].overall_average() if user_id in scores else 0.0
+            for user_id in user_ids
+        }
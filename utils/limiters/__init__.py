@@ -1,26 +1,42 @@
 from datetime import timedelta
 from .base_limiter import AsyncLimiter, EmailUpdateLimiter
+from .engine import (
+    LimitResult,
+    LimiterEngine,
+    FixedWindowEngine,
+    SlidingLogEngine,
+    TokenBucketEngine,
+)
+from .middleware import RateLimitMiddleware, RoutePolicy, Quota
 
 def get_login_limiter(redis_client):
     """
-    Creates login limiter: 5 attempts per 15 minutes.
+    Creates login limiter: 5 attempts in any 15 minutes (sliding log).
     """
-    return AsyncLimiter(redis_client, prefix="login", max_attempts=5, period=timedelta(minutes=15))
+    return AsyncLimiter(
+        redis_client, prefix="login", max_attempts=5, period=timedelta(minutes=15), strategy="sliding_log"
+    )
 
 def get_register_limiter(redis_client):
     """
-    Creates registration limiter: 5 attempts per 10 minutes.
+    Creates registration limiter: 5 attempts per 10 minutes (fixed window).
     """
-    return AsyncLimiter(redis_client, prefix="register", max_attempts=5, period=timedelta(minutes=10))
+    return AsyncLimiter(
+        redis_client, prefix="register", max_attempts=5, period=timedelta(minutes=10), strategy="fixed_window"
+    )
 
 def get_resend_limiter(redis_client):
     """
-    Creates OTP resend limiter: 5 attempts per 5 minutes.
+    Creates OTP resend limiter: bursts of 5, refilled at 5 per 5 minutes (token bucket).
     """
-    return AsyncLimiter(redis_client, prefix="resend", max_attempts=5, period=timedelta(minutes=5))
+    return AsyncLimiter(
+        redis_client, prefix="resend", max_attempts=5, period=timedelta(minutes=5), strategy="token_bucket"
+    )
 
 def get_forget_password_limiter(redis_client):
     """
-    Creates password reset limiter: 5 attempts per 15 minutes.
+    Creates password reset limiter: 5 attempts in any 15 minutes (sliding log).
     """
-    return AsyncLimiter(redis_client, prefix="forget_password", max_attempts=5, period=timedelta(minutes=15))
\ No newline at end of file
+    return AsyncLimiter(
+        redis_client, prefix="forget_password", max_attempts=5, period=timedelta(minutes=15), strategy="sliding_log"
+    )
\ No newline at end of file
@@ -1,51 +1,66 @@
 import redis.asyncio as redis
 from datetime import timedelta, datetime, timezone
 
+from .engine import ENGINES, LimitResult
+
 class AsyncLimiter:
     """
     Implements rate limiting using Redis backend.
+
+    Every call is a single atomic Lua script (see `engine`), so concurrent
+    attempts can never push a counter past `max_attempts`.
     """
 
-    def __init__(self, redis_client: redis.Redis, prefix: str, max_attempts: int, period: timedelta):
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        prefix: str,
+        max_attempts: int,
+        period: timedelta,
+        strategy: str = "fixed_window",
+    ):
         self.redis = redis_client
         self.prefix = prefix
         self.max_attempts = max_attempts
         self.period = period
+        self.strategy = strategy
+        self.engine = ENGINES[strategy](redis_client, max_attempts, period)
 
     def get_key(self, identifier: str) -> str:
         """
-        Generates Redis key from prefix and identifier.
+        Generates Redis key from prefix, strategy and identifier.
+        """
+        return f"{self.prefix}:{self.strategy}:{identifier}"
+
+    async def hit(self, identifier: str, cost: int = 1) -> LimitResult:
+        """
+        Checks the limit and records the attempt in one step; refused attempts are not counted.
         """
-        return f"{self.prefix}:{identifier}"
+        return await self.engine.hit(self.get_key(identifier), cost)
+
+    async def check(self, identifier: str) -> LimitResult:
+        """
+        Remaining quota and reset time, without recording an attempt.
+        """
+        return await self.engine.peek(self.get_key(identifier))
 
     async def is_blocked(self, identifier: str) -> bool:
         """
         Checks if identifier has exceeded attempt limit.
         """
-        key = self.get_key(identifier)
-        curr = await self.redis.get(key)
-        if curr is not None and int(curr) >= self.max_attempts:
-            return True
-        return False
+        return not (await self.check(identifier)).allowed
 
-    async def register_attempt(self, identifier: str) -> None:
+    async def register_attempt(self, identifier: str) -> LimitResult:
         """
         Records new attempt for identifier.
         """
-        key = self.get_key(identifier)
-        curr = await self.redis.get(key)
-        if curr is None:
-            await self.redis.setex(key, int(self.period.total_seconds()), 1)
-        else:
-            await self.redis.incr(key)
-            await self.redis.expire(key, int(self.period.total_seconds()))
+        return await self.hit(identifier)
 
     async def reset(self, identifier: str) -> None:
         """
         Resets attempt counter for identifier.
         """
-        key = self.get_key(identifier)
-        await self.redis.delete(key)
+        await self.engine.reset(self.get_key(identifier))
 
 class EmailUpdateLimiter:
     """
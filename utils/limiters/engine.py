@@ -0,0 +1,177 @@
+import math
+import redis.asyncio as redis
+from datetime import timedelta
+from typing import Dict, NamedTuple
+
+# All scripts take KEYS[1] = counter key and ARGV = limit, period (ms), cost,
+# and return {allowed, remaining, reset (ms), retry (ms)}.
+# A cost of 0 only reads the state: allowed means one more hit would pass.
+# Time is read from the Redis server, so every API process shares one clock.
+
+FIXED_WINDOW_SCRIPT = """
+local limit, period, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+local allowed = 0
+if cost > 0 and used + cost <= limit then
+    used = redis.call('INCRBY', KEYS[1], cost)
+    if redis.call('PTTL', KEYS[1]) < 0 then
+        redis.call('PEXPIRE', KEYS[1], period)
+    end
+    allowed = 1
+elseif cost == 0 and used < limit then
+    allowed = 1
+end
+local reset = 0
+if used > 0 then
+    reset = math.max(redis.call('PTTL', KEYS[1]), 0)
+end
+local retry = 0
+if allowed == 0 then
+    retry = reset
+end
+return {allowed, math.max(limit - used, 0), reset, retry}
+"""
+
+SLIDING_LOG_SCRIPT = """
+local limit, period, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - period)
+local used = redis.call('ZCARD', KEYS[1])
+local allowed = 0
+if cost > 0 and used + cost <= limit then
+    for i = 0, cost - 1 do
+        redis.call('ZADD', KEYS[1], now, now .. '-' .. (used + i))
+    end
+    redis.call('PEXPIRE', KEYS[1], period)
+    used = used + cost
+    allowed = 1
+elseif cost == 0 and used < limit then
+    allowed = 1
+end
+local reset, retry = 0, 0
+if used > 0 then
+    local newest = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+    reset = tonumber(newest[2]) + period - now
+end
+if allowed == 0 then
+    -- The request passes once enough of the oldest entries have left the window
+    local needed = used + math.max(cost, 1) - limit
+    local entry = redis.call('ZRANGE', KEYS[1], needed - 1, needed - 1, 'WITHSCORES')
+    if entry[2] then
+        retry = tonumber(entry[2]) + period - now
+    else
+        retry = period
+    end
+end
+return {allowed, math.max(limit - used, 0), reset, retry}
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local limit, period, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or limit
+local ts = tonumber(state[2]) or now
+tokens = math.min(limit, tokens + math.max(now - ts, 0) * limit / period)
+local allowed = 0
+if cost > 0 and tokens >= cost then
+    tokens = tokens - cost
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+    redis.call('PEXPIRE', KEYS[1], period)
+    allowed = 1
+elseif cost == 0 and tokens >= 1 then
+    allowed = 1
+end
+local reset = math.ceil((limit - tokens) * period / limit)
+local retry = 0
+if allowed == 0 then
+    retry = math.ceil((math.max(cost, 1) - tokens) * period / limit)
+end
+return {allowed, math.floor(tokens), reset, retry}
+"""
+
+
+class LimitResult(NamedTuple):
+    """Outcome of a limiter call; times are in seconds."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """
+        RateLimit-* response headers (plus Retry-After when the call was refused).
+        """
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class LimiterEngine:
+    """
+    Check-and-increment in one round trip: the variant's Lua script reads the
+    state, decides and consumes atomically on the Redis server.
+    """
+
+    SCRIPT: str = ""
+
+    def __init__(self, redis_client: redis.Redis, limit: int, period: timedelta):
+        self.redis = redis_client
+        self.limit = limit
+        self.period_ms = int(period.total_seconds() * 1000)
+        self._script = redis_client.register_script(self.SCRIPT)
+
+    async def hit(self, key: str, cost: int = 1) -> LimitResult:
+        """
+        Consume `cost` units if the quota allows it; a refused hit consumes nothing.
+        """
+        allowed, remaining, reset_ms, retry_ms = await self._script(
+            keys=[key], args=[self.limit, self.period_ms, cost]
+        )
+        return LimitResult(bool(allowed), self.limit, int(remaining), int(reset_ms) / 1000, int(retry_ms) / 1000)
+
+    async def peek(self, key: str) -> LimitResult:
+        """
+        Current state without consuming anything.
+        """
+        return await self.hit(key, cost=0)
+
+    async def reset(self, key: str) -> None:
+        await self.redis.delete(key)
+
+
+class FixedWindowEngine(LimiterEngine):
+    """
+    `limit` hits per window; the window starts with the first hit.
+    """
+    SCRIPT = FIXED_WINDOW_SCRIPT
+
+
+class SlidingLogEngine(LimiterEngine):
+    """
+    At most `limit` hits in any `period`, tracked as a sorted set of hit times.
+    """
+    SCRIPT = SLIDING_LOG_SCRIPT
+
+
+class TokenBucketEngine(LimiterEngine):
+    """
+    Bucket of `limit` tokens refilled continuously over `period`: allows bursts, then a steady rate.
+    """
+    SCRIPT = TOKEN_BUCKET_SCRIPT
+
+
+ENGINES = {
+    "fixed_window": FixedWindowEngine,
+    "sliding_log": SlidingLogEngine,
+    "token_bucket": TokenBucketEngine,
+}
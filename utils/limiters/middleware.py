@@ -0,0 +1,205 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, List, NamedTuple, Tuple
+
+from jose import jwt, JWTError
+from redis.asyncio import Redis
+from starlette.requests import Request
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import ALGORITHM, REDIS_URL, RATE_LIMIT_TRUST_FORWARDED, SECRET_KEY
+from utils.i18n import get_translation
+from .engine import LimitResult, TokenBucketEngine
+
+logger = logging.getLogger(__name__)
+
+
+class Quota(NamedTuple):
+    """A budget of `limit` units per `period`, refilled continuously."""
+    limit: int
+    period: timedelta
+
+
+class RoutePolicy(NamedTuple):
+    """
+    Charges `cost` units of `quota` for requests matching `pattern`
+    (a route path such as "/api/v1/tests/writing/start/", "{param}" placeholders allowed).
+    """
+    pattern: str
+    quota: str
+    cost: int = 1
+    methods: Tuple[str, ...] = ()
+
+
+QUOTAS: Dict[str, Quota] = {
+    # Every API request
+    "api": Quota(300, timedelta(minutes=1)),
+    # Endpoints that start gpt-4o / whisper calls
+    "llm": Quota(30, timedelta(hours=1)),
+}
+
+# A request is charged by every policy it matches
+DEFAULT_POLICIES: List[RoutePolicy] = [
+    RoutePolicy("/api/{path:path}", "api"),
+    # Generates both writing tasks
+    RoutePolicy("/api/v1/tests/writing/start/", "llm", cost=2, methods=("POST",)),
+    # Enqueues the writing analysis (scoring of both parts)
+    RoutePolicy("/api/v1/tests/writing/session/{session_id}/submit/", "llm", cost=2, methods=("POST",)),
+    # Generates the questions when the content pool ran dry
+    RoutePolicy("/api/v1/tests/speaking/start/", "llm", cost=1, methods=("POST",)),
+    # Enqueues the speaking analysis (transcription of every part and scoring)
+    RoutePolicy("/api/v1/tests/speaking/{session_id}/answers/", "llm", cost=4, methods=("POST",)),
+    # Grades the text answers of the three passages (passage submits only store answers)
+    RoutePolicy("/api/v1/tests/reading/{session_id}/finish/", "llm", cost=3, methods=("POST",)),
+]
+
+
+class LocalTokenBucket:
+    """
+    In-process first tier with the same quotas as Redis.
+
+    One process never legitimately sees more traffic from a client than the
+    shared quota allows, so a client refused here is refused without a Redis
+    round trip. Buckets of the least recently seen clients are evicted past `max_keys`.
+    """
+
+    def __init__(self, max_keys: int = 10_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def hit(self, key: str, quota: Quota, cost: int) -> LimitResult:
+        period = quota.period.total_seconds()
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (quota.limit, now))
+        tokens = min(quota.limit, tokens + (now - updated) * quota.limit / period)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        retry = 0.0 if allowed else (cost - tokens) * period / quota.limit
+        return LimitResult(allowed, quota.limit, int(tokens), (quota.limit - tokens) * period / quota.limit, retry)
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying per-user (or, for anonymous requests, per-IP)
+    quotas to API routes.
+
+    Each matching policy charges its cost to a quota, first against the local
+    bucket, then atomically against the shared Redis token bucket. Refused
+    requests get 429 with RateLimit-* and Retry-After headers; allowed ones
+    carry the RateLimit-* headers of the tightest quota. If Redis is
+    unavailable the shared tier is skipped (the local tier still applies).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        policies: List[RoutePolicy] = DEFAULT_POLICIES,
+        quotas: Dict[str, Quota] = QUOTAS,
+        redis_url: str = REDIS_URL,
+        trust_forwarded: bool = RATE_LIMIT_TRUST_FORWARDED,
+    ):
+        self.app = app
+        self.policies = [(compile_path(p.pattern)[0], p) for p in policies]
+        self.quotas = quotas
+        self.trust_forwarded = trust_forwarded
+        self.local = LocalTokenBucket()
+        redis_client = Redis.from_url(redis_url, decode_responses=True)
+        self.engines = {
+            name: TokenBucketEngine(redis_client, quota.limit, quota.period) for name, quota in quotas.items()
+        }
+
+    def match(self, method: str, path: str) -> List[RoutePolicy]:
+        return [
+            policy for regex, policy in self.policies
+            if (not policy.methods or method in policy.methods) and regex.match(path)
+        ]
+
+    def identity(self, request: Request) -> str:
+        """
+        "user:<id>" for a valid access token, otherwise "ip:<address>".
+        """
+        authorization = request.headers.get("authorization", "")
+        if authorization.lower().startswith("bearer "):
+            try:
+                payload = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM])
+                if payload.get("sub") and payload.get("type", "access") == "access":
+                    return f"user:{payload['sub']}"
+            except JWTError:
+                pass
+
+        if self.trust_forwarded:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return f"ip:{forwarded.split(',')[0].strip()}"
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    async def charge(self, identity: str, policy: RoutePolicy) -> LimitResult:
+        """
+        1. Local tier: refuse without touching Redis when this process alone exceeds the quota.
+        2. Shared tier: atomic token bucket in Redis.
+        """
+        quota = self.quotas[policy.quota]
+        key = f"ratelimit:{policy.quota}:{identity}"
+
+        # 1. Local
+        result = self.local.hit(key, quota, policy.cost)
+        if not result.allowed:
+            return result
+
+        # 2. Shared
+        try:
+            return await self.engines[policy.quota].hit(key, policy.cost)
+        except Exception:
+            logger.exception("Rate limit check failed for %s, skipping the shared tier", key)
+            return result
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        policies = self.match(scope["method"], scope["path"])
+        if not policies:
+            return await self.app(scope, receive, send)
+
+        request = Request(scope)
+        identity = self.identity(request)
+        results = []
+        for policy in policies:
+            result = await self.charge(identity, policy)
+            if not result.allowed:
+                return await self.reject(request, result, send)
+            results.append(result)
+
+        headers = min(results, key=lambda r: r.remaining / r.limit).headers
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (name.lower().encode(), value.encode()) for name, value in headers.items()
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    async def reject(request: Request, result: LimitResult, send: Send) -> None:
+        t = await get_translation(request)
+        body = json.dumps(
+            {"detail": t.get("too_many_attempts", "Too many attempts, please try again later")},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ] + [(name.lower().encode(), value.encode()) for name, value in result.headers.items()]
+        await send({"type": "http.response.start", "status": 429, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
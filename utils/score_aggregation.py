@@ -0,0 +1,122 @@
+from typing import Dict, Iterable, NamedTuple, Optional
+from tortoise import connections
+
+SECTIONS = ("listening", "reading", "speaking", "writing")
+
+# One row per (user, section): latest score by test start time, average and best.
+# All four sections are scored in a single UNION ALL so a whole batch of users
+# costs one round trip.
+_SCORES_SQL = """
+SELECT user_id, section,
+       MAX(CASE WHEN rn = 1 THEN score END) AS latest,
+       AVG(score) AS average,
+       MAX(score) AS best
+FROM (
+    SELECT s.user_id, s.section, s.score,
+           ROW_NUMBER() OVER (
+               PARTITION BY s.user_id, s.section
+               ORDER BY s.taken_at DESC NULLS LAST, s.row_id DESC
+           ) AS rn
+    FROM (
+        SELECT 'listening' AS section, a.id AS row_id, a.user_id AS user_id,
+               a.overall_score AS score, t.start_time AS taken_at
+        FROM listening_analyses a
+        JOIN user_listening_sessions t ON t.id = a.session_id
+        {listening_filter}
+        UNION ALL
+        SELECT 'speaking', a.id, t.user_id, a.overall_band_score, t.start_time
+        FROM speaking_analyses a
+        JOIN speaking t ON t.id = a.speaking_id
+        {filter}
+        UNION ALL
+        SELECT 'writing', a.id, t.user_id, a.overall_band_score, t.start_time
+        FROM writing_analyses a
+        JOIN writings t ON t.id = a.writing_id
+        {filter}
+        UNION ALL
+        SELECT 'reading', t.id, t.user_id, t.score, t.start_time
+        FROM readings t
+        {filter}
+    ) s
+) ranked
+GROUP BY user_id, section
+"""
+
+
+def round_band(value: float) -> float:
+    """
+    Round to the nearest 0.5 (IELTS standard).
+    """
+    return round(value * 2) / 2
+
+
+def _as_float(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+class SectionScore(NamedTuple):
+    """Latest, average and best band of one section."""
+    latest: Optional[float] = None
+    average: Optional[float] = None
+    best: Optional[float] = None
+
+
+class UserScores(NamedTuple):
+    """Per-section scores of one user."""
+    listening: SectionScore = SectionScore()
+    reading: SectionScore = SectionScore()
+    speaking: SectionScore = SectionScore()
+    writing: SectionScore = SectionScore()
+
+    def overall_average(self) -> float:
+        """
+        Average of section averages (missing sections count as 0), rounded to 0.5.
+        """
+        return round_band(sum(s.average or 0 for s in self) / len(SECTIONS))
+
+    def overall_best(self) -> float:
+        """
+        Average of section bests (missing sections count as 0), rounded to 0.5.
+        """
+        return round_band(sum(s.best or 0 for s in self) / len(SECTIONS))
+
+
+class ScoreAggregator:
+    """
+    Computes per-section score aggregates with one grouped SQL query.
+    """
+
+    @staticmethod
+    async def for_users(user_ids: Optional[Iterable[int]] = None) -> Dict[int, UserScores]:
+        """
+        Aggregate scores for a batch of users (or every user when user_ids is None).
+        Users without any test are absent from the result.
+        """
+        values = []
+        listening_filter = section_filter = ""
+        if user_ids is not None:
+            values = [list(user_ids)]
+            if not values[0]:
+                return {}
+            listening_filter = "WHERE a.user_id = ANY($1)"
+            section_filter = "WHERE t.user_id = ANY($1)"
+
+        sql = _SCORES_SQL.format(listening_filter=listening_filter, filter=section_filter)
+        rows = await connections.get("default").execute_query_dict(sql, values)
+
+        sections: Dict[int, Dict[str, SectionScore]] = {}
+        for row in rows:
+            sections.setdefault(row["user_id"], {})[row["section"]] = SectionScore(
+                latest=_as_float(row["latest"]),
+                average=_as_float(row["average"]),
+                best=_as_float(row["best"]),
+            )
+        return {user_id: UserScores(**scores) for user_id, scores in sections.items()}
+
+    @staticmethod
+    async def for_user(user_id: int) -> UserScores:
+        """
+        Aggregate scores for a single user.
+        """
+        scores = await ScoreAggregator.for_users([user_id])
+        return scores.get(user_id, UserScores())